@@ -0,0 +1,178 @@
+# analytics/competitive_metrics.py - Deterministic competitive metrics from CompetitorData lists
+#
+# The model only reports raw per-competitor numbers; shares, concentration,
+# percentiles and the positioning verdict are computed here, vectorized over a
+# batch of runs (one row per run, competitors padded with NaN).
+
+import warnings
+
+import numpy as np
+
+from config import (
+    HHI_MODERATE_FROM,
+    HHI_CONCENTRATED_FROM,
+    POSITIONING_WEIGHTS,
+    POSITION_STRONG_FROM,
+    POSITION_MODERATE_FROM
+)
+
+FIELDS = ("market_share", "funding", "growth_rate", "brand_visibility")
+UNKNOWN = "Unknown"
+
+
+def _number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 0.0
+    return number if np.isfinite(number) else 0.0
+
+
+def to_arrays(runs):
+    """
+    Pad a batch of competitor lists into (runs, max_competitors) arrays.
+    Returns ({field: float array, NaN where padded}, mask of real competitors).
+    """
+    width = max((len(competitors) for competitors in runs), default=0)
+    mask = np.zeros((len(runs), width), dtype=bool)
+    values = {field: np.full((len(runs), width), np.nan) for field in FIELDS}
+    for row, competitors in enumerate(runs):
+        mask[row, :len(competitors)] = True
+        for field in FIELDS:
+            values[field][row, :len(competitors)] = [_number(c.get(field)) for c in competitors]
+    return values, mask
+
+
+def normalized_shares(shares, mask):
+    """
+    Reported shares, scaled down only when a run's total exceeds 100. The model
+    lists just the top competitors, so whatever is left of 100 is an unlisted,
+    fragmented tail that adds (approximately) nothing to concentration.
+    """
+    clean = np.where(mask, np.clip(np.nan_to_num(shares), 0, None), 0.0)
+    totals = clean.sum(axis=1, keepdims=True)
+    return np.divide(clean * 100.0, totals, out=clean.copy(), where=totals > 100)
+
+
+def has_shares(shares):
+    """Runs with any reported market share (concentration is unknown otherwise)."""
+    return shares.sum(axis=1) > 0
+
+
+def hhi(shares):
+    """
+    Herfindahl-Hirschman Index per run from percent shares (0-10000), over the
+    listed competitors; the unlisted tail is treated as fully fragmented.
+    """
+    return np.square(shares).sum(axis=1)
+
+
+def percentile_ranks(values, mask):
+    """
+    Mid-rank percentile (0-100) of every competitor within its own run,
+    NaN for padding.
+    """
+    own = values[:, :, None]
+    others = values[:, None, :]
+    valid = mask[:, None, :]
+    below = ((others < own) & valid).sum(axis=2)
+    equal = ((others == own) & valid).sum(axis=2)
+    counts = mask.sum(axis=1, keepdims=True)
+    ranks = np.divide((below + 0.5 * equal) * 100.0, counts, out=np.full(values.shape, np.nan), where=counts > 0)
+    return np.where(mask, ranks, np.nan)
+
+
+def run_percentiles(values):
+    """p25/p50/p75 of a metric per run (NaN for runs without competitors)."""
+    if values.shape[1] == 0:
+        return np.full((values.shape[0], 3), np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-NaN rows
+        return np.nanpercentile(values, [25, 50, 75], axis=1).T
+
+
+def positioning_scores(shares, values, mask):
+    """
+    0-100 score of how open the field is to a new entrant, from
+    concentration, the leader's share and share-weighted visibility and growth
+    (the unlisted tail counts as small, low-visibility players). NaN without share data.
+    """
+    weights = shares / 100.0
+    components = {
+        "fragmentation": 1 - hhi(shares) / 10000,
+        "leader_gap": 1 - np.max(shares, axis=1, initial=0) / 100,
+        "visibility_gap": 1 - (weights * np.clip(np.nan_to_num(values["brand_visibility"]), 0, 100)).sum(axis=1) / 100,
+        "momentum_gap": 1 - (weights * np.clip(np.nan_to_num(values["growth_rate"]), 0, 100)).sum(axis=1) / 100
+    }
+    total = sum(POSITIONING_WEIGHTS.values())
+    score = sum(POSITIONING_WEIGHTS[name] * component for name, component in components.items()) / total
+    return np.where(mask.any(axis=1) & has_shares(shares), 100 * score, np.nan)
+
+
+def concentration_labels(index, shares):
+    labels = np.select(
+        [index >= HHI_CONCENTRATED_FROM, index >= HHI_MODERATE_FROM],
+        ["Concentrated", "Moderate"],
+        default="Fragmented"
+    )
+    return np.where(has_shares(shares), labels, UNKNOWN)
+
+
+def position_labels(scores):
+    labels = np.select(
+        [scores >= POSITION_STRONG_FROM, scores >= POSITION_MODERATE_FROM],
+        ["Strong", "Moderate"],
+        default="Weak"
+    )
+    return np.where(np.isnan(scores), UNKNOWN, labels)
+
+
+def _rounded(value, digits=1):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def competitive_metrics_batch(runs):
+    """
+    Metrics for a batch of runs, each a list of CompetitorData dicts.
+    Returns one dict per run: enriched competitors (market_share capped to a 100 total,
+    reported_market_share, funding/growth percentiles), hhi, market_concentration,
+    positioning_score, competitive_position and funding/growth quartiles.
+    """
+    values, mask = to_arrays(runs)
+    shares = normalized_shares(values["market_share"], mask)
+    index = hhi(shares)
+    scores = positioning_scores(shares, values, mask)
+    concentration = concentration_labels(index, shares)
+    known = has_shares(shares)
+    position = position_labels(scores)
+    funding_ranks = percentile_ranks(values["funding"], mask)
+    growth_ranks = percentile_ranks(values["growth_rate"], mask)
+    funding_quartiles = run_percentiles(values["funding"])
+    growth_quartiles = run_percentiles(values["growth_rate"])
+
+    results = []
+    for row, competitors in enumerate(runs):
+        results.append({
+            "competitors": [
+                {
+                    **competitor,
+                    "market_share": _rounded(shares[row, col]),
+                    "reported_market_share": _number(competitor.get("market_share")),
+                    "funding_percentile": _rounded(funding_ranks[row, col]),
+                    "growth_percentile": _rounded(growth_ranks[row, col])
+                }
+                for col, competitor in enumerate(competitors)
+            ],
+            "hhi": round(float(index[row])) if known[row] else None,
+            "market_concentration": str(concentration[row]),
+            "positioning_score": _rounded(scores[row]),
+            "competitive_position": str(position[row]),
+            "funding_percentiles": dict(zip(("p25", "p50", "p75"), (_rounded(v) for v in funding_quartiles[row]))),
+            "growth_percentiles": dict(zip(("p25", "p50", "p75"), (_rounded(v) for v in growth_quartiles[row])))
+        })
+    return results
+
+
+def competitive_metrics(competitors):
+    """Metrics for a single run's competitor list."""
+    return competitive_metrics_batch([competitors])[0]
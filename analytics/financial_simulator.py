@@ -0,0 +1,159 @@
+# analytics/financial_simulator.py - Vectorized Monte Carlo cash-flow model for financial what-ifs
+#
+# Seeded from the financial_viability fields (revenue_projections, burn_rate,
+# gross_margin, funding_needed). Every scenario is a row of monthly cash flows,
+# so thousands of scenarios are a few array operations. Runway, the breakeven
+# distribution and the viability score are derived from the simulated paths.
+
+import numpy as np
+
+from config import (
+    FINANCIAL_SIM_SCENARIOS,
+    FINANCIAL_SIM_MAX_SCENARIOS,
+    FINANCIAL_SIM_HORIZON_MONTHS,
+    FINANCIAL_SIM_SEED,
+    FINANCIAL_SIM_REVENUE_SIGMA,
+    FINANCIAL_SIM_OPEX_SIGMA,
+    FINANCIAL_SIM_MARGIN_SD,
+    FINANCIAL_SIM_OPEX_GROWTH,
+    FINANCIAL_SIM_MAX_REVENUE_GROWTH,
+    FINANCIAL_SIM_TARGET_RUNWAY,
+    VIABILITY_WEIGHTS
+)
+
+CHART_YEARS = 3   # years returned as chart series (matches the dashboard charts)
+
+
+def _number(value, default=0.0):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return number if np.isfinite(number) else default
+
+
+def planned_monthly_revenue(revenue_projections, horizon):
+    """
+    Monthly revenue ($K) on plan: each year's projection spread over its months,
+    interpolated between mid-year points, then extrapolated past the last year
+    at its (capped) growth rate.
+    """
+    annual = np.clip(np.array([_number(v) for v in revenue_projections] or [0.0]), 0, None)
+    months = np.arange(horizon)
+    knots = 12 * np.arange(len(annual)) + 5.5
+    monthly = np.interp(months, knots, annual / 12)
+
+    growth = annual[-1] / annual[-2] if len(annual) > 1 and annual[-2] > 0 else 1.0
+    growth = min(max(growth, 1.0), FINANCIAL_SIM_MAX_REVENUE_GROWTH)
+    beyond = months > knots[-1]
+    monthly[beyond] = annual[-1] / 12 * growth ** ((months[beyond] - knots[-1]) / 12)
+    return monthly
+
+
+def _percentiles(values, pcts=(10, 50, 90)):
+    if values.size == 0:
+        return {f"p{p}": None for p in pcts}
+    return {f"p{p}": round(float(v), 1) for p, v in zip(pcts, np.percentile(values, pcts))}
+
+
+def unknown_result(scenarios, horizon):
+    """Result for inputs with no operating spend: nothing to simulate, no score."""
+    return {
+        "scenarios": scenarios,
+        "horizon_months": horizon,
+        "runway_months": _percentiles(np.empty(0)),
+        "probability_runs_out": None,
+        "breakeven_month": _percentiles(np.empty(0)),
+        "probability_breakeven": None,
+        "probability_default_alive": None,
+        "viability_score": None,
+        "series": {name: [0.0] * CHART_YEARS for name in ("revenue_p10", "revenue_p50", "revenue_p90", "costs_p50")}
+    }
+
+
+def simulate(revenue_projections, burn_rate, gross_margin, funding_needed,
+             revenue_multiplier=1.0, burn_multiplier=1.0, scenarios=FINANCIAL_SIM_SCENARIOS,
+             horizon=FINANCIAL_SIM_HORIZON_MONTHS, seed=FINANCIAL_SIM_SEED):
+    """
+    Run the Monte Carlo model. All money is in $K; burn_rate is monthly operating
+    spend and funding_needed is the cash available at month 0.
+    revenue_multiplier/burn_multiplier scale the plan for what-if analysis.
+
+    Returns runway and breakeven distributions (months), the share of scenarios
+    that break even before running out of cash, a 0-100 viability_score, and
+    yearly chart series (revenue p10/p50/p90 and median costs).
+    Without a positive burn_rate (e.g. a failed or incomplete estimate) every
+    scenario would trivially break even, so the metrics and score are None.
+    """
+    scenarios = int(min(max(scenarios, 1), FINANCIAL_SIM_MAX_SCENARIOS))
+    if _number(burn_rate) * max(_number(burn_multiplier, 1.0), 0.0) <= 0:
+        return unknown_result(scenarios, horizon)
+    rng = np.random.default_rng(seed)
+    years = int(np.ceil(horizon / 12))
+    year_of_month = np.arange(horizon) // 12
+
+    # Revenue: plan x compounding yearly shocks (misses in one year carry into the next)
+    plan = planned_monthly_revenue(revenue_projections, horizon) * max(_number(revenue_multiplier, 1.0), 0.0)
+    shocks = np.exp(np.cumsum(rng.normal(0, FINANCIAL_SIM_REVENUE_SIGMA, (scenarios, years)), axis=1))
+    revenue = plan * shocks[:, year_of_month]
+
+    # Operating spend grows yearly; one level shock per scenario
+    opex_plan = max(_number(burn_rate), 0.0) * max(_number(burn_multiplier, 1.0), 0.0) \
+        * (1 + FINANCIAL_SIM_OPEX_GROWTH) ** (np.arange(horizon) / 12)
+    opex = opex_plan * rng.lognormal(0, FINANCIAL_SIM_OPEX_SIGMA, (scenarios, 1))
+
+    margin = np.clip(rng.normal(_number(gross_margin), FINANCIAL_SIM_MARGIN_SD, (scenarios, 1)), 0, 100) / 100
+    net = revenue * margin - opex
+    cash = max(_number(funding_needed), 0.0) + np.cumsum(net, axis=1)
+
+    # Runway: months until cash first goes negative (horizon if it never does)
+    out_of_cash = cash < 0
+    runs_out = out_of_cash.any(axis=1)
+    runway = np.where(runs_out, out_of_cash.argmax(axis=1) + 1, horizon)
+
+    # Breakeven: first month with non-negative net cash flow
+    profitable = net >= 0
+    breaks_even = profitable.any(axis=1)
+    breakeven = np.where(breaks_even, profitable.argmax(axis=1) + 1, horizon + 1)
+    default_alive = breaks_even & (breakeven <= runway)
+
+    median_runway = float(np.median(runway))
+    components = {
+        "default_alive": float(default_alive.mean()),
+        "runway": min(median_runway / FINANCIAL_SIM_TARGET_RUNWAY, 1.0),
+        "gross_margin": min(max(_number(gross_margin) / 80, 0.0), 1.0)
+    }
+    score = 100 * sum(VIABILITY_WEIGHTS[name] * value for name, value in components.items()) / sum(VIABILITY_WEIGHTS.values())
+
+    chart_months = min(CHART_YEARS * 12, horizon)
+    yearly_revenue = revenue[:, :chart_months].reshape(scenarios, -1, 12).sum(axis=2)
+    yearly_costs = (revenue * (1 - margin) + opex)[:, :chart_months].reshape(scenarios, -1, 12).sum(axis=2)
+    revenue_bands = np.percentile(yearly_revenue, [10, 50, 90], axis=0)
+
+    return {
+        "scenarios": scenarios,
+        "horizon_months": horizon,
+        "runway_months": _percentiles(runway),
+        "probability_runs_out": round(float(runs_out.mean()), 3),
+        "breakeven_month": _percentiles(breakeven[breaks_even]),
+        "probability_breakeven": round(float(breaks_even.mean()), 3),
+        "probability_default_alive": round(float(default_alive.mean()), 3),
+        "viability_score": round(score, 1),
+        "series": {
+            "revenue_p10": [round(float(v), 1) for v in revenue_bands[0]],
+            "revenue_p50": [round(float(v), 1) for v in revenue_bands[1]],
+            "revenue_p90": [round(float(v), 1) for v in revenue_bands[2]],
+            "costs_p50": [round(float(v), 1) for v in np.median(yearly_costs, axis=0)]
+        }
+    }
+
+
+def simulate_viability(financials, **options):
+    """simulate() from a financial_viability dict."""
+    return simulate(
+        financials.get("revenue_projections") or [],
+        financials.get("burn_rate"),
+        financials.get("gross_margin"),
+        financials.get("funding_needed"),
+        **options
+    )
@@ -1,16 +1,94 @@
 # app.py - Flask Backend with MySQL Authentication for Validex
 
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for
+from flask import Flask, render_template, request, jsonify, session, redirect, url_for, Response
+from flask.json.provider import DefaultJSONProvider
 import requests
-from config import BASE_URL, Config
-from auth import register_user, login_user, get_user_by_id
+from config import BASE_URL, Config, REQUEST_BUDGET_SECONDS, DEADLINE_HEADER, DEADLINE_HOP_MARGIN, USAGE_USER_HEADER, INTERNAL_SECRET_HEADER, INTERNAL_SECRET
+from response_encoding import encode_body
+from serialization import dumps_json, loads_json
+from deadline import Deadline, parse_budget
+from auth import register_user, login_user, get_user_by_id, get_user_cache_stats
+from usage_ledger import user_usage, quota_exceeded
+import inprocess
 from functools import wraps
 import traceback
 
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify() and request.get_json() through serialization.py (orjson when installed)"""
+    def dumps(self, obj, **kwargs):
+        return dumps_json(obj).decode("utf-8")
+    
+    def loads(self, s, **kwargs):
+        return loads_json(s)
+
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 app.config.from_object(Config)
 app.secret_key = Config.SECRET_KEY
 
+if not INTERNAL_SECRET:
+    # e.g. under gunicorn: the backend would not know who any request is for
+    print("❌ VALIDX_INTERNAL_SECRET is not set: the backend will ignore signed-in users (no usage, no run access)")
+
+# Backend response headers forwarded as-is to the client
+PASSTHROUGH_HEADERS = ('Content-Type', 'Content-Encoding', 'ETag', 'Vary', 'X-Run-Id', 'X-ValidX-Resources')
+
+# ========== RESPONSE COMPRESSION ==========
+
+@app.after_request
+def compress_response(response):
+    """gzip/brotli-compress text responses the client accepts"""
+    if (response.direct_passthrough or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or not 200 <= response.status_code < 300
+            or not (response.mimetype.startswith('text/') or response.mimetype == 'application/json')):
+        return response
+    
+    body, encoding = encode_body(response.get_data(), request.headers.get('Accept-Encoding'))
+    if encoding:
+        response.set_data(body)
+        response.headers['Content-Encoding'] = encoding
+        response.vary.add('Accept-Encoding')
+    return response
+
+def relay_response(body, status, backend_headers):
+    """Flask response carrying backend bytes and the passthrough headers unchanged"""
+    headers = {
+        name: backend_headers[name]
+        for name in PASSTHROUGH_HEADERS
+        if name in backend_headers
+    }
+    return Response(body, status=status, headers=headers)
+
+def backend_passthrough(backend_response):
+    """
+    Relay a backend response without decoding and re-encoding it.
+    The (possibly compressed) bytes and their headers go out unchanged.
+    """
+    try:
+        body = backend_response.raw.read(decode_content=False)
+    finally:
+        backend_response.close()
+    return relay_response(body, backend_response.status_code, backend_response.headers)
+
+def backend_request_headers(deadline=None):
+    """Headers forwarded to the backend so it can negotiate with the real client"""
+    headers = {'Accept-Encoding': request.headers.get('Accept-Encoding', 'identity')}
+    if 'If-None-Match' in request.headers:
+        headers['If-None-Match'] = request.headers['If-None-Match']
+    if 'user_id' in session:
+        # Usage of the run is charged to this user (usage_ledger.py)
+        headers[USAGE_USER_HEADER] = str(session['user_id'])
+        headers[INTERNAL_SECRET_HEADER] = INTERNAL_SECRET
+    if deadline is not None:
+        # The backend gets what is left of the request budget, minus our time to answer
+        headers[DEADLINE_HEADER] = deadline.header_value()
+    return headers
+
+def request_deadline():
+    """Deadline of this request: the browser's budget (header) capped by REQUEST_BUDGET_SECONDS"""
+    return Deadline(parse_budget(request.headers.get(DEADLINE_HEADER)))
+
 # ========== DECORATOR: PROTECT ROUTES ==========
 def login_required(f):
     """Decorator to protect routes - requires user login"""
@@ -180,13 +258,16 @@ def analysis():
     return render_template(
         'analysis.html', 
         user_name=user_name,
-        user_email=user_email
+        user_email=user_email,
+        request_budget_ms=int(REQUEST_BUDGET_SECONDS * 1000),
+        deadline_margin_ms=int(DEADLINE_HOP_MARGIN * 1000)
     )
 
 @app.route('/api/validate', methods=['POST'])
 @login_required
 def validate():
     """Validate startup idea - requires login"""
+    deadline = request_deadline()
     try:
         data = request.get_json()
         startup_idea = data.get('startup_idea', '').strip()
@@ -194,27 +275,59 @@ def validate():
         if not startup_idea:
             return jsonify({'error': 'Please enter your startup idea'}), 400
         
+        if quota_exceeded(session['user_id']):
+            return jsonify({
+                'error': 'Daily usage quota reached',
+                'detail': 'You have reached your daily validation quota. Please try again tomorrow.'
+            }), 429
+        
         # Log validation attempt
         user_email = session.get('user_email', 'unknown')
         print(f"🔍 Validation request from: {user_email}")
         print(f"💡 Idea: {startup_idea[:100]}...")
         
+        # The previous run lets the backend rerun only what an edit affects
+        payload = {"startup_idea": startup_idea, "previous_run_id": session.get('last_run_id')}
+        
+        if inprocess.is_enabled():
+            # Single-service mode (asgi.py): run the graph in this process, no HTTP hop
+            status, body, headers = inprocess.validate(payload, request.args, backend_request_headers(deadline), timeout=max(deadline.remaining(), 0.1))
+            if status == 200:
+                print(f"✅ Validation successful for: {user_email}")
+                if headers.get('X-Run-Id'):
+                    session['last_run_id'] = headers['X-Run-Id']
+                return relay_response(body, status, headers)
+            try:
+                error_detail = loads_json(body)
+            except ValueError:
+                error_detail = body[:500].decode('utf-8', errors='replace')
+            print(f"❌ API Error {status}: {error_detail}")
+            return jsonify({
+                'error': f'API Error: {status}',
+                'detail': str(error_detail)
+            }), status
+        
         # Construct backend URL properly
         backend_url = f"{BASE_URL.rstrip('/')}/validate"
         print(f"📡 Calling backend: {backend_url}")
         
-        # Call the FastAPI backend
+        # Call the FastAPI backend (?fields= is forwarded as-is)
         response = requests.post(
             backend_url,
-            json={"startup_idea": startup_idea},
-            timeout=300
+            json=payload,
+            params=request.args,
+            headers=backend_request_headers(deadline),
+            timeout=max(deadline.remaining(), 0.1),
+            stream=True
         )
         
         print(f"📥 Backend response status: {response.status_code}")
         
         if response.status_code == 200:
             print(f"✅ Validation successful for: {user_email}")
-            return jsonify(response.json()), 200
+            if response.headers.get('X-Run-Id'):
+                session['last_run_id'] = response.headers['X-Run-Id']
+            return backend_passthrough(response)
         else:
             # Get detailed error from backend
             try:
@@ -240,7 +353,7 @@ def validate():
             'error': 'Unable to connect to Validex API',
             'detail': 'Backend server not reachable. Please ensure the backend is running on port 8000.'
         }), 503
-    except requests.exceptions.Timeout:
+    except (requests.exceptions.Timeout, TimeoutError):
         print("❌ Request timeout")
         return jsonify({
             'error': 'Request timeout',
@@ -254,6 +367,73 @@ def validate():
             'detail': 'Internal server error'
         }), 500
 
+@app.route('/api/runs/<run_id>', methods=['GET'])
+@login_required
+def get_run(run_id):
+    """Stored validation result (supports ?fields=, ?revision= and If-None-Match)"""
+    try:
+        response = requests.get(
+            f"{BASE_URL.rstrip('/')}/runs/{run_id}",
+            params=request.args,
+            headers=backend_request_headers(),
+            timeout=30,
+            stream=True
+        )
+        return backend_passthrough(response)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Run lookup error: {e}")
+        return jsonify({
+            'error': 'Unable to connect to Validex API',
+            'detail': 'Backend server not reachable.'
+        }), 503
+
+@app.route('/api/runs/<run_id>/rerun', methods=['POST'])
+@login_required
+def rerun_run(run_id):
+    """Rerun one node of a stored validation (?node=<name>, optional ?downstream=false)"""
+    deadline = request_deadline()
+    try:
+        response = requests.post(
+            f"{BASE_URL.rstrip('/')}/runs/{run_id}/rerun",
+            params=request.args,
+            headers=backend_request_headers(deadline),
+            timeout=max(deadline.remaining(), 0.1),
+            stream=True
+        )
+        return backend_passthrough(response)
+    except requests.exceptions.Timeout:
+        print("❌ Rerun timeout")
+        return jsonify({
+            'error': 'Request timeout',
+            'detail': 'The rerun took too long. Please try again.'
+        }), 504
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Rerun error: {e}")
+        return jsonify({
+            'error': 'Unable to connect to Validex API',
+            'detail': 'Backend server not reachable.'
+        }), 503
+
+@app.route('/api/financials/simulate', methods=['POST'])
+@login_required
+def simulate_financials():
+    """What-if financial simulation (no model call; fast enough for slider updates)"""
+    try:
+        response = requests.post(
+            f"{BASE_URL.rstrip('/')}/financials/simulate",
+            json=request.get_json(silent=True) or {},
+            headers=backend_request_headers(),
+            timeout=10,
+            stream=True
+        )
+        return backend_passthrough(response)
+    except requests.exceptions.RequestException as e:
+        print(f"❌ Simulation error: {e}")
+        return jsonify({
+            'error': 'Unable to connect to Validex API',
+            'detail': 'Backend server not reachable.'
+        }), 503
+
 # ========== API ROUTES (OPTIONAL) ==========
 
 @app.route('/api/user', methods=['GET'])
@@ -279,6 +459,21 @@ def get_current_user():
             'message': 'User not found'
         }), 404
 
+@app.route('/api/usage', methods=['GET'])
+@login_required
+def get_usage():
+    """Runs, tokens, LLM calls and search calls of the current user (optional ?days=)"""
+    days = request.args.get('days', type=int)
+    usage = user_usage(session['user_id'], days) if days and 0 < days <= 366 else user_usage(session['user_id'])
+    return jsonify({'success': True, 'usage': usage}), 200
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics():
+    """In-process cache metrics for this worker"""
+    return jsonify({
+        'user_cache': get_user_cache_stats()
+    }), 200
+
 # ========== ERROR HANDLERS ========== 
 
 @app.errorhandler(404)
@@ -388,6 +583,8 @@ def server_error(e):
 # ========== APPLICATION STARTUP ==========
 
 if __name__ == '__main__':
+    if not INTERNAL_SECRET:
+        raise SystemExit("❌ VALIDX_INTERNAL_SECRET is not set: export the same value for the backend and this frontend")
     print("\n" + "=" * 70)
     print("🚀 VALIDEX APPLICATION STARTED!")
     print("=" * 70)
@@ -407,11 +604,16 @@ if __name__ == '__main__':
     print("   POST /api/signup    → Signup API")
     print("   GET  /analysis      → Analysis dashboard (protected)")
     print("   POST /api/validate  → Validate idea (protected)")
+    print("   GET  /api/runs/<id> → Stored result (protected)")
+    print("   POST /api/runs/<id>/rerun?node=<name> → Rerun one node (protected)")
+    print("   POST /api/financials/simulate → Financial what-if (protected)")
+    print("   GET  /api/usage     → Your runs, tokens and calls (protected)")
+    print("   GET  /api/metrics   → Cache metrics")
     print("   GET  /logout        → Logout")
     print("\n💾 Database: validex_db")
-    print("🔐 Password Hashing: bcrypt")
+    print(f"🔐 Password Hashing: bcrypt (cost {Config.BCRYPT_ROUNDS}, {Config.PASSWORD_HASH_WORKERS} pool workers)")
     print("\n⚠️  IMPORTANT: Start backend server before validation!")
-    print("   Command: python main.py  OR  uvicorn main:app --reload --port 8000")
+    print("   Command: uvicorn main:app --reload --port 8000  (same VALIDX_INTERNAL_SECRET as this process)")
     print("=" * 70 + "\n")
     
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,41 @@
+# asgi.py - Single-service deployment: Flask frontend and FastAPI backend in one ASGI app
+#
+# Run with:
+#   uvicorn asgi:app --port 5000
+#
+# Flask routes are served through a WSGI adapter at "/", the backend API is mounted
+# at "/backend" (same routes and contract as main.py on its own), and /api/validate
+# calls the graph executor in-process instead of over HTTP. Other Flask proxies
+# still use BASE_URL; point VALIDX_BASE_URL at http://<host>:5000/backend/ for them.
+
+import asyncio
+import os
+import secrets
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.middleware.wsgi import WSGIMiddleware
+
+# Frontend and backend share this process, so a generated secret is enough (read by config.py)
+os.environ.setdefault("VALIDX_INTERNAL_SECRET", secrets.token_hex(32))
+
+import inprocess
+import main as backend
+from app import app as flask_app
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Mounted sub-apps get no lifespan events, so run the backend's warm-up here
+    async with backend.lifespan(backend.app):
+        inprocess.register(asyncio.get_running_loop(), backend.inprocess_validate)
+        print("✅ Single-service mode: /api/validate runs the graph in-process")
+        try:
+            yield
+        finally:
+            inprocess.unregister()
+
+
+app = FastAPI(lifespan=lifespan)
+app.mount("/backend", backend.app)
+app.mount("/", WSGIMiddleware(flask_app))
@@ -1,26 +1,130 @@
 # auth.py - User Authentication Functions for Validex
 
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
 import bcrypt
 from database import get_db_connection, close_db_connection
+from cache import TTLCache
+from config import Config
+
+# In-process cache for session-authenticated user lookups
+user_cache = TTLCache(
+    maxsize=Config.USER_CACHE_MAXSIZE,
+    ttl=Config.USER_CACHE_TTL,
+    negative_ttl=Config.USER_CACHE_NEGATIVE_TTL,
+    name='user_cache'
+)
+
+# ========== PASSWORD HASHING POOL ==========
+
+_hash_pool = None
+_hash_pool_lock = threading.Lock()
+
+def _bcrypt_hash(password, rounds):
+    """Runs inside a pool worker process."""
+    return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
 
-def hash_password(password):
+def _bcrypt_check(plain_password, hashed_password):
+    """Runs inside a pool worker process."""
+    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+def get_hash_pool():
+    """
+    Return the bounded process pool used for bcrypt work.
+    Created lazily so importing auth never forks.
+    """
+    global _hash_pool
+    if _hash_pool is None:
+        with _hash_pool_lock:
+            if _hash_pool is None:
+                _hash_pool = ProcessPoolExecutor(max_workers=max(1, Config.PASSWORD_HASH_WORKERS))
+    return _hash_pool
+
+def configure_hash_pool(workers):
+    """
+    Replace the bcrypt pool with one of the given size.
     """
-    Hash a password using bcrypt.
+    global _hash_pool
+    with _hash_pool_lock:
+        old_pool = _hash_pool
+        _hash_pool = ProcessPoolExecutor(max_workers=max(1, workers))
+    if old_pool is not None:
+        old_pool.shutdown(wait=True)
+
+def shutdown_hash_pool():
+    """Stop the bcrypt pool workers."""
+    global _hash_pool
+    with _hash_pool_lock:
+        pool, _hash_pool = _hash_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+atexit.register(shutdown_hash_pool)
+
+def hash_password(password, rounds=None):
+    """
+    Hash a password using bcrypt with the configured cost factor.
+    The work runs in the hashing pool, off the request thread's CPU.
     Returns hashed password as string.
     """
-    password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+    rounds = rounds or Config.BCRYPT_ROUNDS
+    future = get_hash_pool().submit(_bcrypt_hash, password, rounds)
+    return future.result(timeout=Config.PASSWORD_HASH_TIMEOUT)
 
 def verify_password(plain_password, hashed_password):
     """
     Verify a password against its hash.
     Returns True if password matches, False otherwise.
     """
-    password_bytes = plain_password.encode('utf-8')
-    hashed_bytes = hashed_password.encode('utf-8')
-    return bcrypt.checkpw(password_bytes, hashed_bytes)
+    future = get_hash_pool().submit(_bcrypt_check, plain_password, hashed_password)
+    return future.result(timeout=Config.PASSWORD_HASH_TIMEOUT)
+
+def get_hash_rounds(hashed_password):
+    """
+    Read the cost factor from a bcrypt hash ($2b$<rounds>$...).
+    Returns None if the hash is not in bcrypt format.
+    """
+    parts = hashed_password.split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+def needs_rehash(hashed_password):
+    """
+    Check whether a stored hash was made with a different cost factor.
+    """
+    return get_hash_rounds(hashed_password) != Config.BCRYPT_ROUNDS
+
+def _update_password_hash(user_id, hashed_password):
+    """
+    Store a new password hash for a user.
+    Returns True on success.
+    """
+    connection = get_db_connection()
+    
+    if not connection:
+        return False
+    
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            "UPDATE users SET password = %s WHERE id = %s",
+            (hashed_password, user_id)
+        )
+        connection.commit()
+        
+        cursor.close()
+        close_db_connection(connection)
+        return True
+        
+    except Exception as e:
+        print(f"❌ Password rehash error: {e}")
+        if connection:
+            connection.rollback()
+            close_db_connection(connection)
+        return False
 
 def register_user(name, email, password):
     """
@@ -60,6 +164,9 @@ def register_user(name, email, password):
         cursor.close()
         close_db_connection(connection)
         
+        # Drop any negative entry cached for this id
+        invalidate_user(user_id)
+        
         print(f"✅ User registered successfully: {email}")
         return True, "Registration successful", user_id
         
@@ -98,6 +205,11 @@ def login_user(email, password):
         
         # Verify password
         if verify_password(password, user['password']):
+            # Transparently upgrade hashes made with an old cost factor
+            if needs_rehash(user['password']):
+                if _update_password_hash(user['id'], hash_password(password)):
+                    print(f"🔐 Password rehashed at cost {Config.BCRYPT_ROUNDS}: {email}")
+            
             # Remove password from user data before returning
             user_data = {
                 'id': user['id'],
@@ -115,11 +227,17 @@ def login_user(email, password):
             close_db_connection(connection)
         return False, f"Login failed: {str(e)}", None
 
-def get_user_by_id(user_id):
+def get_user_by_id(user_id, use_cache=True):
     """
     Get user information by user ID.
+    Served from the in-process user cache when possible.
     Returns: user_data dict or None
     """
+    if use_cache:
+        found, user = user_cache.get(user_id)
+        if found:
+            return dict(user) if user else None
+    
     connection = get_db_connection()
     
     if not connection:
@@ -136,6 +254,12 @@ def get_user_by_id(user_id):
         cursor.close()
         close_db_connection(connection)
         
+        # Only cache real answers - connection/query errors are never cached
+        if user:
+            user_cache.set(user_id, dict(user))
+        else:
+            user_cache.set_missing(user_id)
+        
         return user
         
     except Exception as e:
@@ -143,3 +267,59 @@ def get_user_by_id(user_id):
         if connection:
             close_db_connection(connection)
         return None
+
+def update_user_profile(user_id, name=None, email=None):
+    """
+    Update a user's name and/or email and invalidate the cached entry.
+    Returns: (success: bool, message: str)
+    """
+    fields = []
+    values = []
+    if name is not None:
+        fields.append("name = %s")
+        values.append(name)
+    if email is not None:
+        fields.append("email = %s")
+        values.append(email)
+    
+    if not fields:
+        return False, "Nothing to update"
+    
+    connection = get_db_connection()
+    
+    if not connection:
+        return False, "Database connection failed"
+    
+    try:
+        cursor = connection.cursor()
+        cursor.execute(
+            f"UPDATE users SET {', '.join(fields)} WHERE id = %s",
+            (*values, user_id)
+        )
+        connection.commit()
+        
+        cursor.close()
+        close_db_connection(connection)
+        
+        invalidate_user(user_id)
+        return True, "Profile updated"
+        
+    except Exception as e:
+        print(f"❌ Profile update error: {e}")
+        if connection:
+            connection.rollback()
+            close_db_connection(connection)
+        return False, f"Profile update failed: {str(e)}"
+
+def invalidate_user(user_id):
+    """
+    Drop a user from the lookup cache.
+    Call after any change to the users row.
+    """
+    user_cache.invalidate(user_id)
+
+def get_user_cache_stats():
+    """
+    Return hit-rate metrics for the user lookup cache.
+    """
+    return user_cache.stats()
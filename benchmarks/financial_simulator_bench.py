@@ -0,0 +1,59 @@
+# benchmarks/financial_simulator_bench.py - Latency of the Monte Carlo financial simulator
+#
+# Usage (from the project root):
+#   python -m benchmarks.financial_simulator_bench
+#   python -m benchmarks.financial_simulator_bench --scenarios 1000 2000 10000 --number 50 --output simulator.json
+#
+# Times analytics.financial_simulator.simulate for each scenario count on the
+# stub run's financial_viability fields, and checks that repeated calls with the
+# same inputs return identical results (the fixed seed makes slider moves stable).
+
+import argparse
+import json
+import time
+import timeit
+
+from analytics.financial_simulator import simulate_viability
+
+FIXTURE = {
+    "revenue_projections": [250.0, 900.0, 2400.0],
+    "burn_rate": 60.0,
+    "funding_needed": 1500.0,
+    "gross_margin": 72.0
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark for analytics/financial_simulator.py")
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[500, 2000, 10000])
+    parser.add_argument("--number", type=int, default=20, help="calls per timing repeat")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    cases = []
+    for scenarios in args.scenarios:
+        seconds = min(timeit.repeat(lambda: simulate_viability(FIXTURE, scenarios=scenarios), number=args.number, repeat=3))
+        result = simulate_viability(FIXTURE, scenarios=scenarios)
+        cases.append({
+            "scenarios": scenarios,
+            "ms_per_call": round(seconds / args.number * 1000, 2),
+            "deterministic": result == simulate_viability(FIXTURE, scenarios=scenarios),
+            "viability_score": result["viability_score"],
+            "runway_months": result["runway_months"],
+            "breakeven_month": result["breakeven_month"]
+        })
+        print(f"⏱️  {scenarios} scenarios: {cases[-1]['ms_per_call']}ms per simulation "
+              f"(score {result['viability_score']}, deterministic: {cases[-1]['deterministic']})")
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "fixture": FIXTURE,
+        "cases": cases
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# benchmarks/hop_vs_inprocess.py - Latency of /api/validate with and without the Flask -> FastAPI HTTP hop
+#
+# Run the same stub backend both ways, so the graph itself costs (almost) nothing:
+#   two services:   VALIDX_BACKEND=stub VALIDX_STUB_LLM_LATENCY=0 VALIDX_STUB_SEARCH_LATENCY=0 uvicorn main:app --port 8000
+#                   python app.py                                   (frontend on :5000)
+#   single service: VALIDX_BACKEND=stub VALIDX_STUB_LLM_LATENCY=0 VALIDX_STUB_SEARCH_LATENCY=0 uvicorn asgi:app --port 5001
+# then, from the project root:
+#   python -m benchmarks.hop_vs_inprocess --email load@test.dev --password secret123 --register
+#   python -m benchmarks.hop_vs_inprocess --requests 200 --mode quick --output hop_report.json
+#
+# Requests are sent one at a time so the difference is per-request overhead
+# (serialization, loopback HTTP, connection handling), not queueing.
+
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from benchmarks.load_test import IDEAS, latency_summary, login
+
+
+async def measure(name, frontend, args):
+    """Log in to one frontend and time sequential validations against it."""
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    latencies, failures = [], {}
+    async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True), timeout=timeout) as session:
+        await login(session, frontend, args.email, args.password, register=args.register)
+        for n in range(args.warmup + args.requests):
+            # A unique idea per request keeps incremental reuse from short-circuiting the graph
+            idea = f"{IDEAS[n % len(IDEAS)]} Variant {name}-{n}-{time.time_ns()}."
+            started = time.perf_counter()
+            async with session.post(f"{frontend}/api/validate", params={"mode": args.mode}, json={"startup_idea": idea}) as resp:
+                await resp.read()
+                status = resp.status
+            elapsed = time.perf_counter() - started
+            if n < args.warmup:
+                continue
+            if status == 200:
+                latencies.append(elapsed)
+            else:
+                failures[status] = failures.get(status, 0) + 1
+    return {"frontend": frontend, "requests": args.requests, "failures": failures, "latency": latency_summary(latencies)}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare /api/validate latency: HTTP hop vs in-process backend")
+    parser.add_argument("--hop", default="http://localhost:5000", help="Flask frontend calling FastAPI over HTTP")
+    parser.add_argument("--inprocess", default="http://localhost:5001", help="single service started with uvicorn asgi:app")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--register", action="store_true", help="create the test account first (on both frontends)")
+    parser.add_argument("--requests", type=int, default=100, help="measured requests per target")
+    parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per target")
+    parser.add_argument("--mode", default="quick", choices=["full", "quick"])
+    parser.add_argument("--timeout", type=float, default=300)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    results = {}
+    for name, frontend in (("hop", args.hop.rstrip("/")), ("inprocess", args.inprocess.rstrip("/"))):
+        print(f"▶️  {name}: {args.requests} sequential requests against {frontend} ...")
+        results[name] = await measure(name, frontend, args)
+        print(f"   p50={results[name]['latency']['p50']}s p95={results[name]['latency']['p95']}s failures={results[name]['failures']}")
+
+    delta = {
+        key: round(results["hop"]["latency"][key] - results["inprocess"]["latency"][key], 4)
+        for key in ("p50", "p95", "p99")
+        if results["hop"]["latency"][key] is not None and results["inprocess"]["latency"][key] is not None
+    }
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "mode": args.mode,
+        "results": results,
+        "hop_overhead_seconds": delta
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps({"hop_overhead_seconds": delta}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,114 @@
+# benchmarks/import_time.py - Import-time budget check for the frontend and backend entry points
+#
+# Usage (from the project root):
+#   python -m benchmarks.import_time
+#   python -m benchmarks.import_time --runs 5 --scale 1.5 --output import_times.json
+#
+# Every module is imported in a fresh interpreter under `python -X importtime`.
+# The best cumulative time over --runs is compared with its budget, and the
+# imported module names are checked against a list of packages that module
+# must not pull in (the Flask frontend must never load the LLM stack).
+# Exits non-zero on any breach, so CI can run it next to the compile step.
+
+import argparse
+import json
+import subprocess
+import sys
+
+# Cumulative import time budgets in milliseconds
+IMPORT_BUDGETS_MS = {
+    "config": 20,
+    "auth": 250,
+    "app": 600,
+    "models.chat_model": 1500,
+    "graphs.workflow": 5000,
+    "main": 6000
+}
+
+LLM_STACK = ["langchain", "langchain_core", "langchain_community", "langchain_huggingface", "langgraph", "huggingface_hub"]
+
+# Top-level packages a module must not import (directly or transitively)
+FORBIDDEN_IMPORTS = {
+    "app": LLM_STACK + ["fastapi"],
+    "auth": LLM_STACK + ["fastapi"],
+    "models.chat_model": ["langchain_huggingface", "huggingface_hub", "langchain_community"],
+    "graphs.workflow": ["langchain_huggingface", "huggingface_hub"]
+}
+
+
+def measure(module):
+    """
+    Import a module in a fresh interpreter.
+    Returns (cumulative microseconds, set of imported top-level packages).
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    cumulative = None
+    packages = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        # "import time:  self [us] | cumulative | imported package"
+        _, cumulative_us, raw_name = line[len("import time:"):].split("|")
+        name = raw_name.strip()
+        packages.add(name.split(".")[0])
+        if name == module:
+            cumulative = int(cumulative_us)
+    return cumulative, packages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check per-module import time budgets")
+    parser.add_argument("--runs", type=int, default=3, help="imports per module; the fastest counts")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply every budget (slow CI machines)")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    report = {"scale": args.scale, "modules": []}
+    breaches = 0
+
+    for module, budget_ms in IMPORT_BUDGETS_MS.items():
+        best_us = None
+        packages = set()
+        for _ in range(args.runs):
+            cumulative_us, packages = measure(module)
+            if cumulative_us is not None and (best_us is None or cumulative_us < best_us):
+                best_us = cumulative_us
+
+        elapsed_ms = round(best_us / 1000, 1) if best_us is not None else None
+        limit_ms = budget_ms * args.scale
+        forbidden = sorted(set(FORBIDDEN_IMPORTS.get(module, [])) & packages)
+        ok = elapsed_ms is not None and elapsed_ms <= limit_ms and not forbidden
+        breaches += not ok
+
+        entry = {
+            "module": module,
+            "import_ms": elapsed_ms,
+            "budget_ms": limit_ms,
+            "forbidden_imports": forbidden,
+            "ok": ok
+        }
+        report["modules"].append(entry)
+        status = "✅" if ok else "❌"
+        extra = f" forbidden={forbidden}" if forbidden else ""
+        print(f"{status} {module}: {elapsed_ms}ms (budget {limit_ms}ms){extra}")
+
+    report["breaches"] = breaches
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    if breaches:
+        print(f"❌ {breaches} module(s) over their import budget")
+        sys.exit(1)
+    print("✅ All modules within their import budgets")
+
+
+if __name__ == "__main__":
+    main()
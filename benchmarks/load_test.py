@@ -0,0 +1,269 @@
+# benchmarks/load_test.py - Full-stack load test of the Flask frontend + FastAPI backend
+#
+# Start both services with the stub backend so no HuggingFace/DuckDuckGo traffic is generated:
+#   VALIDX_BACKEND=stub uvicorn main:app --port 8000 --workers 2
+#   python app.py            (or gunicorn -w 4 app:app -b :5000)
+# then, from the project root:
+#   python -m benchmarks.load_test --email load@test.dev --password secret123 --register
+#   python -m benchmarks.load_test --levels 1,4,16,32 --duration 60 --slo-p95 20 --output load_report.json
+#
+# Every virtual user logs in through /api/login with its own cookie jar and then
+# submits ideas to /api/validate back to back. While a concurrency level runs, a
+# prober measures each tier on its own: Flask (GET /login), backend (GET /healthz)
+# and MySQL (SELECT 1). A tier counts as saturated at the first level where its
+# probe p95 exceeds SATURATION_FACTOR x its level-1 baseline or its probes fail.
+
+import argparse
+import asyncio
+import json
+import time
+
+import aiohttp
+
+from metrics import percentile
+
+SATURATION_FACTOR = 3.0
+SATURATION_FLOOR_SECONDS = 0.005   # baselines below this are treated as this
+PROBE_ERROR_LIMIT = 0.05
+
+IDEAS = [
+    "A subscription app that plans weekly meals from what is already in your fridge.",
+    "B2B SaaS that automates SOC 2 evidence collection for startups.",
+    "Marketplace connecting independent electricians with homeowners for EV charger installs.",
+    "AI bookkeeping assistant for freelancers that categorizes expenses from bank feeds."
+]
+
+
+def latency_summary(latencies):
+    if not latencies:
+        return {"p50": None, "p90": None, "p95": None, "p99": None, "max": None}
+    return {
+        "p50": round(percentile(latencies, 50), 3),
+        "p90": round(percentile(latencies, 90), 3),
+        "p95": round(percentile(latencies, 95), 3),
+        "p99": round(percentile(latencies, 99), 3),
+        "max": round(max(latencies), 3)
+    }
+
+
+async def login(session, frontend, email, password, register):
+    if register:
+        async with session.post(f"{frontend}/api/signup", json={"name": "Load Test", "email": email, "password": password}) as resp:
+            await resp.read()
+    async with session.post(f"{frontend}/api/login", json={"email": email, "password": password}) as resp:
+        if resp.status != 200:
+            raise RuntimeError(f"login failed ({resp.status}): {(await resp.text())[:200]}")
+
+
+async def virtual_user(user_id, args, deadline, samples):
+    """Log in once, then validate ideas until the level's deadline."""
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True), timeout=timeout) as session:
+        await login(session, args.frontend, args.email, args.password, register=False)
+        n = 0
+        while time.monotonic() < deadline:
+            # A unique idea per request keeps incremental reuse from short-circuiting the graph
+            idea = f"{IDEAS[(user_id + n) % len(IDEAS)]} Variant {user_id}-{n}-{time.time_ns()}."
+            n += 1
+            started = time.monotonic()
+            outcome = "ok"
+            try:
+                async with session.post(f"{args.frontend}/api/validate", params={"mode": args.mode}, json={"startup_idea": idea}) as resp:
+                    await resp.read()
+                    if resp.status == 504:
+                        outcome = "timeout"
+                    elif resp.status != 200:
+                        outcome = f"http_{resp.status}"
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+            except aiohttp.ClientError as e:
+                outcome = type(e).__name__
+            samples.append({"seconds": time.monotonic() - started, "outcome": outcome})
+
+
+async def probe_http(session, url):
+    started = time.monotonic()
+    async with session.get(url, allow_redirects=False) as resp:
+        await resp.read()
+        if resp.status >= 500:
+            raise RuntimeError(f"{url} -> {resp.status}")
+    return time.monotonic() - started
+
+
+def probe_mysql():
+    from database import get_db_connection, close_db_connection
+
+    started = time.monotonic()
+    connection = get_db_connection()
+    if connection is None:
+        raise RuntimeError("no MySQL connection")
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+    finally:
+        close_db_connection(connection)
+    return time.monotonic() - started
+
+
+async def prober(args, stop, probes):
+    """Probe every tier at a fixed interval until stop is set."""
+    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
+        while not stop.is_set():
+            checks = {
+                "flask": probe_http(session, f"{args.frontend}/login"),
+                "backend": probe_http(session, f"{args.backend}/healthz")
+            }
+            if args.mysql:
+                checks["mysql"] = asyncio.to_thread(probe_mysql)
+            results = await asyncio.gather(*checks.values(), return_exceptions=True)
+            for tier, result in zip(checks, results):
+                probes[tier]["errors" if isinstance(result, Exception) else "latencies"].append(
+                    str(result) if isinstance(result, Exception) else result
+                )
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=args.probe_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def run_level(concurrency, args):
+    samples = []
+    tiers = ["flask", "backend"] + (["mysql"] if args.mysql else [])
+    probes = {tier: {"latencies": [], "errors": []} for tier in tiers}
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(prober(args, stop, probes))
+
+    started = time.monotonic()
+    deadline = started + args.duration
+    users = await asyncio.gather(
+        *(virtual_user(i, args, deadline, samples) for i in range(concurrency)),
+        return_exceptions=True
+    )
+    elapsed = time.monotonic() - started
+    stop.set()
+    await probe_task
+
+    login_failures = [str(u) for u in users if isinstance(u, Exception)]
+    ok = [s["seconds"] for s in samples if s["outcome"] == "ok"]
+    total = len(samples)
+    outcomes = {}
+    for sample in samples:
+        outcomes[sample["outcome"]] = outcomes.get(sample["outcome"], 0) + 1
+
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 1),
+        "requests": total,
+        "rps": round(len(ok) / elapsed, 3) if elapsed else 0,
+        "latency": latency_summary(ok),
+        "error_rate": round(sum(v for k, v in outcomes.items() if k not in ("ok", "timeout")) / total, 4) if total else None,
+        "timeout_rate": round(outcomes.get("timeout", 0) / total, 4) if total else None,
+        "outcomes": outcomes,
+        "login_failures": login_failures,
+        "tiers": {
+            tier: {
+                **latency_summary(data["latencies"]),
+                "probes": len(data["latencies"]) + len(data["errors"]),
+                "error_rate": round(len(data["errors"]) / max(1, len(data["latencies"]) + len(data["errors"])), 4)
+            }
+            for tier, data in probes.items()
+        }
+    }
+
+
+def saturation_points(levels):
+    """First concurrency level at which each tier's probes degrade (None if never)."""
+    points = {}
+    if not levels:
+        return points
+    for tier, baseline in levels[0]["tiers"].items():
+        floor = max(baseline["p95"] or 0, SATURATION_FLOOR_SECONDS)
+        points[tier] = None
+        for level in levels:
+            stats = level["tiers"][tier]
+            if stats["error_rate"] > PROBE_ERROR_LIMIT or (stats["p95"] is not None and stats["p95"] > SATURATION_FACTOR * floor):
+                points[tier] = level["concurrency"]
+                break
+    return points
+
+
+def sustainable_rps(levels, max_error_rate, slo_p95):
+    """Best throughput among levels within the error budget (and latency SLO if given)."""
+    best = None
+    for level in levels:
+        failures = (level["error_rate"] or 0) + (level["timeout_rate"] or 0)
+        if level["requests"] == 0 or failures > max_error_rate:
+            continue
+        if slo_p95 is not None and (level["latency"]["p95"] is None or level["latency"]["p95"] > slo_p95):
+            continue
+        if best is None or level["rps"] > best["rps"]:
+            best = {"rps": level["rps"], "concurrency": level["concurrency"]}
+    return best
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Load test /api/validate through Flask and FastAPI")
+    parser.add_argument("--frontend", default="http://localhost:5000")
+    parser.add_argument("--backend", default="http://localhost:8000")
+    parser.add_argument("--email", required=True, help="test account used by every virtual user")
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--register", action="store_true", help="create the test account first")
+    parser.add_argument("--levels", default="1,2,4,8,16", help="comma-separated concurrency levels")
+    parser.add_argument("--duration", type=float, default=30, help="seconds per level")
+    parser.add_argument("--timeout", type=float, default=300, help="client timeout per request (seconds)")
+    parser.add_argument("--mode", default="full", choices=["full", "quick"])
+    parser.add_argument("--probe-interval", type=float, default=1.0)
+    parser.add_argument("--no-mysql", dest="mysql", action="store_false", help="skip the MySQL tier probe")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--slo-p95", type=float, help="p95 latency (seconds) a sustainable level must meet")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+    args.frontend = args.frontend.rstrip("/")
+    args.backend = args.backend.rstrip("/")
+
+    if args.register:
+        async with aiohttp.ClientSession(cookie_jar=aiohttp.CookieJar(unsafe=True)) as session:
+            await login(session, args.frontend, args.email, args.password, register=True)
+
+    levels = []
+    for concurrency in (int(c) for c in args.levels.split(",")):
+        print(f"▶️  Concurrency {concurrency} for {args.duration:.0f}s ...")
+        level = await run_level(concurrency, args)
+        levels.append(level)
+        tiers = " ".join(f"{tier}={stats['p95']}s" for tier, stats in level["tiers"].items())
+        print(f"   {level['rps']} rps, p95={level['latency']['p95']}s, errors={level['error_rate']}, "
+              f"timeouts={level['timeout_rate']}, tier p95: {tiers}")
+
+    backend_metrics = None
+    try:
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
+            async with session.get(f"{args.backend}/metrics") as resp:
+                backend_metrics = await resp.json()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        pass
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {
+            "frontend": args.frontend,
+            "backend": args.backend,
+            "mode": args.mode,
+            "duration": args.duration,
+            "levels": [level["concurrency"] for level in levels]
+        },
+        "levels": levels,
+        "sustainable": sustainable_rps(levels, args.max_error_rate, args.slo_p95),
+        "saturation": saturation_points(levels),
+        "backend_metrics": backend_metrics
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps({key: report[key] for key in ("sustainable", "saturation")}, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+# benchmarks/login_throughput.py - Login (bcrypt) throughput vs. hashing pool size
+#
+# Usage (from the project root):
+#   python -m benchmarks.login_throughput
+#   python -m benchmarks.login_throughput --rounds 10 --concurrency 32 --duration 5
+#
+# Simulates a login storm: many request threads call auth.verify_password at
+# once while the pool size is swept from 1 worker up to the number of cores.
+# Throughput should grow roughly linearly until the pool matches the core count.
+
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import bcrypt
+
+import auth
+
+
+def run_storm(workers, concurrency, duration, hashed_password, password):
+    """
+    Run verify_password from `concurrency` threads for `duration` seconds.
+    Returns logins per second.
+    """
+    auth.configure_hash_pool(workers)
+    # Warm the worker processes before timing
+    auth.verify_password(password, hashed_password)
+
+    deadline = time.perf_counter() + duration
+    counts = [0] * concurrency
+
+    def worker(slot):
+        while time.perf_counter() < deadline:
+            if auth.verify_password(password, hashed_password):
+                counts[slot] += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(worker, range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return sum(counts) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login throughput scaling benchmark")
+    parser.add_argument("--rounds", type=int, default=auth.Config.BCRYPT_ROUNDS, help="bcrypt cost factor")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent login threads")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per pool size")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    password = "benchmark-password"
+    hashed_password = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=args.rounds)).decode("utf-8")
+
+    worker_counts = sorted({1, 2, 4, 8, 16, 32, args.max_workers} & set(range(1, args.max_workers + 1)))
+    results = []
+    baseline = None
+
+    print(f"🔐 bcrypt rounds={args.rounds}, concurrency={args.concurrency}, cores={os.cpu_count()}")
+    for workers in worker_counts:
+        throughput = run_storm(workers, args.concurrency, args.duration, hashed_password, password)
+        baseline = baseline or throughput
+        results.append({
+            "workers": workers,
+            "logins_per_sec": round(throughput, 2),
+            "speedup": round(throughput / baseline, 2)
+        })
+        print(f"   workers={workers:>3}  {throughput:8.2f} logins/s  speedup x{throughput / baseline:.2f}")
+
+    auth.shutdown_hash_pool()
+    print(json.dumps({"rounds": args.rounds, "concurrency": args.concurrency, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
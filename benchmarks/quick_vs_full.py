@@ -0,0 +1,96 @@
+# benchmarks/quick_vs_full.py - Latency and token usage of quick mode vs. the full graph
+#
+# Usage (from the project root, with HUGGINGFACEHUB_API_TOKEN set):
+#   python -m benchmarks.quick_vs_full
+#   python -m benchmarks.quick_vs_full --runs 3 --idea "AI bookkeeping for freelancers" --output quick_vs_full.json
+#
+# Both graphs run in-process against the live model. Token counts come from the
+# llm_input_tokens / llm_output_tokens counters recorded for every model call
+# (provider usage when reported, otherwise a character-based estimate).
+
+import argparse
+import asyncio
+import json
+import time
+
+from graphs.workflow import build_graph, build_quick_graph
+from metrics import metrics, percentile
+from state.agent_state import initial_state
+
+DEFAULT_IDEAS = [
+    "A subscription app that plans weekly meals from what is already in your fridge",
+    "B2B SaaS that automates SOC 2 evidence collection for startups",
+    "Marketplace connecting independent electricians with homeowners for EV charger installs"
+]
+
+
+def counter_total(counters, name):
+    """Sum a counter over all of its label sets."""
+    return sum(value for key, value in counters.items() if key.split("{")[0] == name)
+
+
+async def run_once(graph, startup_idea):
+    before = metrics.snapshot()["counters"]
+    started = time.perf_counter()
+    result = await graph.ainvoke(initial_state(startup_idea))
+    elapsed = time.perf_counter() - started
+    after = metrics.snapshot()["counters"]
+
+    def delta(name):
+        return counter_total(after, name) - counter_total(before, name)
+
+    return {
+        "seconds": elapsed,
+        "llm_calls": delta("llm_calls"),
+        "input_tokens": delta("llm_input_tokens"),
+        "output_tokens": delta("llm_output_tokens"),
+        "investor_decision": result.get("investor_decision")
+    }
+
+
+def summarize(samples):
+    latencies = [s["seconds"] for s in samples]
+    return {
+        "runs": len(samples),
+        "p50_seconds": round(percentile(latencies, 50), 3),
+        "max_seconds": round(max(latencies), 3),
+        "avg_llm_calls": round(sum(s["llm_calls"] for s in samples) / len(samples), 1),
+        "avg_input_tokens": round(sum(s["input_tokens"] for s in samples) / len(samples)),
+        "avg_output_tokens": round(sum(s["output_tokens"] for s in samples) / len(samples)),
+        "decisions": [s["investor_decision"] for s in samples]
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare quick and full validation modes")
+    parser.add_argument("--idea", action="append", help="startup idea (repeatable); defaults to a built-in set")
+    parser.add_argument("--runs", type=int, default=1, help="runs per idea and mode")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    graphs = {"quick": build_quick_graph(), "full": build_graph()}
+    samples = {mode: [] for mode in graphs}
+
+    for startup_idea in args.idea or DEFAULT_IDEAS:
+        for mode, graph in graphs.items():
+            for _ in range(args.runs):
+                sample = await run_once(graph, startup_idea)
+                samples[mode].append(sample)
+                print(f"▶️  {mode:5s} {sample['seconds']:6.1f}s calls={sample['llm_calls']:.0f} "
+                      f"tokens={sample['input_tokens']:.0f}+{sample['output_tokens']:.0f} "
+                      f"decision={sample['investor_decision']}  {startup_idea[:50]}")
+
+    report = {mode: summarize(mode_samples) for mode, mode_samples in samples.items()}
+    report["speedup_p50"] = round(report["full"]["p50_seconds"] / report["quick"]["p50_seconds"], 2)
+    full_tokens = report["full"]["avg_input_tokens"] + report["full"]["avg_output_tokens"]
+    quick_tokens = report["quick"]["avg_input_tokens"] + report["quick"]["avg_output_tokens"]
+    report["token_ratio"] = round(full_tokens / quick_tokens, 2) if quick_tokens else None
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+# benchmarks/replay_graph.py - Offline regression benchmark of graphs/workflow.py from cassettes
+#
+# Record cassettes by running the backend once with VALIDX_CASSETTE_MODE=record,
+# then (from the project root):
+#   python -m benchmarks.replay_graph --dir cassettes --runs 3
+#   python -m benchmarks.replay_graph --dir cassettes --no-timing   # pure graph overhead
+#
+# Every LLM and web_search response is served from the cassette, so no
+# HuggingFace or DuckDuckGo traffic is generated. With timing on (default),
+# each replayed call sleeps for its recorded latency.
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import time
+
+from cassette import Cassette, cassette_session
+from graphs.workflow import build_graph
+from metrics import percentile
+from state.agent_state import initial_state
+
+
+async def replay_once(graph, path, timing):
+    startup_idea = Cassette(path, "replay").startup_idea
+    started = time.perf_counter()
+    with cassette_session(startup_idea, mode="replay", path=path, replay_timing=timing):
+        result = await graph.ainvoke(initial_state(startup_idea))
+    return time.perf_counter() - started, result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Replay recorded validations through the graph")
+    parser.add_argument("--dir", default="cassettes", help="directory of cassette files")
+    parser.add_argument("--runs", type=int, default=1, help="replays per cassette")
+    parser.add_argument("--no-timing", action="store_true", help="do not sleep recorded latencies")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.dir, "*.json")))
+    if not paths:
+        raise SystemExit(f"No cassettes found in {args.dir}")
+
+    graph = build_graph()
+    report = {"timing": not args.no_timing, "cassettes": []}
+
+    for path in paths:
+        latencies = []
+        decision = None
+        for _ in range(args.runs):
+            elapsed, result = await replay_once(graph, path, timing=not args.no_timing)
+            latencies.append(elapsed)
+            decision = result.get("investor_decision")
+        entry = {
+            "cassette": os.path.basename(path),
+            "runs": args.runs,
+            "p50_seconds": round(percentile(latencies, 50), 3),
+            "max_seconds": round(max(latencies), 3),
+            "investor_decision": decision
+        }
+        report["cassettes"].append(entry)
+        print(f"▶️  {entry['cassette']}: p50={entry['p50_seconds']}s max={entry['max_seconds']}s decision={decision}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
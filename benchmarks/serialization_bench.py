@@ -0,0 +1,188 @@
+# benchmarks/serialization_bench.py - Encoding cost of responses, run-store blobs and Pydantic dumps
+#
+# Usage (from the project root):
+#   python -m benchmarks.serialization_bench
+#   python -m benchmarks.serialization_bench --competitors 12 --section-kb 12 --number 2000 --output serialization.json
+#
+# The fixture mirrors a full /validate payload: long market/competition/risk
+# sections, a competitor_intelligence block with several competitors, the
+# financial_viability block and the investor fields, plus the stored state
+# snapshot. Each encoder is timed against the standard json module it replaces.
+# Missing optional packages (orjson, msgpack, pydantic) are reported, not faked.
+
+import argparse
+import json
+import pickle
+import random
+import time
+import timeit
+
+import serialization
+from serialization import dumps_json, loads_json, pack, unpack
+from state.run_store import RunStore
+
+WORDS = (
+    "market growth customers subscription pricing competitors regulation adoption segment revenue "
+    "churn acquisition onboarding enterprise retention margin funding incumbents platform analytics"
+).split()
+
+
+def paragraph_text(size_kb, rng):
+    words = []
+    while sum(len(w) + 1 for w in words) < size_kb * 1024:
+        words.append(rng.choice(WORDS))
+    return " ".join(words).capitalize() + "."
+
+
+def result_fixture(competitors, section_kb, seed=7):
+    """A realistic full-mode response payload."""
+    rng = random.Random(seed)
+    return {
+        "startup_idea": "B2B SaaS that automates SOC 2 evidence collection for startups.",
+        "mode": "full",
+        "market_analysis": paragraph_text(section_kb, rng),
+        "competition_analysis": paragraph_text(section_kb, rng),
+        "risk_assessment": paragraph_text(section_kb, rng),
+        "competitor_intelligence": {
+            "competitors": [
+                {
+                    "name": f"Competitor {i} – Ünïcode Inc.",
+                    "market_share": round(rng.uniform(1, 30), 2),
+                    "funding": round(rng.uniform(1, 300), 1),
+                    "growth_rate": round(rng.uniform(-5, 60), 1),
+                    "brand_visibility": round(rng.uniform(10, 95), 1)
+                }
+                for i in range(competitors)
+            ],
+            "hhi": 1180,
+            "market_concentration": "Fragmented",
+            "positioning_score": 57.4,
+            "competitive_position": "Moderate",
+            "competitive_advantage": paragraph_text(0.5, rng)
+        },
+        "financial_viability": {
+            "revenue_projections": [round(rng.uniform(100, 5000), 1) for _ in range(3)],
+            "burn_rate": 60.0,
+            "funding_needed": 1500.0,
+            "breakeven_month": 28,
+            "gross_margin": 72.0,
+            "cash_runway": 18,
+            "viability_score": 64.0,
+            "cost_structure": paragraph_text(0.4, rng),
+            "revenue_model": paragraph_text(0.3, rng)
+        },
+        "advisor_recommendations": "Conditional Go",
+        "advice": paragraph_text(1, rng),
+        "investor_decision": "HOLD",
+        "investor_confidence": 62,
+        "investor_reasoning": paragraph_text(1, rng),
+        "investor_strengths": paragraph_text(0.3, rng),
+        "investor_concerns": paragraph_text(0.3, rng),
+        "suggested_investment": 250.0,
+        "expected_return": "3-5x over 6 years",
+        "absent_fields": [],
+        "incremental": None
+    }
+
+
+def time_per_call(fn, number):
+    """Best-of-3 microseconds per call."""
+    return round(min(timeit.repeat(fn, number=number, repeat=3)) / number * 1e6, 2)
+
+
+def compare(name, baseline, candidate, number):
+    base_us, cand_us = time_per_call(baseline, number), time_per_call(candidate, number)
+    return {"case": name, "baseline_us": base_us, "candidate_us": cand_us, "speedup": round(base_us / cand_us, 2) if cand_us else None}
+
+
+def pydantic_cases(payload, number):
+    try:
+        from pydantic import BaseModel
+    except ImportError:
+        return [{"case": "pydantic model_dump", "skipped": "pydantic not installed"}]
+
+    class Competitor(BaseModel):
+        name: str
+        market_share: float
+        funding: float
+        growth_rate: float
+        brand_visibility: float
+
+    class CompetitorIntelligence(BaseModel):
+        competitors: list[Competitor]
+        competitive_position: str
+        market_concentration: str
+        competitive_advantage: str
+
+    model = CompetitorIntelligence(**payload["competitor_intelligence"])
+    return [
+        # Old nodes called .dict() twice (state value and message); now model_dump() once
+        compare("pydantic .dict() x2 vs model_dump()", lambda: (model.dict(), model.dict()), model.model_dump, number),
+        compare("json.dumps(.dict()) vs model_dump_json()", lambda: json.dumps(model.dict()), model.model_dump_json, number)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for serialization.py")
+    parser.add_argument("--competitors", type=int, default=8)
+    parser.add_argument("--section-kb", type=float, default=6, help="size of each text section")
+    parser.add_argument("--number", type=int, default=500, help="calls per timing repeat")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    payload = result_fixture(args.competitors, args.section_kb)
+    state = {key: value for key, value in payload.items() if key not in ("mode", "absent_fields", "incremental")}
+    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    blob = pack({"response": payload, "state": state})
+    store = RunStore(maxsize=10, ttl=600)
+    run_id = store.create(payload, state)
+
+    cases = [
+        compare(
+            "response encode: json.dumps vs dumps_json",
+            lambda: json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8"),
+            lambda: dumps_json(payload),
+            args.number
+        ),
+        compare("response decode: json.loads vs loads_json", lambda: json.loads(body), lambda: loads_json(body), args.number),
+        compare(
+            "state blob pack: json vs pack",
+            lambda: json.dumps({"response": payload, "state": state}).encode("utf-8"),
+            lambda: pack({"response": payload, "state": state}),
+            args.number
+        ),
+        compare("state blob unpack: json vs unpack", lambda: json.loads(json.dumps({"response": payload, "state": state})), lambda: unpack(blob), args.number),
+        compare(
+            "state blob pack: pickle vs pack",
+            lambda: pickle.dumps({"response": payload, "state": state}, protocol=pickle.HIGHEST_PROTOCOL),
+            lambda: pack({"response": payload, "state": state}),
+            args.number
+        ),
+        compare("run_store get (copy): deepcopy via json vs unpack", lambda: json.loads(json.dumps(store.get(run_id))), lambda: store.get(run_id), args.number)
+    ] + pydantic_cases(payload, args.number)
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "backends": {"orjson": serialization.HAS_ORJSON, "msgpack": serialization.msgpack is not None},
+        "fixture": {
+            "competitors": args.competitors,
+            "section_kb": args.section_kb,
+            "json_bytes": len(body),
+            "response_and_state_blob_bytes": len(blob)
+        },
+        "cases": cases
+    }
+
+    for case in cases:
+        if "skipped" in case:
+            print(f"⏭️  {case['case']}: {case['skipped']}")
+        else:
+            print(f"⏱️  {case['case']}: {case['baseline_us']}us -> {case['candidate_us']}us (x{case['speedup']})")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps({"backends": report["backends"], "fixture": report["fixture"]}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# cache.py - In-process TTL/LRU cache for Validex
+
+import threading
+import time
+from collections import OrderedDict
+
+# Sentinel stored for negative entries (key known to be missing)
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe, size-bounded LRU cache whose entries expire after a TTL.
+
+    Negative caching is optional: when negative_ttl > 0, set_missing()
+    remembers that a key does not exist so repeated misses skip the backend.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300, negative_ttl=0, name="cache"):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.name = name
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._negative_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key):
+        """
+        Look up a key.
+        Returns: (found: bool, value) - value is None for negative entries.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self._misses += 1
+                return False, None
+
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._data[key]
+                self._misses += 1
+                return False, None
+
+            self._data.move_to_end(key)
+            if value is _MISSING:
+                self._negative_hits += 1
+                return True, None
+
+            self._hits += 1
+            return True, value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entry if full."""
+        ttl = self.ttl if ttl is None else ttl
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def set_missing(self, key):
+        """Remember that a key does not exist (no-op unless negative caching is on)."""
+        if self.negative_ttl > 0:
+            self.set(key, _MISSING, ttl=self.negative_ttl)
+
+    def invalidate(self, key):
+        """Drop a single key (positive or negative entry)."""
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self._invalidations += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._invalidations += len(self._data)
+            self._data.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the current hit rate."""
+        with self._lock:
+            lookups = self._hits + self._negative_hits + self._misses
+            return {
+                'name': self.name,
+                'size': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+                'negative_ttl': self.negative_ttl,
+                'hits': self._hits,
+                'negative_hits': self._negative_hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations,
+                'hit_rate': round((self._hits + self._negative_hits) / lookups, 4) if lookups else 0.0
+            }
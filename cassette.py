@@ -0,0 +1,173 @@
+# cassette.py - Record/replay of LLM and web search interactions
+
+import contextvars
+import hashlib
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.runnables import RunnableLambda
+
+from serialization import dumps_json, loads_json
+from config import CASSETTE_MODE, CASSETTE_DIR, CASSETTE_FILE, CASSETTE_MATCH, CASSETTE_REPLAY_TIMING
+
+_active_cassette = contextvars.ContextVar("active_cassette", default=None)
+
+
+class CassetteMiss(KeyError):
+    """Raised in replay mode when no recorded interaction matches a request."""
+
+
+def _request_key(kind, node, request):
+    digest = hashlib.sha256(f"{kind}\x00{node}\x00{request}".encode("utf-8")).hexdigest()
+    return digest[:32]
+
+
+def cassette_path_for(startup_idea):
+    """Cassette file for an idea (or the fixed CASSETTE_FILE when set)."""
+    if CASSETTE_FILE:
+        return CASSETTE_FILE
+    digest = hashlib.sha1(startup_idea.strip().encode("utf-8")).hexdigest()[:16]
+    return os.path.join(CASSETTE_DIR, f"{digest}.json")
+
+
+class Cassette:
+    """
+    Ordered log of LLM and search interactions for one run.
+
+    In record mode every request/response pair is appended with its latency.
+    In replay mode responses are served by request key, in recorded order for
+    repeated identical requests. With match="sequence", a request that was not
+    recorded falls back to the next unused response recorded for that node.
+    """
+
+    def __init__(self, path, mode, startup_idea=None, match=CASSETTE_MATCH, replay_timing=CASSETTE_REPLAY_TIMING):
+        self.path = path
+        self.mode = mode
+        self.startup_idea = startup_idea
+        self.match = match
+        self.replay_timing = replay_timing
+        self.interactions = []
+        self._lock = threading.Lock()
+        self._by_key = defaultdict(deque)
+        self._by_node = defaultdict(deque)
+        if mode == "replay":
+            self.load()
+
+    def load(self):
+        with open(self.path, "rb") as f:
+            data = loads_json(f.read())
+        self.startup_idea = data.get("startup_idea", self.startup_idea)
+        self.interactions = data["interactions"]
+        for interaction in self.interactions:
+            interaction["used"] = False
+            self._by_key[interaction["key"]].append(interaction)
+            self._by_node[(interaction["kind"], interaction["node"])].append(interaction)
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            interactions = [dict(i) for i in self.interactions]
+        with open(self.path, "wb") as f:
+            f.write(dumps_json({"version": 1, "startup_idea": self.startup_idea, "interactions": interactions}, indent=True))
+
+    def record(self, kind, node, request, response, latency):
+        with self._lock:
+            self.interactions.append({
+                "seq": len(self.interactions),
+                "kind": kind,
+                "node": node,
+                "key": _request_key(kind, node, request),
+                "request": request,
+                "response": response,
+                "latency": round(latency, 4)
+            })
+
+    def _take(self, queue):
+        while queue:
+            interaction = queue.popleft()
+            if not interaction["used"]:
+                interaction["used"] = True
+                return interaction
+        return None
+
+    def play(self, kind, node, request):
+        """Return the recorded response for a request (sleeping its latency if enabled)."""
+        with self._lock:
+            interaction = self._take(self._by_key[_request_key(kind, node, request)])
+            if interaction is None and self.match == "sequence":
+                interaction = self._take(self._by_node[(kind, node)])
+        if interaction is None:
+            raise CassetteMiss(f"No recorded {kind} interaction for node '{node}' in {self.path}")
+        if self.replay_timing:
+            time.sleep(interaction["latency"])
+        return interaction["response"]
+
+
+def active_cassette():
+    """Cassette for the current run, or None when record/replay is off."""
+    return _active_cassette.get()
+
+
+@contextmanager
+def cassette_session(startup_idea, mode=None, path=None, **options):
+    """
+    Activate a cassette for the duration of one run.
+    Record mode saves the cassette on exit, even if the run failed.
+    """
+    mode = mode or CASSETTE_MODE
+    if mode not in ("record", "replay"):
+        yield None
+        return
+
+    cassette = Cassette(path or cassette_path_for(startup_idea), mode, startup_idea=startup_idea, **options)
+    token = _active_cassette.set(cassette)
+    try:
+        yield cassette
+    finally:
+        _active_cassette.reset(token)
+        if mode == "record":
+            cassette.save()
+
+
+def recorded(runnable, node):
+    """
+    Wrap a model runnable so its calls are captured in record mode and served
+    from the cassette in replay mode.
+    """
+    def invoke(prompt_value):
+        cassette = active_cassette()
+        if cassette is None:
+            return runnable.invoke(prompt_value)
+
+        request = prompt_value.to_string()
+        if cassette.mode == "replay":
+            return messages_from_dict([cassette.play("llm", node, request)])[0]
+
+        started = time.monotonic()
+        response = runnable.invoke(prompt_value)
+        cassette.record("llm", node, request, message_to_dict(response), time.monotonic() - started)
+        return response
+
+    return RunnableLambda(invoke, name=f"{node}_recorded")
+
+
+def recorded_search(query, search_fn):
+    """
+    Run a web search through the active cassette (if any).
+    """
+    cassette = active_cassette()
+    if cassette is None:
+        return search_fn(query)
+    if cassette.mode == "replay":
+        return cassette.play("search", "web_search", query)
+
+    started = time.monotonic()
+    result = search_fn(query)
+    cassette.record("search", "web_search", query, result, time.monotonic() - started)
+    return result
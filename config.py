@@ -5,13 +5,214 @@ import os
 # ========== EXISTING CONFIGURATION ==========
 
 # URL
-BASE_URL = "http://localhost:8000/"
+BASE_URL = os.environ.get("VALIDX_BASE_URL", "http://localhost:8000/")
 
 # AI Model Configuration
 REPO_ID = "openai/gpt-oss-120b"
 TEMPERATURE = 0.7
 MAX_NEW_TOKENS = 512
 
+# Per-node generation settings: max_new_tokens, temperature, stop (list of stop sequences)
+# Missing keys fall back to the defaults above.
+# Structured nodes stream their JSON and stop as soon as the object closes,
+# so their budgets only need to cover the schema, not free text around it.
+NODE_GENERATION = {
+    "analyze_market": {"max_new_tokens": 768, "temperature": 0.7},
+    "analyze_competition": {"max_new_tokens": 768, "temperature": 0.7},
+    "assess_risk": {"max_new_tokens": 640, "temperature": 0.6},
+    "competitor_intelligence": {"max_new_tokens": 700, "temperature": 0.2},
+    "financial_viability": {"max_new_tokens": 600, "temperature": 0.2},
+    "advisor": {"max_new_tokens": 384, "temperature": 0.3},
+    "investor_decision": {"max_new_tokens": 900, "temperature": 0.3},
+    "quick_validator": {"max_new_tokens": 1400, "temperature": 0.3}   # advisor + investor_decision fields plus three summaries
+}
+
+# ========== MODEL TIERS & ROUTING ==========
+
+# Named model tiers. Costs are USD per million tokens and only feed the
+# per-tier cost metrics; set them to your provider's prices.
+MODEL_TIERS = {
+    "large": {
+        "repo_id": REPO_ID,
+        "cost_per_million_input": 0.15,
+        "cost_per_million_output": 0.60
+    },
+    "fast": {
+        "repo_id": os.environ.get("VALIDX_FAST_REPO_ID", "openai/gpt-oss-20b"),
+        "cost_per_million_input": 0.05,
+        "cost_per_million_output": 0.20
+    }
+}
+DEFAULT_MODEL_TIER = "large"
+
+# Tier per node: a tier name or "auto". Auto routes a structured node to the
+# fast tier while its recent parse-success rate there stays high enough.
+# investor_decision stays on the large model.
+NODE_MODEL_TIERS = {
+    "analyze_market": "large",
+    "analyze_competition": "large",
+    "assess_risk": "large",
+    "competitor_intelligence": "auto",
+    "financial_viability": "auto",
+    "advisor": "auto",
+    "investor_decision": "large",
+    "quick_validator": "large"
+}
+
+MODEL_ROUTING_AUTO_ENABLED = os.environ.get("VALIDX_MODEL_ROUTING_AUTO", "1") == "1"  # "0": auto nodes use the large tier
+AUTO_ROUTING_WINDOW = 50               # recent parse outcomes kept per node and tier
+AUTO_ROUTING_MIN_SAMPLES = 10          # fast-tier outcomes needed before routing on them
+AUTO_ROUTING_MIN_PARSE_SUCCESS = 0.95  # fast-tier parse-success rate required to route there
+AUTO_ROUTING_EXPLORE_RATE = 0.1        # share of other auto calls sent to the fast tier to keep measuring it
+
+# ========== END-TO-END DEADLINE ==========
+# One budget covers browser -> Flask -> backend -> graph nodes. Each hop passes
+# the remaining seconds on in DEADLINE_HEADER, minus a margin to send its answer.
+REQUEST_BUDGET_SECONDS = float(os.environ.get("VALIDX_REQUEST_BUDGET", "300"))
+DEADLINE_HEADER = "X-ValidX-Budget"
+DEADLINE_HOP_MARGIN = 2.0          # seconds each hop keeps for returning its response
+DEADLINE_MIN_CALL_SECONDS = 5.0    # a model call is not started with less budget than this
+
+# Optional nodes are skipped when less than this many seconds are left,
+# leaving the budget to the nodes that produce the verdict
+OPTIONAL_NODE_MIN_BUDGET = {
+    "competitor_intelligence": 60,
+    "financial_viability": 45,
+    "advisor": 30
+}
+
+# Result sections reported as missing when a run stops at its deadline
+RESULT_SECTIONS = [
+    "market_analysis",
+    "competition_analysis",
+    "risk_assessment",
+    "competitor_intelligence",
+    "financial_viability",
+    "advisor_recommendations",
+    "investor_decision"
+]
+
+# ========== LLM LATENCY BUDGETS & HEDGING ==========
+
+# Per-attempt timeout (seconds) for each node's model call
+NODE_TIMEOUTS = {
+    "analyze_market": 60,
+    "analyze_competition": 60,
+    "assess_risk": 60,
+    "competitor_intelligence": 75,
+    "financial_viability": 75,
+    "advisor": 60,
+    "investor_decision": 90,
+    "quick_validator": 45
+}
+DEFAULT_NODE_TIMEOUT = 60
+
+# Fire a duplicate request once a call runs longer than the node's observed p95
+HEDGE_ENABLED = True
+HEDGE_MIN_SAMPLES = 5          # latency samples needed before hedging a node
+HEDGE_MIN_DELAY = 2.0          # never hedge earlier than this (seconds)
+HEDGE_POOL_SIZE = 32           # threads shared by primary and hedged calls
+HEDGE_MAX_INFLIGHT_PER_CALL = 2   # pool threads one model call may hold, counting abandoned attempts still running
+LATENCY_WINDOW = 100           # recent latencies kept per node
+
+# Retries with full-jitter exponential backoff
+LLM_MAX_RETRIES = 2
+RETRY_BACKOFF_BASE = 1.0       # seconds
+RETRY_BACKOFF_MAX = 8.0        # seconds
+
+# ========== TOOL EXECUTION ==========
+
+TOOL_MAX_CONCURRENCY = 4           # tool calls from one message run in parallel, bounded
+MAX_TOOL_CALLS_PER_MESSAGE = 4     # extra tool calls in a single AIMessage are dropped
+MAX_TOOL_ROUNDS_PER_NODE = 1       # tool rounds allowed per analysis before falling back
+
+# ========== WEB SEARCH CACHE & PREFETCH ==========
+
+SEARCH_CACHE_MAXSIZE = 512
+SEARCH_CACHE_TTL = 3600                  # seconds
+SEARCH_PREFETCH_ENABLED = True           # warm the cache from startup_idea when a request arrives
+SEARCH_PREFETCH_WORKERS = 4
+SEARCH_PREFETCH_MATCH_THRESHOLD = 0.5    # overlap (Jaccard) of the non-topic words for a model query to reuse a prefetch
+SEARCH_PREFETCH_MIN_TOPIC_TOKENS = 2     # idea keywords the query must also contain
+SEARCH_PREFETCH_WAIT = 15                # max seconds a tool call waits on an in-flight prefetch
+
+# Search result compaction (dedupe + BM25 ranking against startup_idea)
+SEARCH_COMPACTION_ENABLED = True
+SEARCH_TOP_K = 8                  # snippets kept per tools round
+SEARCH_CHAR_BUDGET = 2400         # characters kept per tools round
+SEARCH_DEDUP_THRESHOLD = 0.8      # shingle Jaccard at which snippets count as duplicates
+CHARS_PER_TOKEN = 4               # rough estimate when a provider reports no token usage
+
+# Search circuit breaker: while open, tools-mode nodes run in chat_model mode
+SEARCH_HEALTH_WINDOW = 20                # recent searches considered
+SEARCH_HEALTH_MAX_AGE = 300              # seconds; older outcomes are ignored
+SEARCH_HEALTH_MIN_SAMPLES = 5
+SEARCH_HEALTH_FAILURE_THRESHOLD = 0.5    # failure rate that opens the breaker
+SEARCH_HEALTH_COOLDOWN = 60              # seconds open before a half-open probe
+SEARCH_HEALTH_PROBE_TIMEOUT = 90         # seconds before an unresolved probe is replaced
+
+# ========== RECORD / REPLAY (CASSETTES) ==========
+
+# off | record | replay
+CASSETTE_MODE = os.environ.get("VALIDX_CASSETTE_MODE", "off")
+CASSETTE_DIR = os.environ.get("VALIDX_CASSETTE_DIR", "cassettes")
+# Replay every run from this one file instead of <idea hash>.json (load tests)
+CASSETTE_FILE = os.environ.get("VALIDX_CASSETTE_FILE")
+# exact: request must match the recording; sequence: fall back to the node's next recorded response
+CASSETTE_MATCH = os.environ.get("VALIDX_CASSETTE_MATCH", "exact")
+# Sleep for the recorded latency when replaying
+CASSETTE_REPLAY_TIMING = os.environ.get("VALIDX_CASSETTE_REPLAY_TIMING", "0") == "1"
+
+# ========== RESPONSES & STORED RESULTS ==========
+
+RESPONSE_COMPRESSION_MIN_BYTES = 1024   # smaller bodies are sent uncompressed
+RESPONSE_GZIP_LEVEL = 6
+RESPONSE_BROTLI_QUALITY = 5             # used only when the brotli package is installed
+RUN_STORE_MAXSIZE = 256                 # validation runs kept in backend memory
+RUN_STORE_TTL = 24 * 3600               # seconds
+
+# ========== PER-RUN RESOURCE ACCOUNTING ==========
+# CPU time, tokens, state size and sampled memory per run (see state/run_context.py),
+# returned in the X-ValidX-Resources header and aggregated in /metrics
+RESOURCE_ACCOUNTING_ENABLED = True
+RESOURCE_HEADER_ENABLED = os.environ.get("VALIDX_RESOURCE_HEADER", "1") == "1"
+# Process-wide allocation tracing taxes every allocation: opt in for profiling only
+# (the ceiling is enforced on state bytes either way)
+TRACEMALLOC_ENABLED = os.environ.get("VALIDX_TRACEMALLOC", "0") == "1"
+TRACEMALLOC_FRAMES = 1                   # keep tracing overhead low
+RUN_STATE_CEILING_BYTES = int(os.environ.get("VALIDX_RUN_STATE_CEILING_BYTES", str(8 * 1024 * 1024)))
+RUN_CEILING_ACTION = os.environ.get("VALIDX_RUN_CEILING_ACTION", "compact")   # "compact" or "abort"
+RUN_COMPACT_SECTION_CHARS = 20000        # text sections are truncated to this when compacting
+
+# ========== USAGE LEDGER (usage_ledger.py) ==========
+# Per-user runs, tokens, LLM calls and search calls. Collected from run accounting
+# (requires RESOURCE_ACCOUNTING_ENABLED), buffered in memory and written to MySQL
+# in batches by a background thread.
+# Quotas count unflushed runs only in single-service mode (asgi.py).
+USAGE_LEDGER_ENABLED = os.environ.get("VALIDX_USAGE_LEDGER", "1") == "1"
+USAGE_USER_HEADER = "X-ValidX-User"      # set by the Flask frontend on backend calls
+INTERNAL_SECRET_HEADER = "X-ValidX-Internal"   # proves a backend call comes from the frontend
+# The backend trusts USAGE_USER_HEADER only alongside this secret. Required: export the same
+# value for both services when they run separately (asgi.py generates one for its single process).
+INTERNAL_SECRET = os.environ.get("VALIDX_INTERNAL_SECRET", "")
+USAGE_FLUSH_BATCH_SIZE = int(os.environ.get("VALIDX_USAGE_FLUSH_BATCH_SIZE", "200"))   # flush early at this many events
+USAGE_FLUSH_INTERVAL = float(os.environ.get("VALIDX_USAGE_FLUSH_INTERVAL", "5"))      # seconds between flushes
+USAGE_BUFFER_MAX = 10000                 # events kept while MySQL is unreachable; oldest are dropped beyond this
+USAGE_DAILY_RUN_QUOTA = int(os.environ.get("VALIDX_USAGE_DAILY_RUN_QUOTA", "0"))       # 0 = unlimited
+USAGE_DAILY_TOKEN_QUOTA = int(os.environ.get("VALIDX_USAGE_DAILY_TOKEN_QUOTA", "0"))   # 0 = unlimited
+USAGE_REPORT_DAYS = 30                   # window of the /api/usage totals
+
+# ========== STUB BACKEND (LOAD TESTING) ==========
+# VALIDX_BACKEND=stub replaces HuggingFace and DuckDuckGo with canned responses (see stub_backend.py)
+BACKEND_MODE = os.environ.get("VALIDX_BACKEND", "live")
+STUB_LLM_LATENCY = float(os.environ.get("VALIDX_STUB_LLM_LATENCY", "0.5"))        # mean seconds per model call
+STUB_SEARCH_LATENCY = float(os.environ.get("VALIDX_STUB_SEARCH_LATENCY", "0.2"))  # mean seconds per search
+
+# ========== STARTUP WARM-UP ==========
+# The backend reports ready on /readyz only after prompts, parsers, chains and clients are built
+WARMUP_MODEL_PING = os.environ.get("VALIDX_WARMUP_MODEL_PING", "1") == "1"   # one tiny model request at startup
+WARMUP_PING_MAX_TOKENS = 1
+
 # Prompts paths - EXISTING
 ADVISOR_PROMPT_PATH = os.path.join("prompts", "advisor.txt")
 MARKET_ANALYST_PROMPT_PATH = os.path.join("prompts", "market_analyst.txt")
@@ -23,6 +224,53 @@ COMPETITOR_INTELLIGENCE_PROMPT_PATH = os.path.join("prompts", "competitor_intell
 FINANCIAL_VIABILITY_PROMPT_PATH = os.path.join("prompts", "financial_viability.txt")
 INVESTOR_DECISION_PROMPT_PATH = os.path.join("prompts", "investor_decision.txt")
 
+# ========== QUICK MODE ==========
+# /validate?mode=quick runs one structured call instead of the full graph
+QUICK_VALIDATION_PROMPT_PATH = os.path.join("prompts", "quick_validation.txt")
+VALIDATION_MODES = ["full", "quick"]
+# Response fields quick mode does not produce (returned as None and listed in "absent_fields")
+DEEP_FIELDS = ["competitor_intelligence", "financial_viability"]
+
+# ========== INCREMENTAL RE-ANALYSIS ==========
+# An edited idea reruns only the nodes affected by the change (see graphs/incremental.py)
+INCREMENTAL_ENABLED = True
+INCREMENTAL_MIN_SIMILARITY = 0.5    # below this text similarity the edit counts as a new idea
+
+# ========== COMPETITIVE METRICS (analytics/competitive_metrics.py) ==========
+# Concentration bands on the Herfindahl-Hirschman Index (shares in percent, 0-10000)
+HHI_MODERATE_FROM = 1500
+HHI_CONCENTRATED_FROM = 2500
+
+# Positioning score (0-100): how open the field is to a new entrant.
+# Each component is 0-1, higher = easier to win share.
+POSITIONING_WEIGHTS = {
+    "fragmentation": 0.35,    # 1 - HHI / 10000
+    "leader_gap": 0.25,       # 1 - largest share
+    "visibility_gap": 0.20,   # 1 - share-weighted brand visibility
+    "momentum_gap": 0.20      # 1 - share-weighted growth (capped at 100%)
+}
+POSITION_STRONG_FROM = 60
+POSITION_MODERATE_FROM = 40
+
+# ========== FINANCIAL SIMULATION (analytics/financial_simulator.py) ==========
+# Monte Carlo cash-flow model seeded from the financial_viability fields.
+# burn_rate is read as monthly operating spend (excluding cost of goods sold).
+FINANCIAL_SIM_SCENARIOS = 2000
+FINANCIAL_SIM_MAX_SCENARIOS = 20000
+FINANCIAL_SIM_HORIZON_MONTHS = 60
+FINANCIAL_SIM_SEED = 7                   # fixed seed: same inputs give the same results
+FINANCIAL_SIM_REVENUE_SIGMA = 0.30       # yearly log-volatility of revenue vs. plan (compounds)
+FINANCIAL_SIM_OPEX_SIGMA = 0.15          # log-volatility of operating spend
+FINANCIAL_SIM_MARGIN_SD = 5.0            # gross margin spread in percentage points
+FINANCIAL_SIM_OPEX_GROWTH = 0.15         # yearly growth of operating spend
+FINANCIAL_SIM_MAX_REVENUE_GROWTH = 2.0   # cap on the year-3 growth extrapolated to later years
+FINANCIAL_SIM_TARGET_RUNWAY = 24         # months of median runway that earn the full runway component
+VIABILITY_WEIGHTS = {
+    "default_alive": 0.5,   # share of scenarios that break even before cash runs out
+    "runway": 0.3,          # median runway / FINANCIAL_SIM_TARGET_RUNWAY (capped at 1)
+    "gross_margin": 0.2     # gross margin / 80% (capped at 1)
+}
+
 # Graph
 REPORTS_PATH = "reports"
 GRAPH_VISUALIZATION_PATH = os.path.join(REPORTS_PATH, "validX_graph.png")
@@ -54,3 +302,13 @@ class Config:
     # Session Configuration
     SESSION_TYPE = 'filesystem'
     PERMANENT_SESSION_LIFETIME = 3600
+    
+    # Password Hashing (bcrypt runs in a bounded process pool)
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))                      # stored hashes are rehashed when this changes
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', os.cpu_count() or 2))
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT', 10))     # seconds
+    
+    # User Lookup Cache (in-process, per worker)
+    USER_CACHE_MAXSIZE = int(os.environ.get('USER_CACHE_MAXSIZE', 1024))
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))                   # seconds
+    USER_CACHE_NEGATIVE_TTL = int(os.environ.get('USER_CACHE_NEGATIVE_TTL', 30))  # 0 disables negative caching
@@ -0,0 +1,119 @@
+# deadline.py - End-to-end request deadline shared by the frontend, the backend and graph nodes
+#
+# Budgets travel between hops as remaining seconds (DEADLINE_HEADER), never as
+# wall-clock timestamps, so the two services need no synchronized clocks.
+
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+
+from metrics import metrics
+from config import (
+    REQUEST_BUDGET_SECONDS,
+    DEADLINE_HOP_MARGIN,
+    DEADLINE_MIN_CALL_SECONDS,
+    OPTIONAL_NODE_MIN_BUDGET
+)
+
+_current_deadline = contextvars.ContextVar("current_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a run has no budget left for its next step."""
+
+
+def parse_budget(value):
+    """Budget in seconds from a DEADLINE_HEADER value, capped at REQUEST_BUDGET_SECONDS."""
+    try:
+        budget = float(value)
+    except (TypeError, ValueError):
+        return REQUEST_BUDGET_SECONDS
+    return max(0.0, min(budget, REQUEST_BUDGET_SECONDS))
+
+
+class Deadline:
+    """
+    A monotonic deadline for one request. exhausted is set once a step was
+    refused (or cut short) for lack of budget, so the run stops at the next node.
+    """
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.at = time.monotonic() + budget
+        self.exhausted = False
+
+    def remaining(self):
+        return self.at - time.monotonic()
+
+    def downstream_budget(self):
+        """Budget to hand to the next hop: what is left minus time to answer our caller."""
+        return max(0.0, self.remaining() - DEADLINE_HOP_MARGIN)
+
+    def header_value(self):
+        return f"{self.downstream_budget():.1f}"
+
+
+def current_deadline():
+    """Deadline of the request being served, or None outside one."""
+    return _current_deadline.get()
+
+
+@contextmanager
+def deadline_scope(budget):
+    """Run a block (and every node thread it starts) under a deadline of budget seconds."""
+    deadline = Deadline(budget)
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def budget_spent():
+    """True (and the deadline marked exhausted) when too little is left for another model call."""
+    deadline = current_deadline()
+    if deadline is not None and deadline.remaining() < DEADLINE_MIN_CALL_SECONDS:
+        deadline.exhausted = True
+        return True
+    return False
+
+
+def call_budget(node, timeout):
+    """
+    Timeout for one model call attempt: the node's own timeout capped by the
+    remaining budget. Raises DeadlineExceeded when too little is left to start.
+    """
+    deadline = current_deadline()
+    if deadline is None:
+        return timeout
+    if budget_spent():
+        metrics.incr("deadline_refused_calls", node=node)
+        raise DeadlineExceeded(f"{deadline.remaining():.1f}s left, not starting a model call for '{node}'")
+    return min(timeout, deadline.remaining())
+
+
+def budgeted(node, fn):
+    """
+    Wrap a graph node with the request deadline: optional nodes are skipped
+    when the budget is short, and the run stops once the budget is exhausted,
+    including when the node turned a refused call into a fallback answer.
+    """
+    min_budget = OPTIONAL_NODE_MIN_BUDGET.get(node.removesuffix("_fallback"))
+
+    @functools.wraps(fn)
+    def wrapper(state):
+        deadline = current_deadline()
+        if deadline is None:
+            return fn(state)
+        if deadline.exhausted or deadline.remaining() <= 0:
+            raise DeadlineExceeded(f"No budget left for '{node}'")
+        if min_budget is not None and deadline.remaining() < min_budget:
+            metrics.incr("deadline_skipped_nodes", node=node)
+            return {"skipped_nodes": (state.get("skipped_nodes") or []) + [node]}
+        update = fn(state)
+        if deadline.exhausted:
+            raise DeadlineExceeded(f"'{node}' ran out of budget")
+        return update
+
+    return wrapper
@@ -0,0 +1,209 @@
+# graphs/incremental.py - Which nodes to rerun when an idea is edited
+
+import difflib
+import re
+
+from config import INCREMENTAL_MIN_SIMILARITY
+
+# Graph nodes in execution order and the state keys each one writes
+NODE_ORDER = [
+    "analyze_market",
+    "analyze_competition",
+    "assess_risk",
+    "competitor_intelligence",
+    "financial_viability",
+    "advisor",
+    "investor_decision"
+]
+
+NODE_OUTPUTS = {
+    "analyze_market": ["market_analysis"],
+    "analyze_competition": ["competition_analysis"],
+    "assess_risk": ["risk_assessment"],
+    "competitor_intelligence": ["competitor_intelligence"],
+    "financial_viability": ["financial_viability"],
+    "advisor": ["advisor_recommendations", "advice"],
+    "investor_decision": [
+        "investor_decision",
+        "investor_confidence",
+        "investor_reasoning",
+        "investor_strengths",
+        "investor_concerns",
+        "suggested_investment",
+        "expected_return"
+    ]
+}
+
+# Upstream nodes whose output each node reads from state
+NODE_INPUTS = {
+    "analyze_market": [],
+    "analyze_competition": ["analyze_market"],
+    "assess_risk": ["analyze_market", "analyze_competition"],
+    "competitor_intelligence": ["analyze_market", "analyze_competition"],
+    "financial_viability": ["analyze_market", "analyze_competition", "assess_risk"],
+    "advisor": ["analyze_market", "analyze_competition", "assess_risk"],
+    "investor_decision": NODE_ORDER[:-1]
+}
+
+# Aspects of the idea text each node's output depends on
+NODE_ASPECTS = {
+    "analyze_market": {"market"},
+    "analyze_competition": {"market", "competition"},
+    "assess_risk": {"market", "competition", "risk"},
+    "competitor_intelligence": {"market", "competition"},
+    "financial_viability": {"market", "competition", "risk", "financial"},
+    "advisor": {"market", "competition", "risk"},
+    "investor_decision": {"market", "competition", "risk", "financial"}
+}
+
+# Keyword stems per aspect; a changed sentence matching none counts as "market"
+# Lexicons matched on word boundaries: whole words (plural "s"/"es" allowed),
+# stems ending in "*" match any word they start, multi-word phrases match the
+# text around a change, and currency symbols match as tokens.
+ASPECT_KEYWORDS = {
+    "competition": [
+        "competitor", "competition", "compete", "alternative", "differentiat*", "unique", "unlike",
+        "incumbent", "moat", "rival", "versus", "vs", "better than", "cheaper than"
+    ],
+    "risk": [
+        "regulat*", "complian*", "legal", "law", "privacy", "gdpr", "hipaa", "security", "risk",
+        "liabilit*", "licens*", "patent", "insurance", "safety"
+    ],
+    "financial": [
+        "price", "pricing", "priced", "subscription", "revenue", "cost", "margin", "fee", "$", "€", "£",
+        "per month", "per year", "monthly", "annual", "commission", "monetiz*", "freemium",
+        "funding", "raise", "budget", "profit", "payback", "ltv", "cac"
+    ],
+    "market": [
+        "market", "customer", "audience", "segment", "user", "demand", "industry", "region", "country",
+        "city", "b2b", "b2c", "consumer", "enterprise", "smb", "target"
+    ]
+}
+
+# Changed words that say nothing about any aspect
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "but", "of", "to", "in", "on", "for", "with", "at", "by", "from",
+    "as", "is", "are", "be", "it", "its", "this", "that", "we", "our", "will", "can", "/"
+}
+
+TOKEN_RE = re.compile(r"[$€£/]|[a-z0-9][a-z0-9'%.-]*[a-z0-9%]|[a-z0-9]")
+
+
+def keyword_pattern(keyword):
+    """Word-boundary regex for a lexicon entry."""
+    if not keyword[0].isalnum():
+        return re.compile(re.escape(keyword))
+    if keyword.endswith("*"):
+        return re.compile(r"\b" + re.escape(keyword[:-1]) + r"\w*")
+    return re.compile(r"\b" + re.escape(keyword).replace(r"\ ", r"\s+") + r"(?:s|es)?\b")
+
+
+ASPECT_PATTERNS = {
+    aspect: [(keyword, keyword_pattern(keyword)) for keyword in keywords]
+    for aspect, keywords in ASPECT_KEYWORDS.items()
+}
+
+
+def tokenize(text):
+    """Lowercased words, numbers and currency symbols of a text."""
+    return TOKEN_RE.findall(text.lower())
+
+
+def changed_hunks(old_idea, new_idea):
+    """
+    Word-level differences between two versions of an idea: one
+    (changed tokens, text around the change) pair per differing hunk.
+    """
+    old, new = tokenize(old_idea), tokenize(new_idea)
+    matcher = difflib.SequenceMatcher(a=old, b=new, autojunk=False)
+    hunks = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag != "equal":
+            context = " ".join(old[max(i1 - 2, 0):i2 + 2]) + "\n" + " ".join(new[max(j1 - 2, 0):j2 + 2])
+            hunks.append((old[i1:i2] + new[j1:j2], context))
+    return hunks
+
+
+def matching_aspects(text):
+    """Aspects with a keyword in text."""
+    return {aspect for aspect, patterns in ASPECT_PATTERNS.items() if any(p.search(text) for _, p in patterns)}
+
+
+def phrase_aspects(context):
+    """Aspects of each word that is part of a multi-word keyword in context ("per month")."""
+    words = {}
+    for aspect, patterns in ASPECT_PATTERNS.items():
+        for keyword, pattern in patterns:
+            if " " in keyword:
+                for match in pattern.finditer(context):
+                    for word in match.group().split():
+                        words.setdefault(word, set()).add(aspect)
+    return words
+
+
+def classify_change(tokens, context):
+    """
+    Aspects a change touches. Each changed word is classified on its own or by
+    the phrase it is part of; numbers and symbols take the aspects of their
+    context ("$50/month"), and a word outside every lexicon (e.g. the product
+    itself) always counts as "market".
+    """
+    phrases = phrase_aspects(context)
+    aspects = set()
+    for token in tokens:
+        if token in STOPWORDS:
+            continue
+        token_aspects = matching_aspects(token) | phrases.get(token, set())
+        if not token_aspects and not token[0].isalpha():
+            token_aspects = matching_aspects(context)
+        aspects |= token_aspects or {"market"}
+    return aspects
+
+
+def rerun_nodes(changed_aspects):
+    """
+    Nodes that must rerun, in order: nodes sensitive to a changed aspect plus
+    every node downstream of one that reruns.
+    """
+    selected = []
+    for node in NODE_ORDER:
+        if NODE_ASPECTS[node] & changed_aspects or any(dep in selected for dep in NODE_INPUTS[node]):
+            selected.append(node)
+    return selected
+
+
+def downstream_nodes(node):
+    """A node followed by every node that (transitively) reads its output, in order."""
+    selected = [node]
+    for candidate in NODE_ORDER[NODE_ORDER.index(node) + 1:]:
+        if any(dep in selected for dep in NODE_INPUTS[candidate]):
+            selected.append(candidate)
+    return selected
+
+
+def plan_rerun(old_idea, new_idea):
+    """
+    Compare a new idea with the previous one.
+
+    Returns a plan dict: changed_aspects, rerun_nodes (in order), reused_sections
+    and similarity. rerun_nodes is empty when the text is unchanged and covers
+    the whole graph when the edit is too large to reuse anything.
+    """
+    similarity = difflib.SequenceMatcher(a=old_idea.strip().lower(), b=new_idea.strip().lower(), autojunk=False).ratio()
+    changed = changed_hunks(old_idea, new_idea)
+
+    if not changed:
+        aspects = set()
+    elif similarity < INCREMENTAL_MIN_SIMILARITY:
+        aspects = {"market"}
+    else:
+        aspects = set().union(*(classify_change(tokens, context) for tokens, context in changed))
+
+    nodes = rerun_nodes(aspects) if aspects else []
+    reused = [key for node in NODE_ORDER if node not in nodes for key in NODE_OUTPUTS[node]]
+    return {
+        "changed_aspects": sorted(aspects),
+        "rerun_nodes": nodes,
+        "reused_sections": reused,
+        "similarity": round(similarity, 3)
+    }
@@ -1,9 +1,8 @@
 # graphs/workflow.py
 
 from langgraph.graph import StateGraph, END
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 import os
-from langchain_core.messages import ToolMessage
 from state.agent_state import AgentState
 
 # Existing imports
@@ -16,44 +15,47 @@ from nodes.advisor import advisor
 from nodes.competitor_intelligence import analyze_competitor_intelligence
 from nodes.financial_viability import analyze_financial_viability
 from nodes.investor_decision import make_investor_decision
+from nodes.quick_validator import quick_validate
 
 from tools.web_search_tool import web_search
+from tools.parallel_tool_node import ParallelToolNode
+from state.run_context import accounted
+from deadline import budgeted
+from functools import lru_cache
 from config import REPORTS_PATH, GRAPH_VISUALIZATION_PATH, ANALYSIS_LIST
 
 
+# Node that continues the flow once an analysis section is filled
+NEXT_NODE = {
+    "market_analysis": "analyze_competition",
+    "competition_analysis": "assess_risk",
+    "risk_assessment": "competitor_intelligence",
+    "competitor_intelligence": "financial_viability",
+    "financial_viability": "advisor"
+}
+
+# Chat-model-only node used when every tool call for a section failed
+FALLBACK_NODE = {
+    "market_analysis": "analyze_market_fallback",
+    "competition_analysis": "analyze_competition_fallback",
+    "risk_assessment": "assess_risk_fallback",
+    "competitor_intelligence": "competitor_intelligence_fallback",
+    "financial_viability": "financial_viability_fallback"
+}
+
+
+def graph_node(name, fn):
+    """Node function with per-run accounting and the request deadline applied."""
+    return accounted(name, budgeted(name, fn))
+
+
 def router(state: AgentState):
     """Handles the routing logic after the tools node"""
-    for analysis in ANALYSIS_LIST:
-        if state.get(str(analysis)) is None:
-            # if tool is failed
-            if isinstance(state["messages"][-1], ToolMessage) and state["messages"][-1].content == "tool_failed":
-                if analysis == "market_analysis":
-                    return_node = "analyze_market_fallback"
-                elif analysis == "competition_analysis":
-                    return_node = "analyze_competition_fallback"
-                elif analysis == "risk_assessment":
-                    return_node = "assess_risk_fallback"
-                elif analysis == "competitor_intelligence":
-                    return_node = "competitor_intelligence_fallback"
-                elif analysis == "financial_viability":
-                    return_node = "financial_viability_fallback"
-                break
-            else:
-                if isinstance(state["messages"][-1], ToolMessage):
-                    state[analysis] = state["messages"][-1].content
-                
-                if analysis == "market_analysis":
-                    return_node = "analyze_competition"
-                elif analysis == "competition_analysis":
-                    return_node = "assess_risk"
-                elif analysis == "risk_assessment":
-                    return_node = "competitor_intelligence"  # NEW FLOW
-                elif analysis == "competitor_intelligence":
-                    return_node = "financial_viability"       # NEW FLOW
-                elif analysis == "financial_viability":
-                    return_node = "advisor"
-                break
-    return return_node
+    section = state["tool_section"]
+    # tools node leaves the section empty when every tool call failed
+    if state.get(section) is None:
+        return FALLBACK_NODE[section]
+    return NEXT_NODE[section]
 
 
 def build_graph():
@@ -61,26 +63,26 @@ def build_graph():
         graph_builder = StateGraph(AgentState)
         
         # ========== EXISTING NODES ==========
-        graph_builder.add_node("analyze_market", analyze_market(preferred_mode="tools"))
-        graph_builder.add_node("analyze_competition", analyze_competition(preferred_mode="tools"))
-        graph_builder.add_node("assess_risk", assess_risk(preferred_mode="tools"))
+        graph_builder.add_node("analyze_market", graph_node("analyze_market", analyze_market(preferred_mode="tools")))
+        graph_builder.add_node("analyze_competition", graph_node("analyze_competition", analyze_competition(preferred_mode="tools")))
+        graph_builder.add_node("assess_risk", graph_node("assess_risk", assess_risk(preferred_mode="tools")))
         
         # Fallback nodes (chat_model only)
-        graph_builder.add_node("analyze_market_fallback", analyze_market(preferred_mode="chat_model"))
-        graph_builder.add_node("analyze_competition_fallback", analyze_competition(preferred_mode="chat_model"))
-        graph_builder.add_node("assess_risk_fallback", assess_risk(preferred_mode="chat_model"))
+        graph_builder.add_node("analyze_market_fallback", graph_node("analyze_market_fallback", analyze_market(preferred_mode="chat_model")))
+        graph_builder.add_node("analyze_competition_fallback", graph_node("analyze_competition_fallback", analyze_competition(preferred_mode="chat_model")))
+        graph_builder.add_node("assess_risk_fallback", graph_node("assess_risk_fallback", assess_risk(preferred_mode="chat_model")))
         
         # ========== NEW NODES ==========
-        graph_builder.add_node("competitor_intelligence", analyze_competitor_intelligence(preferred_mode="chat_model"))
-        graph_builder.add_node("competitor_intelligence_fallback", analyze_competitor_intelligence(preferred_mode="chat_model"))
+        graph_builder.add_node("competitor_intelligence", graph_node("competitor_intelligence", analyze_competitor_intelligence(preferred_mode="chat_model")))
+        graph_builder.add_node("competitor_intelligence_fallback", graph_node("competitor_intelligence_fallback", analyze_competitor_intelligence(preferred_mode="chat_model")))
         
-        graph_builder.add_node("financial_viability", analyze_financial_viability(preferred_mode="chat_model"))
-        graph_builder.add_node("financial_viability_fallback", analyze_financial_viability(preferred_mode="chat_model"))
+        graph_builder.add_node("financial_viability", graph_node("financial_viability", analyze_financial_viability(preferred_mode="chat_model")))
+        graph_builder.add_node("financial_viability_fallback", graph_node("financial_viability_fallback", analyze_financial_viability(preferred_mode="chat_model")))
         
-        graph_builder.add_node("advisor", advisor)
-        graph_builder.add_node("investor_decision", make_investor_decision)  # NEW: Final decision node
+        graph_builder.add_node("advisor", graph_node("advisor", advisor))
+        graph_builder.add_node("investor_decision", graph_node("investor_decision", make_investor_decision))  # NEW: Final decision node
         
-        graph_builder.add_node("tools", ToolNode(tools=[web_search]))
+        graph_builder.add_node("tools", graph_node("tools", ParallelToolNode(tools=[web_search])))
         
         # ========== WORKFLOW EDGES ==========
         graph_builder.set_entry_point("analyze_market")
@@ -114,3 +116,53 @@ def build_graph():
     except Exception as e:
         print(f"Error in building graph: {e}")
         return None
+
+
+def build_quick_graph():
+    """
+    Low-latency tier: a single structured call (quick_validator) instead of
+    the full analysis chain. Deep sections are left empty.
+    """
+    try:
+        graph_builder = StateGraph(AgentState)
+        graph_builder.add_node("quick_validator", graph_node("quick_validator", quick_validate))
+        graph_builder.set_entry_point("quick_validator")
+        graph_builder.add_edge("quick_validator", END)
+        return graph_builder.compile()
+    except Exception as e:
+        print(f"Error in building quick graph: {e}")
+        return None
+
+
+# Chat-model node functions used by partial graphs (no tools round)
+PARTIAL_NODE_FACTORIES = {
+    "analyze_market": lambda: analyze_market(preferred_mode="chat_model"),
+    "analyze_competition": lambda: analyze_competition(preferred_mode="chat_model"),
+    "assess_risk": lambda: assess_risk(preferred_mode="chat_model"),
+    "competitor_intelligence": lambda: analyze_competitor_intelligence(preferred_mode="chat_model"),
+    "financial_viability": lambda: analyze_financial_viability(preferred_mode="chat_model"),
+    "advisor": lambda: advisor,
+    "investor_decision": lambda: make_investor_decision
+}
+
+
+@lru_cache(maxsize=None)
+def build_partial_graph(nodes):
+    """
+    Linear graph over a subset of nodes (a tuple, in execution order).
+    Used to rerun only the nodes affected by an edit; every other section
+    is taken from the state the graph is invoked with.
+    """
+    try:
+        graph_builder = StateGraph(AgentState)
+        for node in nodes:
+            graph_builder.add_node(node, graph_node(node, PARTIAL_NODE_FACTORIES[node]()))
+        graph_builder.set_entry_point(nodes[0])
+        for current, following in zip(nodes, nodes[1:]):
+            graph_builder.add_edge(current, following)
+        graph_builder.add_edge(nodes[-1], END)
+        return graph_builder.compile()
+    except Exception as e:
+        print(f"Error in building partial graph {nodes}: {e}")
+        return None
+
@@ -0,0 +1,39 @@
+# inprocess.py - Bridge from Flask request threads to the backend executor in the same process
+#
+# In the single-service deployment (asgi.py) the backend registers its event loop
+# and validation coroutine here at startup. Flask then validates in-process instead
+# of POSTing to BASE_URL. This module imports nothing heavy so app.py stays light.
+
+import asyncio
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+_loop = None
+_validate = None
+
+
+def register(loop, validate):
+    """Called by asgi.py once the event loop is running."""
+    global _loop, _validate
+    _loop, _validate = loop, validate
+
+
+def unregister():
+    global _loop, _validate
+    _loop, _validate = None, None
+
+
+def is_enabled():
+    return _loop is not None and _validate is not None
+
+
+def validate(body, params, request_headers, timeout):
+    """
+    Run the backend's /validate on its event loop from a (Flask) worker thread.
+    Returns (status_code, body bytes, headers). Raises TimeoutError on expiry.
+    """
+    future = asyncio.run_coroutine_threadsafe(_validate(body, dict(params), dict(request_headers)), _loop)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        future.cancel()
+        raise TimeoutError(f"in-process validation exceeded {timeout}s")
@@ -1,24 +1,166 @@
 # main.py - FastAPI Backend with Extended Investor Analysis
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import Response, JSONResponse, ORJSONResponse
 from pydantic import BaseModel, Field
-from typing import Annotated
-from graphs.workflow import build_graph
+from typing import Annotated, Optional
+from graphs.workflow import build_graph, build_quick_graph, build_partial_graph
+from graphs.incremental import NODE_ORDER, NODE_OUTPUTS, plan_rerun, downstream_nodes
+from state.agent_state import initial_state, resume_state
+from state.run_context import run_accounting, start_tracing, resources_header, RunResourceError
+from state.run_store import run_store
+from response_encoding import select_fields, encode_json, make_etag, etag_matches, encode_body
+from serialization import HAS_ORJSON
+from metrics import metrics
+from cassette import cassette_session
+from deadline import deadline_scope, current_deadline, parse_budget, DeadlineExceeded
+from tools.web_search_tool import prefetch_for_idea, finish_prefetch, prefetcher, search_cache, get_search_client
+from tools.search_health import search_health
+from nodes.prompt_loader import load_prompt
+import nodes.market_analyst as market_analyst_node
+import nodes.competitor_analysis as competitor_analysis_node
+import nodes.risk_assessor as risk_assessor_node
+import nodes.competitor_intelligence as competitor_intelligence_node
+import nodes.financial_viability as financial_viability_node
+import nodes.advisor as advisor_node
+import nodes.investor_decision as investor_decision_node
+import nodes.quick_validator as quick_validator_node
+from models.chat_model import get_chat_model
+from models.routing import router
+from analytics.financial_simulator import simulate
+from contextlib import asynccontextmanager
+from config import (
+    ADVISOR_PROMPT_PATH,
+    MARKET_ANALYST_PROMPT_PATH,
+    COMPETITOR_ANALYSIS_PROMPT_PATH,
+    RISK_ASSESSOR_PROMPT_PATH,
+    COMPETITOR_INTELLIGENCE_PROMPT_PATH,
+    FINANCIAL_VIABILITY_PROMPT_PATH,
+    INVESTOR_DECISION_PROMPT_PATH,
+    QUICK_VALIDATION_PROMPT_PATH,
+    VALIDATION_MODES,
+    DEEP_FIELDS,
+    INCREMENTAL_ENABLED,
+    CASSETTE_MODE,
+    BACKEND_MODE,
+    RESOURCE_HEADER_ENABLED,
+    WARMUP_MODEL_PING,
+    WARMUP_PING_MAX_TOKENS,
+    REQUEST_BUDGET_SECONDS,
+    DEADLINE_HEADER,
+    RESULT_SECTIONS,
+    USAGE_USER_HEADER,
+    INTERNAL_SECRET_HEADER,
+    INTERNAL_SECRET,
+    FINANCIAL_SIM_SCENARIOS,
+    FINANCIAL_SIM_MAX_SCENARIOS
+)
 import traceback
 import logging
 import asyncio
+import time
+import hmac
 
 # Configure logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
-app = FastAPI()
+# ========== WARM-UP & READINESS ==========
+PROMPT_PATHS = [
+    MARKET_ANALYST_PROMPT_PATH,
+    COMPETITOR_ANALYSIS_PROMPT_PATH,
+    RISK_ASSESSOR_PROMPT_PATH,
+    ADVISOR_PROMPT_PATH,
+    COMPETITOR_INTELLIGENCE_PROMPT_PATH,
+    FINANCIAL_VIABILITY_PROMPT_PATH,
+    INVESTOR_DECISION_PROMPT_PATH,
+    QUICK_VALIDATION_PROMPT_PATH
+]
+
+# Node chain builders and the modes build_graph uses them in
+CHAIN_BUILDERS = [
+    (market_analyst_node.build_chain, ("tools", "chat_model")),
+    (competitor_analysis_node.build_chain, ("tools", "chat_model")),
+    (risk_assessor_node.build_chain, ("tools", "chat_model")),
+    (competitor_intelligence_node.build_chain, ("chat_model",)),
+    (financial_viability_node.build_chain, ("chat_model",)),
+    (advisor_node.build_chain, ()),
+    (investor_decision_node.build_chain, ()),
+    (quick_validator_node.build_chain, ())
+]
+
+warmup_status = {"ready": False, "started_at": None, "finished_at": None, "steps": {}}
+
+def warm_prompts():
+    for path in PROMPT_PATHS:
+        load_prompt(path)
+
+def warm_chains():
+    """Build every node's prompt template, parser format instructions and model binding"""
+    for build_chain, modes in CHAIN_BUILDERS:
+        if modes:
+            for mode in modes:
+                build_chain(mode)
+        else:
+            build_chain()
+
+def warm_model():
+    """One tiny request: opens the HTTP connection to the inference endpoint"""
+    get_chat_model().invoke("ping", max_tokens=WARMUP_PING_MAX_TOKENS)
+
+def run_warmup_step(name, fn, required=True):
+    """Run one warm-up step. Returns False only if a required step failed."""
+    started = time.perf_counter()
+    try:
+        fn()
+        warmup_status["steps"][name] = {"ok": True, "seconds": round(time.perf_counter() - started, 3)}
+        logger.info(f"🔥 Warm-up '{name}' done in {warmup_status['steps'][name]['seconds']}s")
+        return True
+    except Exception as e:
+        warmup_status["steps"][name] = {"ok": False, "seconds": round(time.perf_counter() - started, 3), "error": str(e)}
+        logger.error(f"❌ Warm-up '{name}' failed: {e}")
+        return not required
+
+def warm_up():
+    """
+    Preload everything the first /validate would otherwise set up lazily.
+    The model ping is optional: an unreachable endpoint does not block readiness.
+    """
+    warmup_status["started_at"] = time.time()
+    start_tracing()
+    ready = run_warmup_step("prompts", warm_prompts)
+    ready = run_warmup_step("chains", warm_chains) and ready
+    if BACKEND_MODE != "stub":
+        ready = run_warmup_step("search_client", get_search_client) and ready
+    if WARMUP_MODEL_PING and CASSETTE_MODE != "replay" and BACKEND_MODE != "stub":
+        run_warmup_step("model_ping", warm_model, required=False)
+    warmup_status["finished_at"] = time.time()
+    warmup_status["ready"] = ready
+    if ready:
+        logger.info("✅ Warm-up complete, backend is ready")
+    else:
+        logger.error("❌ Warm-up failed, /readyz will keep reporting not ready")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if not INTERNAL_SECRET:
+        # Without it every run would be anonymous: no usage charged, no run ownership
+        logger.error("❌ VALIDX_INTERNAL_SECRET is not set: export the same value for the backend and the Flask frontend")
+        raise RuntimeError("VALIDX_INTERNAL_SECRET is required")
+    # Warm up in a worker thread so /healthz answers while it runs
+    warmup_task = asyncio.create_task(asyncio.to_thread(warm_up))
+    yield
+    if not warmup_task.done():
+        warmup_task.cancel()
+
+# Dict responses (/metrics, /runs, errors) are rendered with orjson when it is installed
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse if HAS_ORJSON else JSONResponse)
 
 # Build graph at startup
 logger.info("🔨 Building workflow graph...")
 try:
     graph = build_graph()
+    quick_graph = build_quick_graph()
     logger.info("✅ Graph built successfully")
 except Exception as e:
     logger.error(f"❌ Error building graph: {e}")
@@ -28,75 +170,318 @@ except Exception as e:
 # Pydantic model for request body
 class StartupIdea(BaseModel):
     startup_idea: Annotated[str, Field(..., description="Startup idea to validate")]
+    previous_run_id: Annotated[Optional[str], Field(None, description="The user's previous run, for incremental re-analysis")]
+
+class FinancialScenario(BaseModel):
+    run_id: Annotated[Optional[str], Field(None, description="Stored run whose financial_viability seeds the inputs")]
+    revenue_projections: Annotated[Optional[list[float]], Field(None, description="Year 1-3 revenue in thousands")]
+    burn_rate: Annotated[Optional[float], Field(None, ge=0, description="Monthly operating spend in thousands")]
+    gross_margin: Annotated[Optional[float], Field(None, ge=0, le=100, description="Gross margin percentage")]
+    funding_needed: Annotated[Optional[float], Field(None, ge=0, description="Funding raised in thousands")]
+    revenue_multiplier: Annotated[float, Field(1.0, ge=0, le=10, description="What-if scale on projected revenue")]
+    burn_multiplier: Annotated[float, Field(1.0, ge=0, le=10, description="What-if scale on the burn rate")]
+    scenarios: Annotated[int, Field(FINANCIAL_SIM_SCENARIOS, ge=100, le=FINANCIAL_SIM_MAX_SCENARIOS)]
+
+def encode_payload(payload, fields=None, if_none_match=None, accept_encoding=None, status_code=200, headers=None):
+    """
+    Encode a JSON payload honouring fields, If-None-Match and Accept-Encoding.
+    Returns (status_code, body, headers).
+    """
+    body = encode_json(select_fields(payload, fields))
+    etag = make_etag(body)
+    headers = {**(headers or {}), "ETag": etag, "Vary": "Accept-Encoding"}
+    
+    if etag_matches(if_none_match, etag):
+        return 304, b"", headers
+    
+    body, encoding = encode_body(body, accept_encoding)
+    headers["Content-Type"] = "application/json"
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return status_code, body, headers
+
+def encoded_response(request: Request, payload, status_code=200, headers=None):
+    """
+    JSON response honouring ?fields=, If-None-Match and Accept-Encoding.
+    """
+    status_code, body, headers = encode_payload(
+        payload,
+        fields=request.query_params.get("fields"),
+        if_none_match=request.headers.get("if-none-match"),
+        accept_encoding=request.headers.get("accept-encoding"),
+        status_code=status_code,
+        headers=headers
+    )
+    if status_code == 304:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, status_code=status_code, headers=headers)
 
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Valid-X API"}
 
-@app.post("/validate")
-async def research(idea: StartupIdea):
-    logger.info(f"🔍 Validation request received: {idea.startup_idea[:100]}...")
+@app.get("/healthz")
+def healthz():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+def readyz():
+    """Readiness: 200 only after warm-up has finished successfully"""
+    if warmup_status["ready"]:
+        status = "ready"
+    elif warmup_status["finished_at"] is None:
+        status = "warming_up"
+    else:
+        status = "failed"
+    body = {"status": status, **warmup_status}
+    status_code = 200 if status == "ready" else 503
+    return Response(content=encode_json(body), status_code=status_code, media_type="application/json")
+
+@app.get("/metrics")
+def read_metrics():
+    """LLM call latency, hedge/win, timeout and retry counters plus search cache/prefetch stats"""
+    return {
+        **metrics.snapshot(),
+        "search_cache": search_cache.stats(),
+        "search_prefetch": prefetcher.stats(),
+        "search_health": search_health.stats(),
+        "model_routing": router.stats(),
+        "run_store": run_store.stats()
+    }
+
+def build_response(result, mode="full", incremental=None):
+    """
+    API payload for a finished graph state.
+    Same shape in every mode; deep fields a mode did not produce are None and listed in absent_fields.
+    incremental describes what an incremental run reused (None otherwise).
+    """
+    payload = {
+        # Existing fields
+        "startup_idea": result["startup_idea"],
+        "market_analysis": result["market_analysis"],
+        "competition_analysis": result["competition_analysis"],
+        "risk_assessment": result["risk_assessment"],
+        "advisor_recommendations": result["advisor_recommendations"],
+        "advice": result["advice"],
+        
+        # ========== NEW: INVESTOR DECISION DATA ==========
+        "competitor_intelligence": result.get("competitor_intelligence", {}),
+        "financial_viability": result.get("financial_viability", {}),
+        "investor_decision": result.get("investor_decision", "HOLD"),
+        "investor_confidence": result.get("investor_confidence", 50),
+        "investor_reasoning": result.get("investor_reasoning", ""),
+        "investor_strengths": result.get("investor_strengths", ""),
+        "investor_concerns": result.get("investor_concerns", ""),
+        "suggested_investment": result.get("suggested_investment", 0),
+        "expected_return": result.get("expected_return", "")
+    }
+    payload["mode"] = mode
+    payload["absent_fields"] = [field for field in DEEP_FIELDS if payload[field] is None]
+    payload["incremental"] = incremental
+    
+    # Runs stopped at their deadline, or that skipped optional nodes for lack of
+    # budget, return every finished section; skipped nodes' sections are missing
+    # even when an older value was carried over from a previous run
+    skipped = result.get("skipped_nodes") or []
+    skipped_sections = {key for node in skipped for key in NODE_OUTPUTS.get(node.removesuffix("_fallback"), [])}
+    payload["partial"] = bool(result.get("partial") or skipped)
+    payload["skipped_nodes"] = skipped
+    payload["missing_sections"] = [
+        field for field in RESULT_SECTIONS if result.get(field) is None or field in skipped_sections
+    ] if payload["partial"] else []
+    return payload
+
+async def stream_values(selected_graph, state, latest):
+    """Run a graph, keeping its latest full state in latest after every step"""
+    async for values in selected_graph.astream(state, stream_mode="values"):
+        latest.update(values)
+
+async def run_graph(startup_idea, mode="full", selected_graph=None, state=None):
+    """
+    Run the validation graph for one idea (mode="quick" runs the single-call graph).
+    selected_graph/state run a partial graph from an existing state instead.
+    Records or replays the run when a cassette mode is configured.
+    Runs under the current request deadline: when it expires the sections
+    finished so far are returned with partial=True.
+    """
+    if selected_graph is None:
+        selected_graph = quick_graph if mode == "quick" else graph
+    with cassette_session(startup_idea):
+        # Warm the search cache while the first LLM call decides what to search
+        # (only the full graph searches)
+        prefetch_batch = prefetch_for_idea(startup_idea) if selected_graph is graph else None
+        state = state or initial_state(startup_idea)
+        result = dict(state)
+        deadline = current_deadline()
+        try:
+            await asyncio.wait_for(
+                stream_values(selected_graph, state, result),
+                timeout=deadline.remaining() if deadline else REQUEST_BUDGET_SECONDS
+            )
+        except (DeadlineExceeded, asyncio.TimeoutError) as e:
+            metrics.incr("deadline_partial_runs", mode=mode)
+            logger.warning(f"⏱️ Deadline reached ({type(e).__name__}): returning partial results")
+            result["partial"] = True
+        finally:
+            if result.get("skipped_nodes"):
+                result["partial"] = True
+            prefetch_report = finish_prefetch(prefetch_batch)
+            if prefetch_report:
+                logger.info(f"🔎 Search prefetch: {prefetch_report}")
+    
+    if result.get("search_stats"):
+        logger.info(f"🗜️ Search compaction: {result['search_stats']}")
+    return result
+
+def incremental_plan(startup_idea, previous_run_id, user_id=None):
+    """
+    Plan an incremental rerun against the user's previous run.
+    Returns (previous revision, plan) or (None, None) when nothing can be reused.
+    """
+    if not INCREMENTAL_ENABLED or not previous_run_id:
+        return None, None
+    previous = run_store.get(previous_run_id, owner=user_id)
+    # Quick and partial runs have no complete set of sections to reuse
+    if previous is None or previous["response"].get("mode") == "quick" or previous["response"].get("partial"):
+        return None, None
+    plan = plan_rerun(previous["state"]["startup_idea"], startup_idea)
+    if plan["rerun_nodes"] == NODE_ORDER:
+        return None, None
+    return previous, plan
+
+async def run_incremental(startup_idea, previous, plan):
+    """Rerun only the planned nodes on top of the previous run's sections"""
+    state = resume_state(previous["state"], startup_idea)
+    metrics.incr("incremental_runs")
+    metrics.incr("incremental_nodes_skipped", len(NODE_ORDER) - len(plan["rerun_nodes"]))
+    if not plan["rerun_nodes"]:
+        return state
+    partial_graph = build_partial_graph(tuple(plan["rerun_nodes"]))
+    return await run_graph(startup_idea, "incremental", partial_graph, state)
+
+def run_headers(run_id, run):
+    """Response headers for a finished run: its id (if stored) and, if enabled, its resource usage"""
+    headers = {"X-Run-Id": run_id} if run_id else {}
+    if run is not None and RESOURCE_HEADER_ENABLED:
+        headers["X-ValidX-Resources"] = resources_header(run)
+    return headers
+
+def request_user_id(headers):
+    """
+    User the Flask frontend made the call for (USAGE_USER_HEADER), or None.
+    The header is ignored unless the call carries the frontend's INTERNAL_SECRET.
+    """
+    if USAGE_USER_HEADER not in headers or not INTERNAL_SECRET:
+        return None
+    if not hmac.compare_digest(headers.get(INTERNAL_SECRET_HEADER, "").encode(), INTERNAL_SECRET.encode()):
+        metrics.incr("usage_user_header_rejected")
+        return None
+    try:
+        return int(headers.get(USAGE_USER_HEADER))
+    except (TypeError, ValueError):
+        return None
+
+def resource_error(e):
+    logger.error(f"❌ RESOURCE CEILING: {e}")
+    return HTTPException(status_code=413, detail={"error": str(e), "error_type": type(e).__name__})
+
+@app.get("/runs/{run_id}")
+def read_run(run_id: str, request: Request, revision: int | None = None):
+    """Stored result of a previous validation of the calling user (supports ?fields= and If-None-Match)"""
+    stored = run_store.get(run_id, revision, owner=request_user_id(request.headers))
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    return encoded_response(request, {**stored["response"], "revision": stored["revision"]})
+
+@app.post("/runs/{run_id}/rerun")
+async def rerun(run_id: str, request: Request, node: str, downstream: bool = True):
+    """
+    Re-execute one node of a stored run (and, unless ?downstream=false, the nodes
+    that depend on it) against the stored upstream state. Stored as a new revision.
+    """
+    if node not in NODE_ORDER:
+        raise HTTPException(status_code=400, detail=f"Unknown node '{node}'. Use one of: {', '.join(NODE_ORDER)}")
+    user_id = request_user_id(request.headers)
+    stored = run_store.get(run_id, owner=user_id)
+    if stored is None:
+        raise HTTPException(status_code=404, detail="Run not found")
+    
+    nodes = downstream_nodes(node) if downstream else [node]
+    startup_idea = stored["state"]["startup_idea"]
+    logger.info(f"🔁 Rerun of {nodes} for run {run_id}")
+    
+    try:
+        with run_accounting("rerun", user_id) as run, deadline_scope(parse_budget(request.headers.get(DEADLINE_HEADER))):
+            state = resume_state(stored["state"], startup_idea)
+            result = await run_graph(startup_idea, "rerun", build_partial_graph(tuple(nodes)), state)
+    except RunResourceError as e:
+        raise resource_error(e)
+    except Exception as e:
+        logger.error(f"❌ ERROR IN RERUN: {str(e)}")
+        logger.error(f"❌ FULL TRACEBACK:\n{traceback.format_exc()}")
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "error": str(e),
+                "error_type": type(e).__name__,
+                "traceback": traceback.format_exc()
+            }
+        )
+    
+    metrics.incr("node_reruns", node=node)
+    payload = build_response(result, stored["response"].get("mode", "full"))
+    payload["run_id"] = run_id
+    payload["rerun_nodes"] = nodes
+    revision = run_store.add_revision(run_id, payload, result, source=f"rerun:{node}")
+    if revision is None:
+        raise HTTPException(status_code=404, detail="Run expired during rerun")
+    return encoded_response(request, {**payload, "revision": revision["revision"]}, headers=run_headers(run_id, run))
+
+async def execute_validation(startup_idea, mode="full", previous_run_id=None, budget=REQUEST_BUDGET_SECONDS, user_id=None):
+    """
+    Validate an idea within budget seconds and store the run; usage is charged to user_id.
+    Returns (payload, headers).
+    Shared by POST /validate and the in-process executor (asgi.py); errors are HTTPExceptions.
+    """
+    logger.info(f"🔍 Validation request received ({mode}): {startup_idea[:100]}...")
+    
+    if mode not in VALIDATION_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown mode '{mode}'. Use one of: {', '.join(VALIDATION_MODES)}")
     
     try:
         logger.info("⚙️ Invoking graph...")
         
-        # Add timeout protection (5 minutes)
-        result = await asyncio.wait_for(
-            graph.ainvoke(
-                {
-                    "startup_idea": idea.startup_idea,
-                    "market_analysis": None,
-                    "competition_analysis": None,
-                    "risk_assessment": None,
-                    "advisor_recommendations": None,
-                    "advice": None,
-                    # ========== NEW FIELDS ==========
-                    "competitor_intelligence": None,
-                    "financial_viability": None,
-                    "investor_decision": None,
-                    "investor_confidence": None,
-                    "investor_reasoning": None,
-                    "investor_strengths": None,
-                    "investor_concerns": None,
-                    "suggested_investment": None,
-                    "expected_return": None,
-                    "messages": []
-                }
-            ),
-            timeout=300
-        )
+        previous, plan = incremental_plan(startup_idea, previous_run_id, user_id) if mode == "full" else (None, None)
+        with run_accounting(mode if plan is None else "incremental", user_id) as run, deadline_scope(budget):
+            if plan is not None:
+                mode = "incremental"
+                logger.info(f"♻️ Incremental rerun of {plan['rerun_nodes']} (changed: {plan['changed_aspects']})")
+                result = await run_incremental(startup_idea, previous, plan)
+                plan = {"previous_run_id": previous_run_id, **plan}
+            else:
+                result = await run_graph(startup_idea, mode)
         
-        logger.info("✅ Graph execution completed")
+        if result.get("partial") and all(result.get(field) is None for field in RESULT_SECTIONS):
+            raise asyncio.TimeoutError()
         
-        return JSONResponse(
-            status_code=200, 
-            content={
-                # Existing fields
-                "startup_idea": result["startup_idea"],
-                "market_analysis": result["market_analysis"],
-                "competition_analysis": result["competition_analysis"],
-                "risk_assessment": result["risk_assessment"],
-                "advisor_recommendations": result["advisor_recommendations"],
-                "advice": result["advice"],
-                
-                # ========== NEW: INVESTOR DECISION DATA ==========
-                "competitor_intelligence": result.get("competitor_intelligence", {}),
-                "financial_viability": result.get("financial_viability", {}),
-                "investor_decision": result.get("investor_decision", "HOLD"),
-                "investor_confidence": result.get("investor_confidence", 50),
-                "investor_reasoning": result.get("investor_reasoning", ""),
-                "investor_strengths": result.get("investor_strengths", ""),
-                "investor_concerns": result.get("investor_concerns", ""),
-                "suggested_investment": result.get("suggested_investment", 0),
-                "expected_return": result.get("expected_return", "")
-            }
-        )
+        logger.info("✅ Graph execution completed" + (" (partial)" if result.get("partial") else ""))
+        if run is not None:
+            logger.info(f"📊 Run resources: {run.report()}")
+        
+        payload = build_response(result, mode, plan)
+        # Runs of unidentified callers are not stored: nobody could read them back
+        payload["run_id"] = run_store.create(payload, result, owner=user_id) if user_id is not None else None
+        return payload, run_headers(payload["run_id"], run)
+        
+    except RunResourceError as e:
+        raise resource_error(e)
         
     except asyncio.TimeoutError:
-        logger.error("❌ TIMEOUT: Graph execution exceeded 5 minutes")
+        logger.error(f"❌ TIMEOUT: No section finished within the {budget:.0f}s budget")
         raise HTTPException(
             status_code=504,
-            detail="Analysis timeout: Request took too long (>5 minutes). Try a shorter idea."
+            detail=f"Analysis timeout: No section finished within {budget:.0f} seconds. Try a shorter idea."
         )
         
     except Exception as e:
@@ -112,3 +497,66 @@ async def research(idea: StartupIdea):
                 "traceback": traceback.format_exc()
             }
         )
+
+@app.post("/validate")
+async def research(idea: StartupIdea, request: Request, mode: str = "full"):
+    budget = parse_budget(request.headers.get(DEADLINE_HEADER))
+    payload, headers = await execute_validation(idea.startup_idea, mode, idea.previous_run_id, budget, request_user_id(request.headers))
+    return encoded_response(request, payload, headers=headers)
+
+async def inprocess_validate(body, params, request_headers):
+    """
+    /validate without the HTTP hop, for the single-service deployment.
+    Takes the same body, query params and forwarded headers the Flask proxy
+    would send; returns (status_code, body bytes, headers) as the endpoint would.
+    """
+    try:
+        idea = StartupIdea(**body)
+        budget = parse_budget(request_headers.get(DEADLINE_HEADER))
+        payload, headers = await execute_validation(
+            idea.startup_idea, params.get("mode", "full"), idea.previous_run_id, budget, request_user_id(request_headers)
+        )
+    except HTTPException as e:
+        return e.status_code, encode_json({"detail": e.detail}), {"Content-Type": "application/json"}
+    except ValueError as e:
+        # Pydantic validation error for the body (FastAPI would answer 422)
+        return 422, encode_json({"detail": str(e)}), {"Content-Type": "application/json"}
+    return encode_payload(
+        payload,
+        fields=params.get("fields"),
+        if_none_match=request_headers.get("If-None-Match"),
+        accept_encoding=request_headers.get("Accept-Encoding"),
+        headers=headers
+    )
+
+@app.post("/financials/simulate")
+def simulate_financials(scenario: FinancialScenario, request: Request):
+    """
+    Monte Carlo what-if on the financial fields, without a model call.
+    Inputs default to the stored run's financial_viability when run_id (of the caller) is given.
+    """
+    base = {}
+    if scenario.run_id is not None:
+        stored = run_store.get(scenario.run_id, owner=request_user_id(request.headers))
+        if stored is None:
+            raise HTTPException(status_code=404, detail="Run not found")
+        base = stored["response"].get("financial_viability") or {}
+    inputs = {
+        field: value if value is not None else base.get(field)
+        for field, value in scenario.model_dump(include={"revenue_projections", "burn_rate", "gross_margin", "funding_needed"}).items()
+    }
+    if inputs["revenue_projections"] is None or inputs["burn_rate"] is None:
+        raise HTTPException(status_code=400, detail="revenue_projections and burn_rate are required (directly or via run_id)")
+    
+    started = time.perf_counter()
+    result = simulate(
+        inputs["revenue_projections"],
+        inputs["burn_rate"],
+        inputs["gross_margin"],
+        inputs["funding_needed"],
+        revenue_multiplier=scenario.revenue_multiplier,
+        burn_multiplier=scenario.burn_multiplier,
+        scenarios=scenario.scenarios
+    )
+    metrics.observe("financial_simulation_seconds", time.perf_counter() - started)
+    return encoded_response(request, {"inputs": inputs, **result})
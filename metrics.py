@@ -0,0 +1,90 @@
+# metrics.py - In-process counters and latency summaries for Validex
+
+import math
+import threading
+from collections import defaultdict, deque
+
+
+def _key(name, labels):
+    """Build a flat metric key like 'llm_calls{node=advisor}'."""
+    if not labels:
+        return name
+    label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+    return f"{name}{{{label_str}}}"
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class MetricsRegistry:
+    """
+    Thread-safe registry of counters and windowed observations.
+    """
+
+    def __init__(self, window=500):
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters = defaultdict(float)
+        self._observations = defaultdict(lambda: deque(maxlen=self.window))
+        self._totals = defaultdict(lambda: [0, 0.0])  # count, sum over all time
+
+    def incr(self, name, value=1, **labels):
+        """Increment a counter."""
+        with self._lock:
+            self._counters[_key(name, labels)] += value
+
+    def observe(self, name, value, **labels):
+        """Record one observation (latency, size, ...)."""
+        key = _key(name, labels)
+        with self._lock:
+            self._observations[key].append(value)
+            totals = self._totals[key]
+            totals[0] += 1
+            totals[1] += value
+
+    def counter(self, name, **labels):
+        """Read a counter value."""
+        with self._lock:
+            return self._counters.get(_key(name, labels), 0)
+
+    def recent(self, name, **labels):
+        """Return the recent observation window as a list."""
+        with self._lock:
+            return list(self._observations.get(_key(name, labels), ()))
+
+    def snapshot(self):
+        """Return every counter and a summary of every observation window."""
+        with self._lock:
+            counters = dict(self._counters)
+            windows = {key: list(values) for key, values in self._observations.items()}
+            totals = {key: tuple(values) for key, values in self._totals.items()}
+
+        summaries = {}
+        for key, values in windows.items():
+            count, total = totals[key]
+            summaries[key] = {
+                "count": count,
+                "avg": round(total / count, 4) if count else None,
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values) if values else None
+            }
+        return {"counters": counters, "summaries": summaries}
+
+    def reset(self):
+        """Clear all metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._observations.clear()
+            self._totals.clear()
+
+
+# Process-wide registry
+metrics = MetricsRegistry()
@@ -1,32 +1,135 @@
 # models/chat_model.py - Original Working Version
+#
+# The HuggingFace clients (one per model tier) are created on first use (or during
+# backend warm-up), so importing this module stays cheap and needs no API token.
 
-from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
-from tools.web_search_tool import web_search
 import os
+import threading
 from dotenv import load_dotenv
-from config import REPO_ID, TEMPERATURE, MAX_NEW_TOKENS
+from langchain_core.runnables import RunnableLambda
+from config import MODEL_TIERS, DEFAULT_MODEL_TIER, TEMPERATURE, MAX_NEW_TOKENS, NODE_GENERATION, BACKEND_MODE
+from models.hedging import hedged
+from models.routing import router, node_tiers, tracked_parser, response_tier, FAST, LARGE
+from metrics import metrics
+from cassette import recorded
 
 load_dotenv()
 
-tools_list = [web_search]
+_chat_models = {}
+_llms_with_tools = {}
+_model_lock = threading.Lock()
 
-# Get HuggingFace API token
-api_key = os.getenv("HUGGINGFACEHUB_API_TOKEN")
-if not api_key:
-    raise ValueError("HUGGINGFACEHUB_API_TOKEN environment variable is not set.")
 
-print(f"✅ HuggingFace API Token loaded: {api_key[:10]}...")
+def get_chat_model(tier=DEFAULT_MODEL_TIER):
+    """
+    Shared ChatHuggingFace instance for a model tier, authenticated on first call.
+    """
+    if tier not in _chat_models:
+        with _model_lock:
+            if tier not in _chat_models:
+                from langchain_huggingface import ChatHuggingFace, HuggingFaceEndpoint
 
-# Use original configuration
-chat_model = ChatHuggingFace(
-    llm=HuggingFaceEndpoint(
-        repo_id=REPO_ID,
-        max_new_tokens=MAX_NEW_TOKENS,
-        temperature=TEMPERATURE,
-        huggingfacehub_api_token=api_key
-    )
-)
+                # Get HuggingFace API token
+                api_key = os.getenv("HUGGINGFACEHUB_API_TOKEN")
+                if not api_key:
+                    raise ValueError("HUGGINGFACEHUB_API_TOKEN environment variable is not set.")
 
-llm_with_tools = chat_model.bind_tools(tools_list)
+                print(f"✅ HuggingFace API Token loaded: {api_key[:10]}...")
 
-print("✅ Chat model initialized successfully")
+                repo_id = MODEL_TIERS[tier]["repo_id"]
+                _chat_models[tier] = ChatHuggingFace(
+                    llm=HuggingFaceEndpoint(
+                        repo_id=repo_id,
+                        max_new_tokens=MAX_NEW_TOKENS,
+                        temperature=TEMPERATURE,
+                        huggingfacehub_api_token=api_key
+                    )
+                )
+                print(f"✅ Chat model initialized successfully ({tier}: {repo_id})")
+    return _chat_models[tier]
+
+
+def get_llm_with_tools(tier=DEFAULT_MODEL_TIER):
+    """
+    Chat model of a tier with the web_search tool bound.
+    """
+    if tier not in _llms_with_tools:
+        from tools.web_search_tool import web_search
+
+        chat_model = get_chat_model(tier)
+        with _model_lock:
+            if tier not in _llms_with_tools:
+                _llms_with_tools[tier] = chat_model.bind_tools([web_search])
+    return _llms_with_tools[tier]
+
+
+def generation_kwargs(node_name):
+    """
+    Per-node generation settings as model call kwargs.
+    """
+    settings = NODE_GENERATION.get(node_name, {})
+    kwargs = {
+        "max_tokens": settings.get("max_new_tokens", MAX_NEW_TOKENS),
+        "temperature": settings.get("temperature", TEMPERATURE)
+    }
+    if settings.get("stop"):
+        kwargs["stop"] = settings["stop"]
+    return kwargs
+
+
+def tier_model(node_name, tier, with_tools=False, structured=False):
+    """
+    Hedged model runnable for a node on one tier.
+    With VALIDX_BACKEND=stub the model is replaced by a canned stub (see stub_backend.py).
+    """
+    if BACKEND_MODE == "stub":
+        from stub_backend import stub_model
+        return hedged(stub_model(node_name, with_tools), node_name, structured=structured, tier=tier)
+    base = get_llm_with_tools(tier) if with_tools else get_chat_model(tier)
+    return hedged(base.bind(**generation_kwargs(node_name)), node_name, structured=structured, tier=tier)
+
+
+def model_for(node_name, with_tools=False, structured=False):
+    """
+    Model runnable for a graph node, with that node's model tier, generation
+    settings, latency budget, hedged requests and jittered retries (see models/hedging.py).
+    Nodes configured with the "auto" tier pick fast or large per call (see models/routing.py).
+    Use structured=True for nodes whose output is a single JSON object.
+    Calls are captured or replayed when a cassette is active (see cassette.py).
+    """
+    tiers = node_tiers(node_name)
+    if len(tiers) == 1:
+        return recorded(tier_model(node_name, tiers[0], with_tools, structured), node_name)
+
+    models = {tier: tier_model(node_name, tier, with_tools, structured) for tier in tiers}
+
+    def invoke(prompt_value):
+        return models[router.choose_tier(node_name)].invoke(prompt_value)
+
+    return recorded(RunnableLambda(invoke, name=f"{node_name}_routed"), node_name)
+
+
+def structured_model_for(node_name, parser, with_tools=False):
+    """
+    model_for(..., structured=True) | tracked_parser(parser, node_name), except
+    that a fast-tier response that fails to parse is retried once on the large
+    tier before the error reaches the node's fallback.
+    """
+    model = model_for(node_name, with_tools, structured=True)
+    parse = tracked_parser(parser, node_name)
+    if FAST not in node_tiers(node_name):
+        return model | parse
+
+    large = recorded(tier_model(node_name, LARGE, with_tools, structured=True), node_name)
+
+    def invoke(prompt_value):
+        message = model.invoke(prompt_value)
+        try:
+            return parse.invoke(message)
+        except Exception:
+            if response_tier(message) != FAST:
+                raise
+            metrics.incr("llm_parse_escalations", node=node_name)
+            return parse.invoke(large.invoke(prompt_value))
+
+    return RunnableLambda(invoke, name=f"{node_name}_structured")
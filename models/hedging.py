@@ -0,0 +1,205 @@
+# models/hedging.py - Per-node latency budgets, hedged requests and jittered retries
+
+import contextvars
+import random
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from langchain_core.runnables import RunnableLambda
+
+from metrics import metrics, percentile
+from models.structured_output import stream_json_object
+from models.routing import record_tier_usage
+from deadline import call_budget, budget_spent
+from state.run_context import track_cpu, record_run_tokens
+from config import (
+    NODE_TIMEOUTS,
+    DEFAULT_NODE_TIMEOUT,
+    HEDGE_ENABLED,
+    HEDGE_MIN_SAMPLES,
+    HEDGE_MIN_DELAY,
+    HEDGE_POOL_SIZE,
+    HEDGE_MAX_INFLIGHT_PER_CALL,
+    LATENCY_WINDOW,
+    LLM_MAX_RETRIES,
+    RETRY_BACKOFF_BASE,
+    RETRY_BACKOFF_MAX,
+    CHARS_PER_TOKEN
+)
+
+# Shared pool for primary and hedged model calls
+_executor = ThreadPoolExecutor(max_workers=HEDGE_POOL_SIZE, thread_name_prefix="llm-call")
+
+# Recent successful call latencies per node
+_latencies = defaultdict(lambda: deque(maxlen=LATENCY_WINDOW))
+_latencies_lock = threading.Lock()
+
+
+def record_latency(node, seconds):
+    """Add a successful call latency to the node's window."""
+    with _latencies_lock:
+        _latencies[node].append(seconds)
+    metrics.observe("llm_latency_seconds", seconds, node=node)
+
+
+def node_p95(node):
+    """
+    Observed p95 latency for a node.
+    Returns None until HEDGE_MIN_SAMPLES calls have completed.
+    """
+    with _latencies_lock:
+        samples = list(_latencies[node])
+    if len(samples) < HEDGE_MIN_SAMPLES:
+        return None
+    return percentile(samples, 95)
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff for the given retry attempt (0-based)."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * (2 ** attempt)))
+
+
+def record_token_usage(node, prompt_value, message):
+    """
+    Count input/output tokens of a model call. Uses the provider's usage
+    metadata when present, otherwise a character-based estimate.
+    """
+    usage = getattr(message, "usage_metadata", None)
+    if usage:
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+    else:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        input_tokens = len(prompt_value.to_string()) // CHARS_PER_TOKEN
+        output_tokens = len(content) // CHARS_PER_TOKEN
+    metrics.incr("llm_input_tokens", input_tokens, node=node)
+    metrics.incr("llm_output_tokens", output_tokens, node=node)
+    record_run_tokens(input_tokens, output_tokens)
+    return input_tokens, output_tokens
+
+
+def _submit(fn, *args):
+    """Submit to the shared pool, carrying the caller's context variables."""
+    ctx = contextvars.copy_context()
+    return _executor.submit(ctx.run, fn, *args)
+
+
+def _first_result(futures, timeout):
+    """
+    Wait for the first future to finish successfully.
+    Returns (future, result). Raises the last error if all fail, TimeoutError on expiry.
+    """
+    deadline = time.monotonic() + timeout
+    pending = set(futures)
+    last_error = None
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future, future.result()
+            last_error = future.exception()
+    if last_error is not None and not pending:
+        raise last_error
+    raise TimeoutError(f"model call exceeded {timeout:.1f}s")
+
+
+def call_with_hedging(node, fn, *args, timeout=None):
+    """
+    Run fn(*args) under the node's latency budget, capped per attempt by
+    what is left of the request deadline (see deadline.py).
+
+    If the call is still running after the node's observed p95, a duplicate is
+    fired and whichever returns first wins. Failed or timed-out attempts are
+    retried with jittered backoff. Losers are cancelled if they have not started;
+    started ones cannot be stopped, so they stay in the race of later attempts
+    and count toward HEDGE_MAX_INFLIGHT_PER_CALL: a call never holds more pool
+    threads than that (no hedge, and a retry waits on the abandoned attempts
+    instead of submitting a new one, while the cap is reached).
+    """
+    node_timeout = timeout or NODE_TIMEOUTS.get(node, DEFAULT_NODE_TIMEOUT)
+    abandoned = []   # earlier attempts of this call still running on the pool
+
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        timeout = call_budget(node, node_timeout)
+        abandoned = [future for future in abandoned if not future.done()]
+        started = time.monotonic()
+        futures = []
+        hedge_started = None
+
+        try:
+            if len(abandoned) < HEDGE_MAX_INFLIGHT_PER_CALL:
+                metrics.incr("llm_calls", node=node)
+                futures.append(_submit(fn, *args))
+            else:
+                metrics.incr("llm_retries_waited", node=node)
+
+            hedge_delay = node_p95(node) if HEDGE_ENABLED and futures else None
+            if hedge_delay is not None:
+                hedge_delay = max(hedge_delay, HEDGE_MIN_DELAY)
+
+            if hedge_delay is not None and hedge_delay < timeout:
+                done, _ = wait(futures + abandoned, timeout=hedge_delay)
+                if not done:
+                    if len(abandoned) + len(futures) < HEDGE_MAX_INFLIGHT_PER_CALL:
+                        metrics.incr("llm_hedges_fired", node=node)
+                        hedge_started = time.monotonic()
+                        futures.append(_submit(fn, *args))
+                    else:
+                        metrics.incr("llm_hedges_suppressed", node=node)
+
+            winner, result = _first_result(futures + abandoned, timeout - (time.monotonic() - started))
+
+            if futures and winner is futures[0]:
+                record_latency(node, time.monotonic() - started)
+            elif winner in futures:
+                metrics.incr("llm_hedge_wins", node=node)
+                record_latency(node, time.monotonic() - hedge_started)
+            else:
+                metrics.incr("llm_late_wins", node=node)
+            return result
+
+        except Exception as e:
+            if isinstance(e, TimeoutError):
+                metrics.incr("llm_timeouts", node=node)
+            else:
+                metrics.incr("llm_errors", node=node)
+            if attempt >= LLM_MAX_RETRIES or budget_spent():
+                raise
+            metrics.incr("llm_retries", node=node)
+            time.sleep(backoff_delay(attempt))
+
+        finally:
+            for future in futures:
+                future.cancel()
+            abandoned.extend(future for future in futures if not future.done())
+
+
+def hedged(runnable, node, structured=False, tier=None):
+    """
+    Wrap a model runnable so every invoke goes through call_with_hedging.
+    With structured=True the response is streamed and cut off as soon as its
+    JSON object closes. With a tier, the call is added to that tier's metrics
+    and the response is tagged with it (response_metadata["model_tier"]).
+    The result composes in chains like the bare model: prompt | hedged(...) | parser
+    """
+    def call_model(prompt_value):
+        with track_cpu():
+            if structured:
+                return stream_json_object(runnable, prompt_value, node=node)
+            return runnable.invoke(prompt_value)
+
+    def invoke(prompt_value):
+        started = time.monotonic()
+        response = call_with_hedging(node, call_model, prompt_value)
+        input_tokens, output_tokens = record_token_usage(node, prompt_value, response)
+        if tier is not None:
+            record_tier_usage(tier, time.monotonic() - started, input_tokens, output_tokens)
+            response.response_metadata["model_tier"] = tier
+        return response
+
+    return RunnableLambda(invoke, name=f"{node}_model")
@@ -0,0 +1,131 @@
+# models/routing.py - Per-node model tiers, the automatic tier policy and per-tier metrics
+
+import random
+import threading
+from collections import defaultdict, deque
+
+from langchain_core.runnables import RunnableLambda
+
+from metrics import metrics
+from config import (
+    MODEL_TIERS,
+    DEFAULT_MODEL_TIER,
+    NODE_MODEL_TIERS,
+    MODEL_ROUTING_AUTO_ENABLED,
+    AUTO_ROUTING_WINDOW,
+    AUTO_ROUTING_MIN_SAMPLES,
+    AUTO_ROUTING_MIN_PARSE_SUCCESS,
+    AUTO_ROUTING_EXPLORE_RATE
+)
+
+AUTO = "auto"
+FAST = "fast"
+LARGE = "large"
+
+
+def node_tier(node):
+    """Configured tier of a node: a tier name or "auto"."""
+    return NODE_MODEL_TIERS.get(node, DEFAULT_MODEL_TIER)
+
+
+def node_tiers(node):
+    """Tiers a node can be routed to."""
+    tier = node_tier(node)
+    return [FAST, LARGE] if tier == AUTO else [tier]
+
+
+class ModelRouter:
+    """
+    Chooses the tier for each call of an "auto" node.
+
+    Parse outcomes are recorded per node and tier. An auto node goes to the
+    fast tier while its recent fast-tier parse-success rate is at least the
+    threshold; otherwise it uses the large tier, except for a small share of
+    calls sent to the fast tier so the rate keeps being measured (and can
+    recover after a bad stretch).
+    """
+
+    def __init__(self, window=AUTO_ROUTING_WINDOW, min_samples=AUTO_ROUTING_MIN_SAMPLES,
+                 threshold=AUTO_ROUTING_MIN_PARSE_SUCCESS, explore_rate=AUTO_ROUTING_EXPLORE_RATE):
+        self.min_samples = min_samples
+        self.threshold = threshold
+        self.explore_rate = explore_rate
+        self._outcomes = defaultdict(lambda: deque(maxlen=window))  # (node, tier) -> ok flags
+        self._lock = threading.Lock()
+
+    def record_parse(self, node, tier, ok):
+        """Record whether a response from a tier parsed into the node's schema."""
+        if tier is None:
+            return
+        with self._lock:
+            self._outcomes[(node, tier)].append(ok)
+        metrics.incr("llm_parse_success" if ok else "llm_parse_failures", node=node, tier=tier)
+
+    def parse_success_rate(self, node, tier):
+        """Recent parse-success rate, or None until min_samples outcomes are known."""
+        with self._lock:
+            outcomes = list(self._outcomes[(node, tier)])
+        if len(outcomes) < self.min_samples:
+            return None
+        return outcomes.count(True) / len(outcomes)
+
+    def choose_tier(self, node):
+        tier = node_tier(node)
+        if tier == AUTO:
+            if not MODEL_ROUTING_AUTO_ENABLED:
+                tier = LARGE
+            else:
+                rate = self.parse_success_rate(node, FAST)
+                if rate is not None and rate >= self.threshold:
+                    tier = FAST
+                else:
+                    tier = FAST if random.random() < self.explore_rate else LARGE
+        metrics.incr("llm_routed", node=node, tier=tier)
+        return tier
+
+    def stats(self):
+        stats = {}
+        for node in NODE_MODEL_TIERS:
+            rates = {tier: self.parse_success_rate(node, tier) for tier in node_tiers(node)}
+            stats[node] = {
+                "configured": node_tier(node),
+                "parse_success": {tier: round(rate, 3) if rate is not None else None for tier, rate in rates.items()}
+            }
+        return stats
+
+
+# Process-wide router used by models/chat_model.model_for
+router = ModelRouter()
+
+
+def record_tier_usage(tier, seconds, input_tokens, output_tokens):
+    """Latency, token and cost metrics of one model call on a tier."""
+    prices = MODEL_TIERS.get(tier, {})
+    cost = (input_tokens * prices.get("cost_per_million_input", 0)
+            + output_tokens * prices.get("cost_per_million_output", 0)) / 1_000_000
+    metrics.observe("llm_tier_latency_seconds", seconds, tier=tier)
+    metrics.incr("llm_tier_calls", tier=tier)
+    metrics.incr("llm_tier_tokens", input_tokens + output_tokens, tier=tier)
+    metrics.incr("llm_tier_cost_usd", cost, tier=tier)
+
+
+def response_tier(message):
+    """Tier that produced a model response (tagged by models/hedging.hedged)."""
+    return (getattr(message, "response_metadata", None) or {}).get("model_tier")
+
+
+def tracked_parser(parser, node):
+    """
+    Wrap an output parser so each parse outcome is credited to the tier that
+    produced the response. Composes like the parser: prompt | model | tracked_parser(...)
+    """
+    def parse(message):
+        try:
+            result = parser.invoke(message)
+        except Exception:
+            router.record_parse(node, response_tier(message), False)
+            raise
+        router.record_parse(node, response_tier(message), True)
+        return result
+
+    return RunnableLambda(parse, name=f"{node}_parser")
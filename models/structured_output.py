@@ -0,0 +1,75 @@
+# models/structured_output.py - Stream structured (JSON) outputs and stop once the object closes
+
+from langchain_core.messages import AIMessage
+
+from metrics import metrics
+
+
+class JsonObjectTracker:
+    """
+    Incrementally tracks brace depth of the first top-level JSON object in a
+    text stream, ignoring braces inside strings.
+    """
+
+    def __init__(self):
+        self.depth = 0
+        self.started = False
+        self.closed = False
+        self.end_index = None   # index just past the closing brace
+        self._in_string = False
+        self._escaped = False
+        self._consumed = 0
+
+    def feed(self, text):
+        """Consume more text. Returns True once the top-level object has closed."""
+        for offset, char in enumerate(text):
+            if self.closed:
+                break
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"' and self.started:
+                self._in_string = True
+            elif char in "{[":
+                if char == "{" or self.started:
+                    self.started = True
+                    self.depth += 1
+            elif char in "}]" and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    self.closed = True
+                    self.end_index = self._consumed + offset + 1
+        self._consumed += len(text)
+        return self.closed
+
+
+def stream_json_object(runnable, prompt_value, node=None):
+    """
+    Stream a model response and stop generating as soon as the first JSON
+    object closes. Closing the stream ends the request to the provider.
+    Returns an AIMessage with the text up to and including the closing brace.
+    """
+    tracker = JsonObjectTracker()
+    parts = []
+    stream = runnable.stream(prompt_value)
+    try:
+        for chunk in stream:
+            content = chunk.content if isinstance(chunk.content, str) else ""
+            parts.append(content)
+            if tracker.feed(content):
+                break
+    finally:
+        stream.close()
+
+    text = "".join(parts)
+    if tracker.closed:
+        text = text[:tracker.end_index]
+        if node:
+            metrics.incr("llm_early_stops", node=node)
+    if node:
+        metrics.observe("llm_output_chars", len(text), node=node)
+    return AIMessage(content=text)
@@ -1,11 +1,12 @@
+from functools import lru_cache
 from langchain_core.output_parsers import PydanticOutputParser
 from langchain_core.prompts import PromptTemplate
 from pydantic import BaseModel,Field
 from typing import Literal,Annotated
 from state.agent_state import AgentState
-from models.chat_model import chat_model
+from models.chat_model import structured_model_for
+from nodes.prompt_loader import load_prompt
 from config import ADVISOR_PROMPT_PATH
-import os
 
 class AdvisorSchema(BaseModel):
     """
@@ -15,21 +16,26 @@ class AdvisorSchema(BaseModel):
     advice: Annotated[str,Field(description="Advice or suggestions or reasons provided by the advisor based on the analysis. This should include why the decision is 'Go' or 'Conditional Go', or reasons for 'No-Go'.")]
     
 parser=PydanticOutputParser(pydantic_object=AdvisorSchema)
+
+@lru_cache(maxsize=None)
+def build_chain():
+    """
+    Prompt | model | parser runnable for the advisor, built once.
+    """
+    prompt_template = PromptTemplate(
+        input_variables=["startup_idea","market_analysis", "competition_analysis", "risk_assessment"],
+        template=load_prompt(ADVISOR_PROMPT_PATH),
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    return prompt_template | structured_model_for("advisor", parser)
+
 def advisor(state:AgentState)-> AgentState:
     """
     Analyzes market,competition ,risk and provides the advice.
     """
-    if not os.path.exists(ADVISOR_PROMPT_PATH):
-        raise ValueError(f"Prompt file not found at {ADVISOR_PROMPT_PATH}. Please check the path and try again.")
+    chain=build_chain()
     
     try: 
-        template=open(ADVISOR_PROMPT_PATH).read()
-        prompt_template = PromptTemplate(
-            input_variables=["startup_idea","market_analysis", "competition_analysis", "risk_assessment"],
-            template=template,
-            partial_variables={"format_instructions": parser.get_format_instructions()}
-        )
-        chain=prompt_template | chat_model | parser
         response=chain.invoke({"startup_idea":state["startup_idea"],"market_analysis":state["market_analysis"], "competition_analysis":state["competition_analysis"], "risk_assessment":state["risk_assessment"]})
         return {"advisor_recommendations": response.advisor_recommendations,"advice": response.advice}
         
@@ -1,11 +1,12 @@
+from functools import lru_cache
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from langchain.schema import HumanMessage
 from pydantic import BaseModel, Field
 from typing import Literal, List
 from state.agent_state import AgentState
-from models.chat_model import llm_with_tools, chat_model
-import os
+from models.chat_model import structured_model_for
+from nodes.prompt_loader import load_prompt
+from analytics.competitive_metrics import competitive_metrics
 from config import COMPETITOR_INTELLIGENCE_PROMPT_PATH
 
 
@@ -19,40 +20,41 @@ class CompetitorData(BaseModel):
 
 
 class CompetitorIntelligenceSchema(BaseModel):
-    """Schema for competitor intelligence analysis"""
+    """
+    Schema for competitor intelligence analysis.
+    Only raw metrics are asked for; concentration and positioning are computed
+    from them (see analytics/competitive_metrics.py).
+    """
     competitors: List[CompetitorData] = Field(description="List of competitors with their metrics")
-    competitive_position: str = Field(description="Startup's position: Strong/Moderate/Weak")
-    market_concentration: str = Field(description="Market type: Fragmented/Moderate/Concentrated")
     competitive_advantage: str = Field(description="Key differentiators vs competitors")
 
 
 parser = PydanticOutputParser(pydantic_object=CompetitorIntelligenceSchema)
 
 
+@lru_cache(maxsize=None)
+def build_chain(preferred_mode: Literal["chat_model", "tools"] = "chat_model"):
+    """
+    Prompt | model | parser runnable for competitor intelligence, built once per mode.
+    """
+    # Create prompt template for competitor intelligence
+    prompt_template = PromptTemplate(
+        input_variables=["startup_idea", "market_analysis", "competition_analysis"],
+        template=load_prompt(COMPETITOR_INTELLIGENCE_PROMPT_PATH),
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    
+    if preferred_mode == "chat_model":
+        return prompt_template | structured_model_for("competitor_intelligence", parser)
+    return prompt_template | structured_model_for("competitor_intelligence", parser, with_tools=True)
+
+
 def analyze_competitor_intelligence(preferred_mode: Literal["chat_model", "tools"] = "chat_model"):
     def intelligence_analysis(state: AgentState) -> AgentState:
         """
         Analyzes competitive landscape and extracts competitor metrics from startup idea.
         """
-        if not os.path.exists(COMPETITOR_INTELLIGENCE_PROMPT_PATH):
-            raise FileNotFoundError(f"Prompt file not found at {COMPETITOR_INTELLIGENCE_PROMPT_PATH}. Please check the path and try again.")
-        
-        try:
-            template = open(COMPETITOR_INTELLIGENCE_PROMPT_PATH).read()
-        except FileNotFoundError:
-            raise ValueError(f"Prompt file not found at {COMPETITOR_INTELLIGENCE_PROMPT_PATH}. Please check the path and try again.")
-        
-        # Create prompt template for competitor intelligence
-        prompt_template = PromptTemplate(
-            input_variables=["startup_idea", "market_analysis", "competition_analysis"],
-            template=template,
-            partial_variables={"format_instructions": parser.get_format_instructions()}
-        )
-        
-        if preferred_mode == "chat_model":
-            chain = prompt_template | chat_model | parser
-        else:
-            chain = prompt_template | llm_with_tools | parser
+        chain = build_chain(preferred_mode)
         
         try:
             response = chain.invoke({
@@ -61,10 +63,13 @@ def analyze_competitor_intelligence(preferred_mode: Literal["chat_model", "tools
                 "competition_analysis": state["competition_analysis"]
             })
             
-            # Convert Pydantic model to dict for state
+            # Convert Pydantic model to dict for state (dumped once, shared),
+            # with shares, HHI, percentiles and positioning derived from the raw metrics
+            data = response.model_dump()
+            data = {**competitive_metrics(data["competitors"]), "competitive_advantage": data["competitive_advantage"]}
             return {
-                "competitor_intelligence": response.dict(),
-                "messages": [response.dict()]
+                "competitor_intelligence": data,
+                "messages": [data]
             }
         except Exception as e:
             # Fallback: return empty structure if parsing fails
@@ -1,23 +1,21 @@
+from functools import lru_cache
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from langchain.schema import HumanMessage
 from pydantic import BaseModel, Field
 from typing import Literal, List
 from state.agent_state import AgentState
-from models.chat_model import llm_with_tools, chat_model
-import os
+from models.chat_model import structured_model_for
+from analytics.financial_simulator import simulate_viability
+from nodes.prompt_loader import load_prompt
 from config import FINANCIAL_VIABILITY_PROMPT_PATH
 
 
 class FinancialViabilitySchema(BaseModel):
-    """Schema for financial viability analysis"""
+    """Schema for financial viability analysis (runway, breakeven and score are simulated)"""
     revenue_projections: List[float] = Field(description="Revenue projections for Year 1, 2, 3 in thousands")
     burn_rate: float = Field(description="Monthly burn rate in thousands")
     funding_needed: float = Field(description="Total funding needed in thousands")
-    breakeven_month: int = Field(description="Expected breakeven month (1-60)")
     gross_margin: float = Field(description="Gross margin percentage (0-100)")
-    cash_runway: int = Field(description="Cash runway in months")
-    viability_score: float = Field(description="Financial viability score (0-100)")
     cost_structure: str = Field(description="Analysis of fixed vs variable costs")
     revenue_model: str = Field(description="Revenue generation model description")
 
@@ -25,30 +23,48 @@ class FinancialViabilitySchema(BaseModel):
 parser = PydanticOutputParser(pydantic_object=FinancialViabilitySchema)
 
 
+def with_simulation(data):
+    """
+    Add the simulated cash_runway, breakeven_month (None if most scenarios never
+    break even) and viability_score, plus the simulation summary without chart series.
+    All three are None when the inputs cannot be simulated (no burn rate).
+    """
+    simulation = simulate_viability(data)
+    simulation.pop("series")
+    runway = simulation["runway_months"]["p50"]
+    breakeven = simulation["breakeven_month"]["p50"]
+    return {
+        **data,
+        "cash_runway": round(runway) if runway is not None else None,
+        "breakeven_month": round(breakeven) if breakeven is not None and simulation["probability_breakeven"] >= 0.5 else None,
+        "viability_score": simulation["viability_score"],
+        "simulation": simulation
+    }
+
+
+@lru_cache(maxsize=None)
+def build_chain(preferred_mode: Literal["chat_model", "tools"] = "chat_model"):
+    """
+    Prompt | model | parser runnable for financial viability, built once per mode.
+    """
+    # Create prompt template for financial viability
+    prompt_template = PromptTemplate(
+        input_variables=["startup_idea", "market_analysis", "competition_analysis", "risk_assessment"],
+        template=load_prompt(FINANCIAL_VIABILITY_PROMPT_PATH),
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    
+    if preferred_mode == "chat_model":
+        return prompt_template | structured_model_for("financial_viability", parser)
+    return prompt_template | structured_model_for("financial_viability", parser, with_tools=True)
+
+
 def analyze_financial_viability(preferred_mode: Literal["chat_model", "tools"] = "chat_model"):
     def viability_analysis(state: AgentState) -> AgentState:
         """
         Extracts and analyzes financial projections from startup idea.
         """
-        if not os.path.exists(FINANCIAL_VIABILITY_PROMPT_PATH):
-            raise FileNotFoundError(f"Prompt file not found at {FINANCIAL_VIABILITY_PROMPT_PATH}. Please check the path and try again.")
-        
-        try:
-            template = open(FINANCIAL_VIABILITY_PROMPT_PATH).read()
-        except FileNotFoundError:
-            raise ValueError(f"Prompt file not found at {FINANCIAL_VIABILITY_PROMPT_PATH}. Please check the path and try again.")
-        
-        # Create prompt template for financial viability
-        prompt_template = PromptTemplate(
-            input_variables=["startup_idea", "market_analysis", "competition_analysis", "risk_assessment"],
-            template=template,
-            partial_variables={"format_instructions": parser.get_format_instructions()}
-        )
-        
-        if preferred_mode == "chat_model":
-            chain = prompt_template | chat_model | parser
-        else:
-            chain = prompt_template | llm_with_tools | parser
+        chain = build_chain(preferred_mode)
         
         try:
             response = chain.invoke({
@@ -58,22 +74,23 @@ def analyze_financial_viability(preferred_mode: Literal["chat_model", "tools"] =
                 "risk_assessment": state["risk_assessment"]
             })
             
-            # Convert Pydantic model to dict for state
+            # Convert Pydantic model to dict for state (dumped once, shared)
+            data = with_simulation(response.model_dump())
             return {
-                "financial_viability": response.dict(),
-                "messages": [response.dict()]
+                "financial_viability": data,
+                "messages": [data]
             }
         except Exception as e:
-            # Fallback: return default structure if parsing fails
+            # Fallback: return default structure if parsing fails (nothing to simulate)
             return {
                 "financial_viability": {
                     "revenue_projections": [0, 0, 0],
                     "burn_rate": 0,
                     "funding_needed": 0,
-                    "breakeven_month": 24,
                     "gross_margin": 50,
-                    "cash_runway": 12,
-                    "viability_score": 50,
+                    "cash_runway": None,
+                    "breakeven_month": None,
+                    "viability_score": None,
                     "cost_structure": "Unable to analyze cost structure",
                     "revenue_model": "Unable to analyze revenue model"
                 },
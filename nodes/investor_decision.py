@@ -1,10 +1,11 @@
+from functools import lru_cache
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from typing import Literal, Annotated
 from state.agent_state import AgentState
-from models.chat_model import chat_model
-import os
+from models.chat_model import structured_model_for
+from nodes.prompt_loader import load_prompt
 from config import INVESTOR_DECISION_PROMPT_PATH
 
 
@@ -22,35 +23,37 @@ class InvestorDecisionSchema(BaseModel):
 parser = PydanticOutputParser(pydantic_object=InvestorDecisionSchema)
 
 
+@lru_cache(maxsize=None)
+def build_chain():
+    """
+    Prompt | model | parser runnable for the investor decision, built once.
+    """
+    # Create prompt template for investor decision
+    prompt_template = PromptTemplate(
+        input_variables=[
+            "startup_idea",
+            "market_analysis",
+            "competition_analysis",
+            "risk_assessment",
+            "competitor_intelligence",
+            "financial_viability",
+            "advisor_recommendations",
+            "advice"
+        ],
+        template=load_prompt(INVESTOR_DECISION_PROMPT_PATH),
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    return prompt_template | structured_model_for("investor_decision", parser)
+
+
 def make_investor_decision(state: AgentState) -> AgentState:
     """
     Makes final investment decision based on all analysis.
     Synthesizes market, competition, risk, competitor intelligence, and financial data.
     """
-    if not os.path.exists(INVESTOR_DECISION_PROMPT_PATH):
-        raise ValueError(f"Prompt file not found at {INVESTOR_DECISION_PROMPT_PATH}. Please check the path and try again.")
+    chain = build_chain()
     
     try:
-        template = open(INVESTOR_DECISION_PROMPT_PATH).read()
-        
-        # Create prompt template for investor decision
-        prompt_template = PromptTemplate(
-            input_variables=[
-                "startup_idea",
-                "market_analysis",
-                "competition_analysis",
-                "risk_assessment",
-                "competitor_intelligence",
-                "financial_viability",
-                "advisor_recommendations",
-                "advice"
-            ],
-            template=template,
-            partial_variables={"format_instructions": parser.get_format_instructions()}
-        )
-        
-        chain = prompt_template | chat_model | parser
-        
         response = chain.invoke({
             "startup_idea": state["startup_idea"],
             "market_analysis": state["market_analysis"],
@@ -0,0 +1,15 @@
+# nodes/prompt_loader.py - Prompt files are read from disk once per process
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def load_prompt(path):
+    """
+    Contents of a prompt file. Read on first use (or during warm-up), then served from memory.
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+    except FileNotFoundError:
+        raise ValueError(f"Prompt file not found at {path}. Please check the path and try again.")
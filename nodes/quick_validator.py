@@ -0,0 +1,73 @@
+from functools import lru_cache
+from langchain_core.prompts import PromptTemplate
+from langchain_core.output_parsers import PydanticOutputParser
+from pydantic import Field
+from state.agent_state import AgentState
+from models.chat_model import structured_model_for
+from nodes.advisor import AdvisorSchema
+from nodes.investor_decision import InvestorDecisionSchema
+from nodes.prompt_loader import load_prompt
+from config import QUICK_VALIDATION_PROMPT_PATH
+
+
+class QuickValidationSchema(AdvisorSchema, InvestorDecisionSchema):
+    """Schema for the single-call quick validation: advisor + investor decision + section summaries"""
+    market_summary: str = Field(description="2-3 sentence summary of the market opportunity")
+    competition_summary: str = Field(description="2-3 sentence summary of the competitive landscape")
+    risk_summary: str = Field(description="2-3 sentence summary of the key risks")
+
+
+parser = PydanticOutputParser(pydantic_object=QuickValidationSchema)
+
+
+@lru_cache(maxsize=None)
+def build_chain():
+    """
+    Prompt | model | parser runnable for quick validation, built once.
+    """
+    prompt_template = PromptTemplate(
+        input_variables=["startup_idea"],
+        template=load_prompt(QUICK_VALIDATION_PROMPT_PATH),
+        partial_variables={"format_instructions": parser.get_format_instructions()}
+    )
+    return prompt_template | structured_model_for("quick_validator", parser)
+
+
+def quick_validate(state: AgentState) -> AgentState:
+    """
+    Rough Go/No-Go in one structured model call.
+    Fills the summary sections, advisor and investor fields; deep sections stay None.
+    If the call fails, the decision falls back to a conservative HOLD (as in
+    investor_decision) and the run is marked partial, so the response lists
+    the summary and advisor sections as missing.
+    """
+    chain = build_chain()
+
+    try:
+        response = chain.invoke({"startup_idea": state["startup_idea"]})
+        return {
+            "market_analysis": response.market_summary,
+            "competition_analysis": response.competition_summary,
+            "risk_assessment": response.risk_summary,
+            "advisor_recommendations": response.advisor_recommendations,
+            "advice": response.advice,
+            "investor_decision": response.decision,
+            "investor_confidence": response.confidence,
+            "investor_reasoning": response.reasoning,
+            "investor_strengths": response.key_strengths,
+            "investor_concerns": response.key_concerns,
+            "suggested_investment": response.suggested_investment,
+            "expected_return": response.expected_return
+        }
+    except Exception as e:
+        print(f"❌ Quick validation failed: {e}")
+        return {
+            "investor_decision": "HOLD",
+            "investor_confidence": 50,
+            "investor_reasoning": f"Unable to complete quick validation: {str(e)}",
+            "investor_strengths": "Insufficient data",
+            "investor_concerns": "Analysis incomplete",
+            "suggested_investment": 0,
+            "expected_return": "Unknown",
+            "partial": True
+        }
@@ -0,0 +1,104 @@
+# response_encoding.py - Field selection, ETags and gzip/brotli negotiation shared by both services
+
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+from serialization import dumps_json
+from config import RESPONSE_COMPRESSION_MIN_BYTES, RESPONSE_GZIP_LEVEL, RESPONSE_BROTLI_QUALITY
+
+
+def select_fields(payload, fields):
+    """
+    Keep only the requested fields of a payload.
+
+    fields is a comma-separated string (e.g. "investor_decision,financial_viability.viability_score");
+    dotted names select a single key of a nested dict. Unknown names are ignored.
+    """
+    if not fields:
+        return payload
+    selected = {}
+    for name in (f.strip() for f in fields.split(",")):
+        if not name:
+            continue
+        head, _, tail = name.partition(".")
+        if head not in payload:
+            continue
+        if not tail:
+            selected[head] = payload[head]
+        elif isinstance(payload[head], dict) and tail in payload[head]:
+            selected.setdefault(head, {})
+            if isinstance(selected[head], dict):
+                selected[head][tail] = payload[head][tail]
+    return selected
+
+
+def encode_json(payload):
+    """Compact UTF-8 JSON bytes for a payload."""
+    return dumps_json(payload)
+
+
+def make_etag(body):
+    """Strong ETag for a response body."""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match, etag):
+    """True if an If-None-Match header value matches the ETag."""
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def negotiate_encoding(accept_encoding):
+    """
+    Pick the best supported content encoding from an Accept-Encoding header.
+    Returns "br", "gzip" or None.
+    """
+    if not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    options = []
+    if brotli is not None and accepted.get("br", 0) > 0:
+        options.append((accepted["br"], 1, "br"))
+    gzip_quality = accepted.get("gzip", accepted.get("*", 0))
+    if gzip_quality > 0:
+        options.append((gzip_quality, 0, "gzip"))
+    if not options:
+        return None
+    return max(options)[2]
+
+
+def compress(body, encoding):
+    """Compress a body with the negotiated encoding (None leaves it as-is)."""
+    if encoding == "br":
+        return brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL)
+    return body
+
+
+def encode_body(body, accept_encoding):
+    """
+    Compress a body for a client when it is large enough to be worth it.
+    Returns (body, content_encoding or None).
+    """
+    if len(body) < RESPONSE_COMPRESSION_MIN_BYTES:
+        return body, None
+    encoding = negotiate_encoding(accept_encoding)
+    return compress(body, encoding), encoding
@@ -0,0 +1,65 @@
+# serialization.py - JSON and binary encoding shared by responses, caches and stored run state
+#
+# orjson and msgpack are optional: without them the same functions fall back to
+# the standard json module, so callers never need to check what is installed.
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; json is always available
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional; blobs fall back to JSON bytes
+    msgpack = None
+
+HAS_ORJSON = orjson is not None
+
+
+def to_builtin(value):
+    """
+    Fallback for values the encoders do not handle natively:
+    Pydantic models are dumped, sets become lists, anything else becomes str.
+    """
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    return str(value)
+
+
+def dumps_json(value, indent=False):
+    """Compact UTF-8 JSON bytes (non-ASCII kept as-is)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(value, default=to_builtin, option=option)
+    return json.dumps(
+        value,
+        default=to_builtin,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":")
+    ).encode("utf-8")
+
+
+def loads_json(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def pack(value):
+    """Compact binary blob for in-memory caches and stored state (msgpack, else JSON)."""
+    if msgpack is not None:
+        return msgpack.packb(value, default=to_builtin, use_bin_type=True)
+    return dumps_json(value)
+
+
+def unpack(blob):
+    """Inverse of pack(); tuples come back as lists."""
+    if msgpack is not None:
+        return msgpack.unpackb(blob, raw=False, strict_map_key=False)
+    return loads_json(blob)
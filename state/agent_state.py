@@ -43,3 +43,53 @@ class AgentState(TypedDict):
     
     # Messages for tool calls
     messages: List
+    tool_section: str              # Section the last tools round was filling
+    tool_rounds: dict              # Tool rounds used per section
+    search_stats: dict             # Bytes/tokens saved by search compaction this run
+    skipped_nodes: list            # Optional nodes skipped to stay within the deadline
+    partial: bool                  # Run stopped at its deadline (or quick_validator failed) before every section was produced
+
+
+def initial_state(startup_idea):
+    """Empty AgentState for a new validation run"""
+    return {
+        "startup_idea": startup_idea,
+        "market_analysis": None,
+        "competition_analysis": None,
+        "risk_assessment": None,
+        "advisor_recommendations": None,
+        "advice": None,
+        # ========== NEW FIELDS ==========
+        "competitor_intelligence": None,
+        "financial_viability": None,
+        "investor_decision": None,
+        "investor_confidence": None,
+        "investor_reasoning": None,
+        "investor_strengths": None,
+        "investor_concerns": None,
+        "suggested_investment": None,
+        "expected_return": None,
+        "messages": [],
+        "tool_section": None,
+        "tool_rounds": {},
+        "search_stats": {},
+        "skipped_nodes": [],
+        "partial": False
+    }
+
+
+# Per-run bookkeeping that never carries over between runs
+RUN_BOOKKEEPING_KEYS = {"startup_idea", "messages", "tool_section", "tool_rounds", "search_stats", "skipped_nodes", "partial"}
+
+
+def resume_state(previous, startup_idea):
+    """
+    AgentState for a partial rerun: sections from a previous run's state
+    snapshot are kept, the idea and per-run bookkeeping start fresh.
+    """
+    state = initial_state(startup_idea)
+    for key in state:
+        if key not in RUN_BOOKKEEPING_KEYS and previous.get(key) is not None:
+            state[key] = previous[key]
+    return state
+
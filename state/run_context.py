@@ -0,0 +1,254 @@
+# state/run_context.py - Per-run resource accounting (CPU, tokens, memory, state size) and memory caps
+
+import contextvars
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+from metrics import metrics
+from serialization import dumps_json
+from usage_ledger import usage_ledger
+from config import (
+    RESOURCE_ACCOUNTING_ENABLED,
+    USAGE_LEDGER_ENABLED,
+    TRACEMALLOC_ENABLED,
+    TRACEMALLOC_FRAMES,
+    RUN_STATE_CEILING_BYTES,
+    RUN_CEILING_ACTION,
+    RUN_COMPACT_SECTION_CHARS
+)
+
+_current_run = contextvars.ContextVar("current_run", default=None)
+
+
+class RunResourceError(RuntimeError):
+    """Raised when a run exceeds its memory ceiling and cannot be compacted below it."""
+
+
+def start_tracing():
+    """Start tracemalloc (once per process) when enabled in config."""
+    if TRACEMALLOC_ENABLED and not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+
+
+def state_bytes(value):
+    """
+    Approximate bytes held by a state value: text is counted by its UTF-8 length,
+    message objects by their content and tool calls, containers recursively.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return len(value.encode("utf-8", errors="ignore"))
+    if isinstance(value, (int, float, bool)):
+        return 8
+    if isinstance(value, dict):
+        return sum(state_bytes(k) + state_bytes(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sum(state_bytes(v) for v in value)
+    if hasattr(value, "content"):
+        size = state_bytes(value.content)
+        tool_calls = getattr(value, "tool_calls", None)
+        if tool_calls:
+            size += len(dumps_json(tool_calls))
+        return size
+    return len(str(value))
+
+
+class RunContext:
+    """
+    Resource usage of one validation run. Updated from the node threads,
+    model-call threads and tool threads the run fans out to.
+
+    peak_traced_bytes is the highest process-wide tracemalloc reading sampled
+    while the run was active (it includes concurrent runs); state_bytes and
+    peak_state_bytes are attributable to this run alone and drive the ceiling.
+    Runs with a user_id are written to the usage ledger when they finish.
+    """
+
+    def __init__(self, kind="validate", user_id=None):
+        self.kind = kind
+        self.user_id = user_id
+        self.started = time.perf_counter()
+        self.wall_seconds = None
+        self.cpu_seconds = 0.0
+        self.input_tokens = 0
+        self.output_tokens = 0
+        self.llm_calls = 0
+        self.search_calls = 0
+        self.peak_traced_bytes = 0
+        self.state_bytes = 0
+        self.peak_state_bytes = 0
+        self.nodes = 0
+        self.compactions = 0
+        self._lock = threading.Lock()
+
+    def add_cpu(self, seconds):
+        with self._lock:
+            self.cpu_seconds += seconds
+
+    def add_tokens(self, input_tokens, output_tokens):
+        """Tokens of one completed model call."""
+        with self._lock:
+            self.input_tokens += input_tokens
+            self.output_tokens += output_tokens
+            self.llm_calls += 1
+
+    def add_search(self):
+        with self._lock:
+            self.search_calls += 1
+
+    def sample_memory(self):
+        if tracemalloc.is_tracing():
+            current, _ = tracemalloc.get_traced_memory()
+            with self._lock:
+                self.peak_traced_bytes = max(self.peak_traced_bytes, current)
+
+    def set_state_bytes(self, size):
+        with self._lock:
+            self.state_bytes = size
+            self.peak_state_bytes = max(self.peak_state_bytes, size)
+
+    def report(self):
+        wall = self.wall_seconds if self.wall_seconds is not None else time.perf_counter() - self.started
+        return {
+            "wall_ms": round(wall * 1000),
+            "cpu_ms": round(self.cpu_seconds * 1000),
+            "input_tokens": int(self.input_tokens),
+            "output_tokens": int(self.output_tokens),
+            "llm_calls": self.llm_calls,
+            "search_calls": self.search_calls,
+            "peak_traced_bytes": self.peak_traced_bytes if tracemalloc.is_tracing() else None,
+            "state_bytes": self.state_bytes,
+            "peak_state_bytes": self.peak_state_bytes,
+            "nodes": self.nodes,
+            "compactions": self.compactions
+        }
+
+
+def current_run():
+    """RunContext of the run being executed, or None outside a run."""
+    return _current_run.get()
+
+
+@contextmanager
+def run_accounting(kind="validate", user_id=None):
+    """
+    Account resources for one run. Yields the RunContext; its totals are
+    aggregated into metrics on exit and, for a known user, queued in the usage ledger.
+    """
+    if not RESOURCE_ACCOUNTING_ENABLED:
+        yield None
+        return
+
+    run = RunContext(kind, user_id)
+    token = _current_run.set(run)
+    run.sample_memory()
+    try:
+        yield run
+    finally:
+        _current_run.reset(token)
+        run.wall_seconds = time.perf_counter() - run.started
+        run.sample_memory()
+        metrics.observe("run_cpu_seconds", run.cpu_seconds, kind=kind)
+        metrics.observe("run_peak_state_bytes", run.peak_state_bytes, kind=kind)
+        metrics.observe("run_tokens", run.input_tokens + run.output_tokens, kind=kind)
+        if run.peak_traced_bytes:
+            metrics.observe("run_peak_traced_bytes", run.peak_traced_bytes, kind=kind)
+        if USAGE_LEDGER_ENABLED and user_id is not None:
+            usage_ledger.record_run(run)
+
+
+@contextmanager
+def track_cpu():
+    """Add the current thread's CPU time for the block to the active run."""
+    run = current_run()
+    if run is None:
+        yield
+        return
+    started = time.thread_time()
+    try:
+        yield
+    finally:
+        run.add_cpu(time.thread_time() - started)
+
+
+def record_run_tokens(input_tokens, output_tokens):
+    run = current_run()
+    if run is not None:
+        run.add_tokens(input_tokens, output_tokens)
+
+
+def record_run_search():
+    run = current_run()
+    if run is not None:
+        run.add_search()
+
+
+def compact_update(state, update):
+    """
+    Shrink a run's state: drop message history (keeping only a pending tool
+    call, which the tools node needs) and truncate oversized text sections.
+    Returns the compacted update.
+    """
+    compacted = dict(update)
+    messages = compacted.get("messages", state.get("messages")) or []
+    last = messages[-1] if messages else None
+    compacted["messages"] = [last] if getattr(last, "tool_calls", None) else []
+
+    merged = {**state, **compacted}
+    for key, value in merged.items():
+        if key != "startup_idea" and isinstance(value, str) and len(value) > RUN_COMPACT_SECTION_CHARS:
+            compacted[key] = value[:RUN_COMPACT_SECTION_CHARS] + " ...[truncated]"
+    return compacted
+
+
+def enforce_ceiling(node, state, update):
+    """
+    Measure the run's state after a node and apply the ceiling action.
+    Returns the (possibly compacted) update; raises RunResourceError on abort.
+    """
+    run = current_run()
+    if run is None or not isinstance(update, dict):
+        return update
+
+    size = state_bytes({**state, **update})
+    if size > RUN_STATE_CEILING_BYTES:
+        if RUN_CEILING_ACTION == "compact":
+            update = compact_update(state, update)
+            size = state_bytes({**state, **update})
+            run.compactions += 1
+            metrics.incr("run_compactions", node=node)
+        if size > RUN_STATE_CEILING_BYTES:
+            metrics.incr("run_aborts", node=node)
+            raise RunResourceError(
+                f"Run state reached {size} bytes after '{node}' (ceiling {RUN_STATE_CEILING_BYTES} bytes)"
+            )
+    run.set_state_bytes(size)
+    return update
+
+
+def accounted(node, fn):
+    """
+    Wrap a graph node: CPU time of its thread, a memory sample, and the
+    per-run state ceiling applied to what it returns.
+    """
+    @functools.wraps(fn)
+    def wrapper(state):
+        run = current_run()
+        if run is None:
+            return fn(state)
+        with track_cpu():
+            update = fn(state)
+        run.nodes += 1
+        run.sample_memory()
+        return enforce_ceiling(node, state, update)
+
+    return wrapper
+
+
+def resources_header(run):
+    """Compact value for the X-ValidX-Resources debug header."""
+    return ";".join(f"{key}={value}" for key, value in run.report().items() if value is not None)
@@ -0,0 +1,81 @@
+# state/run_store.py - Stored validation results and state, by run id and revision
+
+import threading
+import time
+import uuid
+
+from cache import TTLCache
+from serialization import pack, unpack
+from config import RUN_STORE_MAXSIZE, RUN_STORE_TTL
+
+ANY_OWNER = object()   # get() without an ownership check (internal callers)
+
+
+def snapshot_state(state):
+    """Serializable copy of an AgentState (message objects are dropped)."""
+    return {key: value for key, value in state.items() if key != "messages"}
+
+
+class RunStore:
+    """
+    Keeps recent runs in memory. Every run has one or more revisions;
+    revision 1 is the original validation, later ones come from reruns.
+    A revision's response and state are kept as one packed blob, so stored
+    runs stay compact and callers always get their own copy.
+    A run belongs to the user that created it; runs created without an owner
+    are only readable by internal callers (ANY_OWNER).
+    """
+
+    def __init__(self, maxsize=RUN_STORE_MAXSIZE, ttl=RUN_STORE_TTL):
+        self._runs = TTLCache(maxsize=maxsize, ttl=ttl, name="run_store")
+        self._lock = threading.Lock()
+
+    def create(self, response, state, owner=None):
+        """Store a new run for owner (a user id). Returns its run id."""
+        run_id = uuid.uuid4().hex
+        self._runs.set(run_id, {"run_id": run_id, "owner": owner, "revisions": []})
+        self.add_revision(run_id, response, state)
+        return run_id
+
+    def add_revision(self, run_id, response, state, source="validate"):
+        """Append a revision to an existing run. Returns the revision or None."""
+        found, run = self._runs.get(run_id)
+        if not found or run is None:
+            return None
+        with self._lock:
+            revision = {
+                "revision": len(run["revisions"]) + 1,
+                "created_at": time.time(),
+                "source": source,
+                "blob": pack({"response": response, "state": snapshot_state(state)})
+            }
+            run["revisions"].append(revision)
+        # Refresh TTL and LRU position
+        self._runs.set(run_id, run)
+        return revision
+
+    def get(self, run_id, revision=None, owner=ANY_OWNER):
+        """
+        Return a revision of a run (latest by default) with its response and state,
+        or None. With owner, runs of another owner are reported as missing;
+        owner None (an unidentified caller) never matches a run.
+        """
+        found, run = self._runs.get(run_id)
+        if not found or run is None or not run["revisions"]:
+            return None
+        if owner is not ANY_OWNER and (owner is None or run.get("owner") != owner):
+            return None
+        if revision is None:
+            stored = run["revisions"][-1]
+        elif 1 <= revision <= len(run["revisions"]):
+            stored = run["revisions"][revision - 1]
+        else:
+            return None
+        return {**{key: value for key, value in stored.items() if key != "blob"}, **unpack(stored["blob"])}
+
+    def stats(self):
+        return self._runs.stats()
+
+
+# Process-wide store used by the backend
+run_store = RunStore()
@@ -22,6 +22,80 @@ document.addEventListener("DOMContentLoaded", function () {
   let revenueLineChart = null;
   let costRevenueBarChart = null;
 
+  // Financial what-if state: the displayed run's financial_viability and the pending simulation
+  let financialBase = null;
+  let simulationTimer = null;
+  let simulationController = null;
+
+  // ========== LAZY CHART RENDERING ==========
+
+  // Chart renders waiting for their canvas to become visible, keyed by canvas id
+  const pendingCharts = new Map();
+
+  const chartObserver =
+    "IntersectionObserver" in window
+      ? new IntersectionObserver(
+          (entries) => {
+            entries.forEach((entry) => {
+              if (entry.isIntersecting) renderPendingChart(entry.target.id);
+            });
+          },
+          { rootMargin: "200px 0px" }
+        )
+      : null;
+
+  // Defer a chart render until its canvas scrolls into view or its accordion opens
+  function renderWhenVisible(canvas, render) {
+    pendingCharts.set(canvas.id, render);
+    if (chartObserver) {
+      chartObserver.observe(canvas);
+    } else {
+      renderPendingChart(canvas.id);
+    }
+  }
+
+  function renderPendingChart(canvasId, renderOptions = {}) {
+    const render = pendingCharts.get(canvasId);
+    if (!render) return;
+    pendingCharts.delete(canvasId);
+    if (chartObserver) chartObserver.unobserve(document.getElementById(canvasId));
+    render(renderOptions);
+  }
+
+  // Render everything still pending (e.g. before exporting the PDF)
+  function renderAllPendingCharts(renderOptions) {
+    Array.from(pendingCharts.keys()).forEach((canvasId) =>
+      renderPendingChart(canvasId, renderOptions)
+    );
+  }
+
+  function cancelPendingChart(canvas) {
+    pendingCharts.delete(canvas.id);
+    if (chartObserver) chartObserver.unobserve(canvas);
+  }
+
+  // Collapsed accordions clip their charts; render them as soon as one opens
+  document.addEventListener("accordion:open", (event) => {
+    event.detail
+      .querySelectorAll("canvas")
+      .forEach((canvas) => renderPendingChart(canvas.id));
+  });
+
+  // Update an existing chart in place, or create it the first time
+  function upsertChart(chart, canvas, config, renderOptions = {}) {
+    if (renderOptions.animate === false) {
+      config.options = { ...config.options, animation: false };
+    }
+    if (chart && chart.config.type === config.type) {
+      chart.data = config.data;
+      chart.options = config.options;
+      chart.update(renderOptions.animate === false ? "none" : undefined);
+      return chart;
+    }
+    if (chart) chart.destroy();
+    return new Chart(canvas, config);
+  }
+
   // Modern Minimalist Color Palette
   const colors = {
     accent: "#06B6D4",
@@ -206,15 +280,21 @@ document.addEventListener("DOMContentLoaded", function () {
     }, 5000);
 
     try {
+      // Same budget as the server: the browser gives up only after Flask had its chance to answer
+      const budgetMs = window.VALIDX_REQUEST_BUDGET_MS || 300000;
+      const marginMs = window.VALIDX_DEADLINE_MARGIN_MS || 2000;
       const controller = new AbortController();
-      const timeoutId = setTimeout(() => controller.abort(), 300000); // 5 minutes
+      const timeoutId = setTimeout(() => controller.abort(), budgetMs);
 
       console.log("🚀 Sending validation request...");
       const startTime = Date.now();
 
       const response = await fetch("/api/validate", {
         method: "POST",
-        headers: { "Content-Type": "application/json" },
+        headers: {
+          "Content-Type": "application/json",
+          "X-ValidX-Budget": ((budgetMs - marginMs) / 1000).toFixed(1),
+        },
         body: JSON.stringify({ startup_idea: idea }),
         signal: controller.signal,
       });
@@ -307,9 +387,21 @@ document.addEventListener("DOMContentLoaded", function () {
         data.risk_assessment || "No risk assessment available"
       );
 
-    const marketData = analyzeMarketText(data.market_analysis);
-    const competitionData = analyzeCompetitionText(data.competition_analysis);
-    const riskData = analyzeRiskText(data.risk_assessment);
+    // Partial results: the run hit its deadline before every section finished
+    const partialNotice = document.getElementById("partialNotice");
+    if (data.partial) {
+      const missing = (data.missing_sections || []).map((s) => s.replace(/_/g, " "));
+      partialNotice.textContent =
+        "Partial results: the analysis ran out of time" +
+        (missing.length ? ` before finishing ${missing.join(", ")}.` : ".");
+      partialNotice.classList.remove("hidden");
+    } else {
+      partialNotice.classList.add("hidden");
+    }
+
+    const marketData = analyzeMarketText(data.market_analysis || "");
+    const competitionData = analyzeCompetitionText(data.competition_analysis || "");
+    const riskData = analyzeRiskText(data.risk_assessment || "");
 
     createMarketChart(marketData);
     createCompetitionChart(competitionData);
@@ -437,60 +529,60 @@ document.addEventListener("DOMContentLoaded", function () {
   function createMarketChart(data) {
     const ctx = document.getElementById("marketChart");
     if (!ctx) return;
-    if (marketChart) marketChart.destroy();
-
-    marketChart = new Chart(ctx, {
-      type: "doughnut",
-      data: {
-        labels: ["Market Opportunity", "Market Stability", "Market Challenges"],
-        datasets: [
-          {
-            data: [data.opportunity, data.stability, data.challenges],
-            backgroundColor: [
-              "rgba(16, 185, 129, 0.85)",
-              "rgba(6, 182, 212, 0.85)",
-              "rgba(239, 68, 68, 0.85)",
-            ],
-            borderColor: [
-              "rgba(16, 185, 129, 1)",
-              "rgba(6, 182, 212, 1)",
-              "rgba(239, 68, 68, 1)",
-            ],
-            borderWidth: 3,
-            hoverOffset: 10,
-          },
-        ],
-      },
-      options: {
-        responsive: true,
-        maintainAspectRatio: false,
-        animation: {
-          animateRotate: true,
-          animateScale: true,
-          duration: 1500,
-          easing: "easeInOutCubic",
-        },
-        plugins: {
-          legend: {
-            position: "bottom",
-            labels: {
-              color: colors.textPrimary,
-              padding: 18,
-              font: { size: 13, weight: "600" },
-              usePointStyle: true,
-              pointStyle: "circle",
+    renderWhenVisible(ctx, (renderOptions) => {
+      marketChart = upsertChart(marketChart, ctx, {
+        type: "doughnut",
+        data: {
+          labels: ["Market Opportunity", "Market Stability", "Market Challenges"],
+          datasets: [
+            {
+              data: [data.opportunity, data.stability, data.challenges],
+              backgroundColor: [
+                "rgba(16, 185, 129, 0.85)",
+                "rgba(6, 182, 212, 0.85)",
+                "rgba(239, 68, 68, 0.85)",
+              ],
+              borderColor: [
+                "rgba(16, 185, 129, 1)",
+                "rgba(6, 182, 212, 1)",
+                "rgba(239, 68, 68, 1)",
+              ],
+              borderWidth: 3,
+              hoverOffset: 10,
             },
+          ],
+        },
+        options: {
+          responsive: true,
+          maintainAspectRatio: false,
+          animation: {
+            animateRotate: true,
+            animateScale: true,
+            duration: 1500,
+            easing: "easeInOutCubic",
           },
-          tooltip: {
-            backgroundColor: "rgba(0, 0, 0, 0.9)",
-            padding: 12,
-            cornerRadius: 8,
-            callbacks: {
-              label: (context) => context.label + ": " + context.parsed + "%",
+          plugins: {
+            legend: {
+              position: "bottom",
+              labels: {
+                color: colors.textPrimary,
+                padding: 18,
+                font: { size: 13, weight: "600" },
+                usePointStyle: true,
+                pointStyle: "circle",
+              },
+            },
+            tooltip: {
+              backgroundColor: "rgba(0, 0, 0, 0.9)",
+              padding: 12,
+              cornerRadius: 8,
+              callbacks: {
+                label: (context) => context.label + ": " + context.parsed + "%",
+              },
             },
           },
         },
-      },
+      }, renderOptions);
     });
   }
 
@@ -498,68 +590,68 @@ document.addEventListener("DOMContentLoaded", function () {
   function createCompetitionChart(data) {
     const ctx = document.getElementById("competitionChart");
     if (!ctx) return;
-    if (competitionChart) competitionChart.destroy();
-
-    competitionChart = new Chart(ctx, {
-      type: "bar",
-      data: {
-        labels: [
-          "Competition Intensity",
-          "Competitor Strength",
-          "Market Opportunities",
-        ],
-        datasets: [
-          {
-            label: "Percentage",
-            data: [data.intensity, data.strength, data.opportunities],
-            backgroundColor: [
-              "rgba(6, 182, 212, 0.85)",
-              "rgba(8, 145, 178, 0.85)",
-              "rgba(16, 185, 129, 0.85)",
-            ],
-            borderColor: [
-              "rgba(6, 182, 212, 1)",
-              "rgba(8, 145, 178, 1)",
-              "rgba(16, 185, 129, 1)",
-            ],
-            borderWidth: 3,
-            borderRadius: 8,
-            barThickness: 60,
-          },
-        ],
-      },
-      options: {
-        responsive: true,
-        maintainAspectRatio: false,
-        animation: { duration: 1500, easing: "easeInOutQuart" },
-        scales: {
-          y: {
-            beginAtZero: true,
-            max: 100,
-            ticks: {
-              color: colors.textSecondary,
-              font: { size: 12, weight: "500" },
+    renderWhenVisible(ctx, (renderOptions) => {
+      competitionChart = upsertChart(competitionChart, ctx, {
+        type: "bar",
+        data: {
+          labels: [
+            "Competition Intensity",
+            "Competitor Strength",
+            "Market Opportunities",
+          ],
+          datasets: [
+            {
+              label: "Percentage",
+              data: [data.intensity, data.strength, data.opportunities],
+              backgroundColor: [
+                "rgba(6, 182, 212, 0.85)",
+                "rgba(8, 145, 178, 0.85)",
+                "rgba(16, 185, 129, 0.85)",
+              ],
+              borderColor: [
+                "rgba(6, 182, 212, 1)",
+                "rgba(8, 145, 178, 1)",
+                "rgba(16, 185, 129, 1)",
+              ],
+              borderWidth: 3,
+              borderRadius: 8,
+              barThickness: 60,
             },
-            grid: { color: "rgba(128, 128, 128, 0.08)", drawBorder: false },
-          },
-          x: {
-            ticks: {
-              color: colors.textSecondary,
-              font: { size: 12, weight: "500" },
+          ],
+        },
+        options: {
+          responsive: true,
+          maintainAspectRatio: false,
+          animation: { duration: 1500, easing: "easeInOutQuart" },
+          scales: {
+            y: {
+              beginAtZero: true,
+              max: 100,
+              ticks: {
+                color: colors.textSecondary,
+                font: { size: 12, weight: "500" },
+              },
+              grid: { color: "rgba(128, 128, 128, 0.08)", drawBorder: false },
+            },
+            x: {
+              ticks: {
+                color: colors.textSecondary,
+                font: { size: 12, weight: "500" },
+              },
+              grid: { display: false },
             },
-            grid: { display: false },
           },
-        },
-        plugins: {
-          legend: { display: false },
-          tooltip: {
-            backgroundColor: "rgba(0, 0, 0, 0.9)",
-            padding: 12,
-            cornerRadius: 8,
-            callbacks: { label: (context) => context.parsed.y + "%" },
+          plugins: {
+            legend: { display: false },
+            tooltip: {
+              backgroundColor: "rgba(0, 0, 0, 0.9)",
+              padding: 12,
+              cornerRadius: 8,
+              callbacks: { label: (context) => context.parsed.y + "%" },
+            },
           },
         },
-      },
+      }, renderOptions);
     });
   }
 
@@ -567,71 +659,71 @@ document.addEventListener("DOMContentLoaded", function () {
   function createRiskChart(data) {
     const ctx = document.getElementById("riskChart");
     if (!ctx) return;
-    if (riskChart) riskChart.destroy();
-
-    riskChart = new Chart(ctx, {
-      type: "radar",
-      data: {
-        labels: [
-          "Market Risk",
-          "Technical Risk",
-          "Financial Risk",
-          "Operational Risk",
-          "Regulatory Risk",
-        ],
-        datasets: [
-          {
-            label: "Risk Level",
-            data: [
-              data.market,
-              data.technical,
-              data.financial,
-              data.operational,
-              data.regulatory,
-            ],
-            backgroundColor: "rgba(239, 68, 68, 0.15)",
-            borderColor: "rgba(239, 68, 68, 1)",
-            borderWidth: 3,
-            pointBackgroundColor: "rgba(239, 68, 68, 1)",
-            pointBorderColor: "#fff",
-            pointBorderWidth: 3,
-            pointRadius: 6,
-            pointHoverRadius: 8,
-          },
-        ],
-      },
-      options: {
-        responsive: true,
-        maintainAspectRatio: false,
-        animation: { duration: 1500, easing: "easeInOutCubic" },
-        scales: {
-          r: {
-            beginAtZero: true,
-            max: 100,
-            ticks: {
-              color: colors.textSecondary,
-              backdropColor: "transparent",
-              font: { size: 11 },
+    renderWhenVisible(ctx, (renderOptions) => {
+      riskChart = upsertChart(riskChart, ctx, {
+        type: "radar",
+        data: {
+          labels: [
+            "Market Risk",
+            "Technical Risk",
+            "Financial Risk",
+            "Operational Risk",
+            "Regulatory Risk",
+          ],
+          datasets: [
+            {
+              label: "Risk Level",
+              data: [
+                data.market,
+                data.technical,
+                data.financial,
+                data.operational,
+                data.regulatory,
+              ],
+              backgroundColor: "rgba(239, 68, 68, 0.15)",
+              borderColor: "rgba(239, 68, 68, 1)",
+              borderWidth: 3,
+              pointBackgroundColor: "rgba(239, 68, 68, 1)",
+              pointBorderColor: "#fff",
+              pointBorderWidth: 3,
+              pointRadius: 6,
+              pointHoverRadius: 8,
             },
-            grid: { color: "rgba(128, 128, 128, 0.15)" },
-            pointLabels: {
-              color: colors.textPrimary,
-              font: { size: 12, weight: "600" },
+          ],
+        },
+        options: {
+          responsive: true,
+          maintainAspectRatio: false,
+          animation: { duration: 1500, easing: "easeInOutCubic" },
+          scales: {
+            r: {
+              beginAtZero: true,
+              max: 100,
+              ticks: {
+                color: colors.textSecondary,
+                backdropColor: "transparent",
+                font: { size: 11 },
+              },
+              grid: { color: "rgba(128, 128, 128, 0.15)" },
+              pointLabels: {
+                color: colors.textPrimary,
+                font: { size: 12, weight: "600" },
+              },
             },
           },
-        },
-        plugins: {
-          legend: { display: false },
-          tooltip: {
-            backgroundColor: "rgba(0, 0, 0, 0.9)",
-            padding: 12,
-            cornerRadius: 8,
-            callbacks: {
-              label: (context) => "Risk: " + context.parsed.r + "%",
+          plugins: {
+            legend: { display: false },
+            tooltip: {
+              backgroundColor: "rgba(0, 0, 0, 0.9)",
+              padding: 12,
+              cornerRadius: 8,
+              callbacks: {
+                label: (context) => "Risk: " + context.parsed.r + "%",
+              },
             },
           },
         },
-      },
+      }, renderOptions);
     });
   }
 
@@ -639,69 +731,74 @@ document.addEventListener("DOMContentLoaded", function () {
   function createScoreChart(marketData, competitionData, riskData) {
     const ctx = document.getElementById("scoreChart");
     if (!ctx) return;
-    if (scoreChart) scoreChart.destroy();
-
     const overallScore = Math.round(
       (marketData.score + competitionData.score + riskData.score) / 3
     );
 
-    scoreChart = new Chart(ctx, {
-      type: "doughnut",
-      data: {
-        datasets: [
-          {
-            data: [overallScore, 100 - overallScore],
-            backgroundColor: [
-              overallScore >= 70
-                ? "rgba(16, 185, 129, 0.9)"
-                : overallScore >= 40
-                ? "rgba(245, 158, 11, 0.9)"
-                : "rgba(239, 68, 68, 0.9)",
-              "rgba(128, 128, 128, 0.08)",
-            ],
-            borderWidth: 0,
-            circumference: 180,
-            rotation: 270,
-          },
-        ],
-      },
-      options: {
-        responsive: true,
-        maintainAspectRatio: false,
-        cutout: "75%",
-        animation: {
-          animateRotate: true,
-          duration: 2000,
-          easing: "easeInOutQuart",
+    renderWhenVisible(ctx, (renderOptions) => {
+      scoreChart = upsertChart(scoreChart, ctx, {
+        type: "doughnut",
+        data: {
+          datasets: [
+            {
+              data: [overallScore, 100 - overallScore],
+              backgroundColor: [
+                overallScore >= 70
+                  ? "rgba(16, 185, 129, 0.9)"
+                  : overallScore >= 40
+                  ? "rgba(245, 158, 11, 0.9)"
+                  : "rgba(239, 68, 68, 0.9)",
+                "rgba(128, 128, 128, 0.08)",
+              ],
+              borderWidth: 0,
+              circumference: 180,
+              rotation: 270,
+            },
+          ],
         },
-        plugins: { legend: { display: false }, tooltip: { enabled: false } },
-      },
-      plugins: [
-        {
-          id: "centerText",
-          afterDatasetDraw: function (chart) {
-            const ctx = chart.ctx;
-            ctx.save();
-            const centerX =
-              chart.chartArea.left +
-              (chart.chartArea.right - chart.chartArea.left) / 2;
-            const centerY =
-              chart.chartArea.top +
-              (chart.chartArea.bottom - chart.chartArea.top) / 2;
-
-            ctx.textAlign = "center";
-            ctx.textBaseline = "middle";
-            ctx.font = "bold 54px sans-serif";
-            ctx.fillStyle = colors.textPrimary;
-            ctx.fillText(overallScore, centerX, centerY - 10);
-
-            ctx.font = "600 16px sans-serif";
-            ctx.fillStyle = colors.textSecondary;
-            ctx.fillText("Viability Score", centerX, centerY + 35);
-            ctx.restore();
+        options: {
+          responsive: true,
+          maintainAspectRatio: false,
+          cutout: "75%",
+          animation: {
+            animateRotate: true,
+            duration: 2000,
+            easing: "easeInOutQuart",
+          },
+          plugins: {
+            legend: { display: false },
+            tooltip: { enabled: false },
+            // Read by the centerText plugin so chart.update() redraws the new score
+            centerText: { score: overallScore },
           },
         },
-      ],
+        plugins: [
+          {
+            id: "centerText",
+            afterDatasetDraw: function (chart, args, pluginOptions) {
+              const ctx = chart.ctx;
+              ctx.save();
+              const centerX =
+                chart.chartArea.left +
+                (chart.chartArea.right - chart.chartArea.left) / 2;
+              const centerY =
+                chart.chartArea.top +
+                (chart.chartArea.bottom - chart.chartArea.top) / 2;
+
+              ctx.textAlign = "center";
+              ctx.textBaseline = "middle";
+              ctx.font = "bold 54px sans-serif";
+              ctx.fillStyle = colors.textPrimary;
+              ctx.fillText(pluginOptions.score, centerX, centerY - 10);
+
+              ctx.font = "600 16px sans-serif";
+              ctx.fillStyle = colors.textSecondary;
+              ctx.fillText("Viability Score", centerX, centerY + 35);
+              ctx.restore();
+            },
+          },
+        ],
+      }, renderOptions);
     });
 
     animateValue("marketScore", 0, marketData.score, 1500);
@@ -709,24 +806,41 @@ document.addEventListener("DOMContentLoaded", function () {
     animateValue("riskScore", 0, riskData.score, 1500);
   }
 
+  // ========== COUNTER ANIMATIONS ==========
+
+  // Running counters keyed by element id, advanced by one shared rAF loop
+  const counterAnimations = new Map();
+  let counterFrame = null;
+
+  function stepCounters(now) {
+    counterAnimations.forEach((counter, elementId) => {
+      if (counter.startTime === null) counter.startTime = now;
+      const progress = Math.min(1, (now - counter.startTime) / counter.duration);
+      const value = counter.start + (counter.end - counter.start) * progress;
+      counter.element.textContent = Math.round(value) + counter.suffix;
+      if (progress >= 1) counterAnimations.delete(elementId);
+    });
+    counterFrame = counterAnimations.size
+      ? requestAnimationFrame(stepCounters)
+      : null;
+  }
+
   // Animate number counting
   function animateValue(elementId, start, end, duration, isPercentage = true) {
     const element = document.getElementById(elementId);
     if (!element) return;
 
-    const range = end - start;
-    const increment = range / (duration / 16);
-    let current = start;
-
-    const timer = setInterval(() => {
-      current += increment;
-      if (current >= end) {
-        element.textContent = Math.round(end) + (isPercentage ? "%" : "");
-        clearInterval(timer);
-      } else {
-        element.textContent = Math.round(current) + (isPercentage ? "%" : "");
-      }
-    }, 16);
+    counterAnimations.set(elementId, {
+      element,
+      start,
+      end,
+      duration,
+      startTime: null,
+      suffix: isPercentage ? "%" : "",
+    });
+    if (counterFrame === null) {
+      counterFrame = requestAnimationFrame(stepCounters);
+    }
   }
 
   // Populate insights
@@ -836,90 +950,96 @@ document.addEventListener("DOMContentLoaded", function () {
 
     if (competitors.length === 0) {
       dataElement.innerHTML = "<p>No competitor data available</p>";
+      // Don't leave the previous analysis' chart behind
+      cancelPendingChart(canvas);
+      if (competitorRadarChart) {
+        competitorRadarChart.destroy();
+        competitorRadarChart = null;
+      }
       return;
     }
 
-    if (competitorRadarChart) competitorRadarChart.destroy();
-
     const labels = competitors.map((c) => c.name || "Unknown");
     const marketShareData = competitors.map((c) => c.market_share || 0);
     const fundingData = competitors.map((c) => (c.funding || 0) / 10);
     const growthData = competitors.map((c) => c.growth_rate || 0);
     const visibilityData = competitors.map((c) => c.brand_visibility || 0);
 
-    competitorRadarChart = new Chart(canvas, {
-      type: "radar",
-      data: {
-        labels: labels,
-        datasets: [
-          {
-            label: "Market Share %",
-            data: marketShareData,
-            backgroundColor: "rgba(6, 182, 212, 0.2)",
-            borderColor: "rgba(6, 182, 212, 1)",
-            borderWidth: 2,
-            pointBackgroundColor: "rgba(6, 182, 212, 1)",
-            pointBorderColor: "#fff",
-            pointRadius: 4,
-          },
-          {
-            label: "Brand Visibility",
-            data: visibilityData,
-            backgroundColor: "rgba(16, 185, 129, 0.2)",
-            borderColor: "rgba(16, 185, 129, 1)",
-            borderWidth: 2,
-            pointBackgroundColor: "rgba(16, 185, 129, 1)",
-            pointBorderColor: "#fff",
-            pointRadius: 4,
-          },
-          {
-            label: "Growth Rate %",
-            data: growthData,
-            backgroundColor: "rgba(245, 158, 11, 0.2)",
-            borderColor: "rgba(245, 158, 11, 1)",
-            borderWidth: 2,
-            pointBackgroundColor: "rgba(245, 158, 11, 1)",
-            pointBorderColor: "#fff",
-            pointRadius: 4,
-          },
-        ],
-      },
-      options: {
-        responsive: true,
-        maintainAspectRatio: false,
-        animation: { duration: 1500, easing: "easeInOutCubic" },
-        scales: {
-          r: {
-            beginAtZero: true,
-            max: 100,
-            ticks: {
-              color: colors.textSecondary,
-              backdropColor: "transparent",
-              font: { size: 11 },
+    renderWhenVisible(canvas, (renderOptions) => {
+      competitorRadarChart = upsertChart(competitorRadarChart, canvas, {
+        type: "radar",
+        data: {
+          labels: labels,
+          datasets: [
+            {
+              label: "Market Share %",
+              data: marketShareData,
+              backgroundColor: "rgba(6, 182, 212, 0.2)",
+              borderColor: "rgba(6, 182, 212, 1)",
+              borderWidth: 2,
+              pointBackgroundColor: "rgba(6, 182, 212, 1)",
+              pointBorderColor: "#fff",
+              pointRadius: 4,
             },
-            grid: { color: "rgba(128, 128, 128, 0.15)" },
-            pointLabels: {
-              color: colors.textPrimary,
-              font: { size: 12, weight: "600" },
+            {
+              label: "Brand Visibility",
+              data: visibilityData,
+              backgroundColor: "rgba(16, 185, 129, 0.2)",
+              borderColor: "rgba(16, 185, 129, 1)",
+              borderWidth: 2,
+              pointBackgroundColor: "rgba(16, 185, 129, 1)",
+              pointBorderColor: "#fff",
+              pointRadius: 4,
             },
-          },
+            {
+              label: "Growth Rate %",
+              data: growthData,
+              backgroundColor: "rgba(245, 158, 11, 0.2)",
+              borderColor: "rgba(245, 158, 11, 1)",
+              borderWidth: 2,
+              pointBackgroundColor: "rgba(245, 158, 11, 1)",
+              pointBorderColor: "#fff",
+              pointRadius: 4,
+            },
+          ],
         },
-        plugins: {
-          legend: {
-            position: "bottom",
-            labels: {
-              color: colors.textPrimary,
-              padding: 15,
-              font: { size: 12, weight: "600" },
+        options: {
+          responsive: true,
+          maintainAspectRatio: false,
+          animation: { duration: 1500, easing: "easeInOutCubic" },
+          scales: {
+            r: {
+              beginAtZero: true,
+              max: 100,
+              ticks: {
+                color: colors.textSecondary,
+                backdropColor: "transparent",
+                font: { size: 11 },
+              },
+              grid: { color: "rgba(128, 128, 128, 0.15)" },
+              pointLabels: {
+                color: colors.textPrimary,
+                font: { size: 12, weight: "600" },
+              },
             },
           },
-          tooltip: {
-            backgroundColor: "rgba(0, 0, 0, 0.9)",
-            padding: 12,
-            cornerRadius: 8,
+          plugins: {
+            legend: {
+              position: "bottom",
+              labels: {
+                color: colors.textPrimary,
+                padding: 15,
+                font: { size: 12, weight: "600" },
+              },
+            },
+            tooltip: {
+              backgroundColor: "rgba(0, 0, 0, 0.9)",
+              padding: 12,
+              cornerRadius: 8,
+            },
           },
         },
-      },
+      }, renderOptions);
     });
 
     let detailsHTML = "<h4>Competitive Landscape Analysis:</h4><ul>";
@@ -934,10 +1054,10 @@ document.addEventListener("DOMContentLoaded", function () {
 
     detailsHTML += `<p><strong>Position:</strong> ${
       data.competitive_position || "Unknown"
-    }</p>`;
+    }${data.positioning_score != null ? ` (score ${data.positioning_score}/100)` : ""}</p>`;
     detailsHTML += `<p><strong>Market Structure:</strong> ${
       data.market_concentration || "Unknown"
-    }</p>`;
+    }${data.hhi != null ? ` (HHI ${data.hhi})` : ""}</p>`;
     detailsHTML += `<p><strong>Key Advantage:</strong> ${
       data.competitive_advantage || "Not identified"
     }</p>`;
@@ -945,176 +1065,327 @@ document.addEventListener("DOMContentLoaded", function () {
     dataElement.innerHTML = detailsHTML;
   }
 
+  // ========== FINANCIAL WHAT-IF ==========
+
+  const whatIfSliders = {
+    revenue_multiplier: document.getElementById("revenueMultiplier"),
+    burn_multiplier: document.getElementById("burnMultiplier"),
+    gross_margin: document.getElementById("grossMarginInput"),
+    funding_needed: document.getElementById("fundingInput"),
+  };
+
+  function whatIfParams() {
+    const params = {};
+    Object.entries(whatIfSliders).forEach(([name, slider]) => {
+      if (slider) params[name] = parseFloat(slider.value);
+    });
+    return params;
+  }
+
+  function updateWhatIfLabels() {
+    const params = whatIfParams();
+    const setText = (id, text) => {
+      const el = document.getElementById(id);
+      if (el) el.textContent = text;
+    };
+    setText("revenueMultiplierValue", Math.round(params.revenue_multiplier * 100) + "%");
+    setText("burnMultiplierValue", Math.round(params.burn_multiplier * 100) + "%");
+    setText("grossMarginValue", params.gross_margin + "%");
+    setText("fundingValue", "$" + params.funding_needed + "K");
+  }
+
+  // Reset the sliders to the run's own numbers
+  function resetWhatIfSliders(data) {
+    if (!whatIfSliders.funding_needed) return;
+    const funding = data.funding_needed || 0;
+    whatIfSliders.revenue_multiplier.value = 1;
+    whatIfSliders.burn_multiplier.value = 1;
+    whatIfSliders.gross_margin.value = data.gross_margin || 0;
+    whatIfSliders.funding_needed.max = Math.max(1000, Math.ceil((funding * 3) / 100) * 100);
+    whatIfSliders.funding_needed.value = funding;
+    updateWhatIfLabels();
+  }
+
+  // Simulate the current slider values (debounced; a newer request cancels the older one)
+  function requestSimulation(delayMs = 150) {
+    if (!financialBase) return;
+    clearTimeout(simulationTimer);
+    simulationTimer = setTimeout(async () => {
+      if (simulationController) simulationController.abort();
+      simulationController = new AbortController();
+      const body = {
+        revenue_projections: financialBase.revenue_projections || [0, 0, 0],
+        burn_rate: financialBase.burn_rate || 0,
+        ...whatIfParams(),
+      };
+      try {
+        const response = await fetch("/api/financials/simulate", {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify(body),
+          signal: simulationController.signal,
+        });
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        const simulation = await response.json();
+        // No score means the inputs could not be simulated (no burn rate): chart the plan only
+        const series = simulation.viability_score != null ? simulation.series : null;
+        renderFinancialCharts(body, series, { animate: false });
+        renderFinancialDetails(body, simulation);
+      } catch (error) {
+        if (error.name !== "AbortError") console.error("❌ Simulation failed:", error);
+      }
+    }, delayMs);
+  }
+
+  Object.values(whatIfSliders).forEach((slider) => {
+    if (!slider) return;
+    slider.addEventListener("input", () => {
+      updateWhatIfLabels();
+      requestSimulation();
+    });
+  });
+
   // Render financial viability data and charts
   function renderFinancialViability(data) {
+    financialBase = data;
+    resetWhatIfSliders(data);
+    renderFinancialCharts(
+      { ...data, revenue_multiplier: 1, burn_multiplier: 1 },
+      null
+    );
+    renderFinancialDetails(data, data.simulation);
+    // Fills in the simulated bands and costs
+    requestSimulation(0);
+  }
+
+  // Charts from the plan (inputs) and, once available, the simulated yearly series
+  function renderFinancialCharts(inputs, series, renderOptions = {}) {
     const lineCanvas = document.getElementById("revenueLineChart");
     const barCanvas = document.getElementById("costRevenueBarChart");
-    const dataElement = document.getElementById("financialViabilityData");
 
-    if (!lineCanvas || !barCanvas || !dataElement) return;
+    if (!lineCanvas || !barCanvas) return;
 
-    const revProjections = data.revenue_projections || [0, 0, 0];
-    const burnRate = data.burn_rate || 0;
-    const fundingNeeded = data.funding_needed || 0;
-    const breakeven = data.breakeven_month || 24;
-    const viabilityScore = data.viability_score || 50;
+    const years = ["Year 1", "Year 2", "Year 3"];
+    const revProjections = (inputs.revenue_projections || [0, 0, 0]).map(
+      (rev) => Math.round(rev * (inputs.revenue_multiplier ?? 1) * 10) / 10
+    );
+    const grossMargin = inputs.gross_margin || 0;
+    const yearlyOpex = (inputs.burn_rate || 0) * (inputs.burn_multiplier ?? 1) * 12;
+    const revenue = series ? series.revenue_p50 : revProjections;
+    const costs = series
+      ? series.costs_p50
+      : revProjections.map(
+          (rev) => Math.round((rev * (1 - grossMargin / 100) + yearlyOpex) * 10) / 10
+        );
 
-    if (revenueLineChart) revenueLineChart.destroy();
-    if (costRevenueBarChart) costRevenueBarChart.destroy();
+    const lineDatasets = [
+      {
+        label: "Revenue Projection ($K)",
+        data: revProjections,
+        borderColor: "rgba(16, 185, 129, 1)",
+        backgroundColor: "rgba(16, 185, 129, 0.1)",
+        borderWidth: 3,
+        fill: !series,
+        tension: 0.4,
+        pointRadius: 6,
+        pointBackgroundColor: "rgba(16, 185, 129, 1)",
+        pointBorderColor: "#fff",
+        pointBorderWidth: 2,
+      },
+    ];
+    if (series) {
+      lineDatasets.push(
+        {
+          label: "Simulated P90 ($K)",
+          data: series.revenue_p90,
+          borderColor: "rgba(59, 130, 246, 0.5)",
+          borderDash: [6, 4],
+          borderWidth: 1,
+          pointRadius: 0,
+          fill: false,
+          tension: 0.4,
+        },
+        {
+          label: "Simulated P10 ($K)",
+          data: series.revenue_p10,
+          borderColor: "rgba(59, 130, 246, 0.5)",
+          backgroundColor: "rgba(59, 130, 246, 0.12)",
+          borderDash: [6, 4],
+          borderWidth: 1,
+          pointRadius: 0,
+          fill: "-1",
+          tension: 0.4,
+        }
+      );
+    }
 
     // Revenue projection line chart
-    revenueLineChart = new Chart(lineCanvas, {
-      type: "line",
-      data: {
-        labels: ["Year 1", "Year 2", "Year 3"],
-        datasets: [
-          {
-            label: "Revenue Projection ($K)",
-            data: revProjections,
-            borderColor: "rgba(16, 185, 129, 1)",
-            backgroundColor: "rgba(16, 185, 129, 0.1)",
-            borderWidth: 3,
-            fill: true,
-            tension: 0.4,
-            pointRadius: 6,
-            pointBackgroundColor: "rgba(16, 185, 129, 1)",
-            pointBorderColor: "#fff",
-            pointBorderWidth: 2,
-          },
-        ],
-      },
-      options: {
-        responsive: true,
-        maintainAspectRatio: false,
-        animation: { duration: 1500, easing: "easeInOutQuart" },
-        scales: {
-          y: {
-            beginAtZero: true,
-            ticks: {
-              color: colors.textSecondary,
-              font: { size: 12, weight: "500" },
-              callback: (value) => "$" + value + "K",
+    renderWhenVisible(lineCanvas, (options) => {
+      revenueLineChart = upsertChart(revenueLineChart, lineCanvas, {
+        type: "line",
+        data: {
+          labels: years,
+          datasets: lineDatasets,
+        },
+        options: {
+          responsive: true,
+          maintainAspectRatio: false,
+          animation: { duration: 1500, easing: "easeInOutQuart" },
+          scales: {
+            y: {
+              beginAtZero: true,
+              ticks: {
+                color: colors.textSecondary,
+                font: { size: 12, weight: "500" },
+                callback: (value) => "$" + value + "K",
+              },
+              grid: { color: "rgba(128, 128, 128, 0.08)" },
             },
-            grid: { color: "rgba(128, 128, 128, 0.08)" },
-          },
-          x: {
-            ticks: {
-              color: colors.textSecondary,
-              font: { size: 12, weight: "500" },
+            x: {
+              ticks: {
+                color: colors.textSecondary,
+                font: { size: 12, weight: "500" },
+              },
+              grid: { display: false },
             },
-            grid: { display: false },
           },
-        },
-        plugins: {
-          legend: {
-            display: true,
-            position: "top",
-            labels: {
-              color: colors.textPrimary,
-              font: { size: 12, weight: "600" },
+          plugins: {
+            legend: {
+              display: true,
+              position: "top",
+              labels: {
+                color: colors.textPrimary,
+                font: { size: 12, weight: "600" },
+              },
             },
-          },
-          tooltip: {
-            backgroundColor: "rgba(0, 0, 0, 0.9)",
-            padding: 12,
-            cornerRadius: 8,
-            callbacks: {
-              label: (context) =>
-                context.dataset.label + ": $" + context.parsed.y + "K",
+            tooltip: {
+              backgroundColor: "rgba(0, 0, 0, 0.9)",
+              padding: 12,
+              cornerRadius: 8,
+              callbacks: {
+                label: (context) =>
+                  context.dataset.label + ": $" + context.parsed.y + "K",
+              },
             },
           },
         },
-      },
+      }, { ...renderOptions, ...options });
     });
 
-    // Cost vs Revenue stacked bar chart
-    const years = ["Year 1", "Year 2", "Year 3"];
-    const costs = revProjections.map((rev) => rev * 0.6);
-
-    costRevenueBarChart = new Chart(barCanvas, {
-      type: "bar",
-      data: {
-        labels: years,
-        datasets: [
-          {
-            label: "Revenue ($K)",
-            data: revProjections,
-            backgroundColor: "rgba(16, 185, 129, 0.85)",
-            borderColor: "rgba(16, 185, 129, 1)",
-            borderWidth: 2,
-            borderRadius: 6,
-          },
-          {
-            label: "Estimated Costs ($K)",
-            data: costs,
-            backgroundColor: "rgba(239, 68, 68, 0.85)",
-            borderColor: "rgba(239, 68, 68, 1)",
-            borderWidth: 2,
-            borderRadius: 6,
-          },
-        ],
-      },
-      options: {
-        responsive: true,
-        maintainAspectRatio: false,
-        animation: { duration: 1500, easing: "easeInOutQuart" },
-        scales: {
-          y: {
-            beginAtZero: true,
-            ticks: {
-              color: colors.textSecondary,
-              font: { size: 12, weight: "500" },
-              callback: (value) => "$" + value + "K",
+    // Cost vs Revenue bar chart
+    renderWhenVisible(barCanvas, (options) => {
+      costRevenueBarChart = upsertChart(costRevenueBarChart, barCanvas, {
+        type: "bar",
+        data: {
+          labels: years,
+          datasets: [
+            {
+              label: series ? "Median Revenue ($K)" : "Revenue ($K)",
+              data: revenue,
+              backgroundColor: "rgba(16, 185, 129, 0.85)",
+              borderColor: "rgba(16, 185, 129, 1)",
+              borderWidth: 2,
+              borderRadius: 6,
             },
-            grid: { color: "rgba(128, 128, 128, 0.08)" },
-          },
-          x: {
-            ticks: {
-              color: colors.textSecondary,
-              font: { size: 12, weight: "500" },
+            {
+              label: series ? "Median Costs ($K)" : "Estimated Costs ($K)",
+              data: costs,
+              backgroundColor: "rgba(239, 68, 68, 0.85)",
+              borderColor: "rgba(239, 68, 68, 1)",
+              borderWidth: 2,
+              borderRadius: 6,
             },
-            grid: { display: false },
-          },
+          ],
         },
-        plugins: {
-          legend: {
-            position: "top",
-            labels: {
-              color: colors.textPrimary,
-              font: { size: 12, weight: "600" },
+        options: {
+          responsive: true,
+          maintainAspectRatio: false,
+          animation: { duration: 1500, easing: "easeInOutQuart" },
+          scales: {
+            y: {
+              beginAtZero: true,
+              ticks: {
+                color: colors.textSecondary,
+                font: { size: 12, weight: "500" },
+                callback: (value) => "$" + value + "K",
+              },
+              grid: { color: "rgba(128, 128, 128, 0.08)" },
+            },
+            x: {
+              ticks: {
+                color: colors.textSecondary,
+                font: { size: 12, weight: "500" },
+              },
+              grid: { display: false },
             },
           },
-          tooltip: {
-            backgroundColor: "rgba(0, 0, 0, 0.9)",
-            padding: 12,
-            cornerRadius: 8,
-            callbacks: {
-              label: (context) =>
-                context.dataset.label + ": $" + context.parsed.y + "K",
+          plugins: {
+            legend: {
+              position: "top",
+              labels: {
+                color: colors.textPrimary,
+                font: { size: 12, weight: "600" },
+              },
+            },
+            tooltip: {
+              backgroundColor: "rgba(0, 0, 0, 0.9)",
+              padding: 12,
+              cornerRadius: 8,
+              callbacks: {
+                label: (context) =>
+                  context.dataset.label + ": $" + context.parsed.y + "K",
+              },
             },
           },
         },
-      },
+      }, { ...renderOptions, ...options });
     });
+  }
+
+  // Metrics text; simulation is the run's summary or a what-if result
+  function renderFinancialDetails(inputs, simulation) {
+    const dataElement = document.getElementById("financialViabilityData");
+    if (!dataElement) return;
+
+    const burnRate = (inputs.burn_rate || 0) * (inputs.burn_multiplier ?? 1);
+    const percent = (value) => Math.round((value || 0) * 100) + "%";
+    const range = (p) => `${p.p50} months (P10 ${p.p10} – P90 ${p.p90})`;
 
     let detailsHTML = "<h4>Financial Metrics:</h4>";
-    detailsHTML += `<p><strong>Funding Needed:</strong> $${fundingNeeded}K</p>`;
-    detailsHTML += `<p><strong>Monthly Burn Rate:</strong> $${burnRate}K</p>`;
-    detailsHTML += `<p><strong>Breakeven Timeline:</strong> ${breakeven} months</p>`;
-    detailsHTML += `<p><strong>Gross Margin:</strong> ${
-      data.gross_margin || 0
-    }%</p>`;
-    detailsHTML += `<p><strong>Cash Runway:</strong> ${
-      data.cash_runway || 0
-    } months</p>`;
-    detailsHTML += `<p><strong>Viability Score:</strong> ${viabilityScore}/100</p>`;
-
-    if (data.cost_structure) {
-      detailsHTML += `<p><strong>Cost Structure:</strong> ${data.cost_structure}</p>`;
+    detailsHTML += `<p><strong>Funding Needed:</strong> $${inputs.funding_needed || 0}K</p>`;
+    detailsHTML += `<p><strong>Monthly Burn Rate:</strong> $${Math.round(burnRate * 10) / 10}K</p>`;
+    detailsHTML += `<p><strong>Gross Margin:</strong> ${inputs.gross_margin || 0}%</p>`;
+
+    if (simulation && simulation.viability_score != null) {
+      const runway = simulation.runway_months;
+      const breakeven = simulation.breakeven_month;
+      detailsHTML += `<p><strong>Breakeven Timeline:</strong> ${
+        breakeven.p50 != null ? range(breakeven) : "not within " + simulation.horizon_months + " months"
+      } · ${percent(simulation.probability_breakeven)} of scenarios</p>`;
+      detailsHTML += `<p><strong>Cash Runway:</strong> ${
+        runway.p10 >= simulation.horizon_months
+          ? simulation.horizon_months + "+ months"
+          : range(runway)
+      }</p>`;
+      detailsHTML += `<p><strong>Default Alive:</strong> ${percent(
+        simulation.probability_default_alive
+      )} of ${simulation.scenarios} scenarios break even before cash runs out</p>`;
+      detailsHTML += `<p><strong>Viability Score:</strong> ${simulation.viability_score}/100</p>`;
+    } else {
+      const months = (value) => (value != null ? value + " months" : "Unknown");
+      detailsHTML += `<p><strong>Breakeven Timeline:</strong> ${months(inputs.breakeven_month)}</p>`;
+      detailsHTML += `<p><strong>Cash Runway:</strong> ${months(inputs.cash_runway)}</p>`;
+      detailsHTML += `<p><strong>Viability Score:</strong> ${
+        inputs.viability_score != null ? inputs.viability_score + "/100" : "Unknown"
+      }</p>`;
     }
 
-    if (data.revenue_model) {
-      detailsHTML += `<p><strong>Revenue Model:</strong> ${data.revenue_model}</p>`;
+    if (financialBase && financialBase.cost_structure) {
+      detailsHTML += `<p><strong>Cost Structure:</strong> ${financialBase.cost_structure}</p>`;
+    }
+
+    if (financialBase && financialBase.revenue_model) {
+      detailsHTML += `<p><strong>Revenue Model:</strong> ${financialBase.revenue_model}</p>`;
     }
 
     dataElement.innerHTML = detailsHTML;
@@ -1138,13 +1409,7 @@ document.addEventListener("DOMContentLoaded", function () {
       startupIdeaInput.focus();
       window.scrollTo({ top: 0, behavior: "smooth" });
 
-      if (marketChart) marketChart.destroy();
-      if (competitionChart) competitionChart.destroy();
-      if (riskChart) riskChart.destroy();
-      if (scoreChart) scoreChart.destroy();
-      if (competitorRadarChart) competitorRadarChart.destroy();
-      if (revenueLineChart) revenueLineChart.destroy();
-      if (costRevenueBarChart) costRevenueBarChart.destroy();
+      // Chart instances are kept; the next analysis updates them in place
     });
   }
 
@@ -1171,6 +1436,9 @@ document.addEventListener("DOMContentLoaded", function () {
           throw new Error("jsPDF library not loaded. Please refresh the page.");
         }
 
+        // Charts that were never scrolled into view have not been drawn yet
+        renderAllPendingCharts({ animate: false });
+
         const { jsPDF } = window.jspdf;
         const doc = new jsPDF("p", "mm", "a4");
 
@@ -1515,6 +1783,9 @@ function toggleAccordion(button) {
 
   if (content.classList.contains("active")) {
     content.style.maxHeight = content.scrollHeight + "px";
+    document.dispatchEvent(
+      new CustomEvent("accordion:open", { detail: content })
+    );
   } else {
     content.style.maxHeight = "0px";
   }
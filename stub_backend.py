@@ -0,0 +1,113 @@
+# stub_backend.py - Canned model and search backends for load testing (VALIDX_BACKEND=stub)
+#
+# The stubs keep the full request path (Flask -> FastAPI -> graph -> hedging,
+# tools node, compaction, run store) but replace HuggingFace and DuckDuckGo
+# with fixed responses after a simulated, jittered latency.
+
+import hashlib
+import random
+import time
+import uuid
+
+from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
+
+from serialization import dumps_json
+from config import STUB_LLM_LATENCY, STUB_SEARCH_LATENCY
+
+_TEXT = (
+    "The addressable market is growing steadily, driven by digital adoption among small businesses "
+    "and a shift toward subscription software. Early adopters are concentrated in urban regions. "
+    "Incumbents compete mainly on breadth of features, leaving room for a focused product with a "
+    "simpler onboarding flow. Key risks are customer acquisition cost, regulatory changes around "
+    "data handling and the pace at which larger players copy the core feature. "
+) * 3
+
+STRUCTURED_RESPONSES = {
+    "competitor_intelligence": {
+        "competitors": [
+            {"name": "Incumbent A", "market_share": 32.0, "funding": 120.0, "growth_rate": 8.0, "brand_visibility": 85.0},
+            {"name": "Challenger B", "market_share": 14.0, "funding": 45.0, "growth_rate": 35.0, "brand_visibility": 60.0},
+            {"name": "Niche C", "market_share": 6.0, "funding": 8.0, "growth_rate": 22.0, "brand_visibility": 30.0}
+        ],
+        "competitive_advantage": "Simpler onboarding and vertical focus"
+    },
+    "financial_viability": {
+        "revenue_projections": [250.0, 900.0, 2400.0],
+        "burn_rate": 60.0,
+        "funding_needed": 1500.0,
+        "gross_margin": 72.0,
+        "cost_structure": "Mostly fixed engineering costs, variable hosting and support",
+        "revenue_model": "Monthly subscription with annual discount"
+    },
+    "advisor": {
+        "advisor_recommendations": "Conditional Go",
+        "advice": "Validate willingness to pay with ten paying pilots before raising."
+    },
+    "investor_decision": {
+        "decision": "HOLD",
+        "confidence": 62,
+        "reasoning": "Promising market, unproven acquisition channel.",
+        "key_strengths": "Growing market; focused product; capital efficient",
+        "key_concerns": "CAC; incumbent response; thin moat",
+        "suggested_investment": 250.0,
+        "expected_return": "3-5x over 6 years"
+    },
+    "quick_validator": {
+        "market_summary": "Growing market driven by SMB digital adoption.",
+        "competition_summary": "Fragmented incumbents compete on features.",
+        "risk_summary": "Acquisition cost and fast followers.",
+        "advisor_recommendations": "Conditional Go",
+        "advice": "Run paid pilots first.",
+        "decision": "HOLD",
+        "confidence": 60,
+        "reasoning": "Needs traction evidence.",
+        "key_strengths": "Market growth; focus; efficiency",
+        "key_concerns": "CAC; competition; moat",
+        "suggested_investment": 150.0,
+        "expected_return": "3x over 5 years"
+    }
+}
+
+
+def _sleep(mean):
+    """Simulated latency: mean +/- 50% jitter."""
+    if mean > 0:
+        time.sleep(random.uniform(0.5 * mean, 1.5 * mean))
+
+
+def _prompt_digest(prompt_value):
+    """Short stable digest of a prompt (it embeds the startup idea)."""
+    return hashlib.sha1(prompt_value.to_string().encode("utf-8")).hexdigest()[:10]
+
+
+def stub_model(node_name, with_tools=False):
+    """
+    Runnable standing in for the chat model of one node.
+    Tools mode asks for one web_search whose query varies with the prompt (and so
+    with the idea), so the search cache only hits when an idea repeats, as it
+    would with real queries; structured nodes answer with schema-valid JSON.
+    """
+    def invoke(prompt_value):
+        _sleep(STUB_LLM_LATENCY)
+        if with_tools:
+            return AIMessage(content="", tool_calls=[{
+                "name": "web_search",
+                "args": {"query": f"{node_name.replace('_', ' ')} trends {_prompt_digest(prompt_value)}"},
+                "id": f"call_{uuid.uuid4().hex[:12]}"
+            }])
+        if node_name in STRUCTURED_RESPONSES:
+            return AIMessage(content=dumps_json(STRUCTURED_RESPONSES[node_name]).decode("utf-8"))
+        return AIMessage(content=_TEXT)
+
+    return RunnableLambda(invoke, name=f"{node_name}_stub")
+
+
+def stub_search(query):
+    """Canned search result for a query."""
+    _sleep(STUB_SEARCH_LATENCY)
+    return (
+        f"Results for {query}. Analysts expect double-digit growth in this segment over the next five years. "
+        "Several startups raised seed rounds last year. Customer reviews highlight pricing and ease of use. "
+        "Regulators are reviewing data-handling rules for the sector."
+    )
@@ -0,0 +1,121 @@
+# tools/parallel_tool_node.py - Runs every tool call of one AIMessage concurrently
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+from langchain_core.messages import ToolMessage
+
+from state.agent_state import AgentState
+from tools.search_compaction import compact_results, add_stats
+from metrics import metrics
+from state.run_context import track_cpu
+from config import (
+    ANALYSIS_LIST,
+    TOOL_MAX_CONCURRENCY,
+    MAX_TOOL_CALLS_PER_MESSAGE,
+    MAX_TOOL_ROUNDS_PER_NODE,
+    SEARCH_COMPACTION_ENABLED
+)
+
+TOOL_FAILED = "tool_failed"
+
+# Shared, bounded pool for tool calls
+_executor = ThreadPoolExecutor(max_workers=TOOL_MAX_CONCURRENCY, thread_name_prefix="tool-call")
+
+
+def pending_section(state: AgentState):
+    """First analysis section that has not been filled yet."""
+    for analysis in ANALYSIS_LIST:
+        if state.get(analysis) is None:
+            return analysis
+    return None
+
+
+def merge_tool_results(calls, results):
+    """
+    Merge successful tool results into one section text.
+    A single result is kept as-is; several are headed by their query.
+    """
+    successful = [(call, result) for call, result in zip(calls, results) if result != TOOL_FAILED]
+    if not successful:
+        return None
+    if len(successful) == 1:
+        return successful[0][1]
+    return "\n\n".join(
+        f"### {call['args'].get('query', call['name'])}\n{result}"
+        for call, result in successful
+    )
+
+
+class ParallelToolNode:
+    """
+    Graph node that executes all tool calls from the last AIMessage in
+    parallel and writes the merged results into the pending analysis section.
+
+    The tool phase costs max(latency) of the calls instead of their sum.
+    If every call fails, the section stays empty and the router sends the
+    analysis to its fallback node.
+    """
+
+    def __init__(self, tools, max_calls=MAX_TOOL_CALLS_PER_MESSAGE, max_rounds=MAX_TOOL_ROUNDS_PER_NODE):
+        self.tools_by_name = {t.name: t for t in tools}
+        self.max_calls = max_calls
+        self.max_rounds = max_rounds
+
+    def _run_call(self, call):
+        tool = self.tools_by_name.get(call["name"])
+        if tool is None:
+            return TOOL_FAILED
+        try:
+            with track_cpu():
+                return str(tool.invoke(call["args"]))
+        except Exception:
+            return TOOL_FAILED
+
+    def __call__(self, state: AgentState) -> AgentState:
+        message = state["messages"][-1]
+        section = pending_section(state)
+
+        tool_rounds = dict(state.get("tool_rounds") or {})
+        tool_rounds[section] = tool_rounds.get(section, 0) + 1
+
+        calls = list(message.tool_calls)
+        if tool_rounds[section] > self.max_rounds:
+            # Tool loop limit reached: fail every call so the router falls back
+            results = [TOOL_FAILED] * len(calls)
+        else:
+            calls = calls[:self.max_calls]
+            futures = [
+                _executor.submit(contextvars.copy_context().run, self._run_call, call)
+                for call in calls
+            ]
+            results = [future.result() for future in futures]
+
+        update = {
+            "tool_section": section,
+            "tool_rounds": tool_rounds
+        }
+
+        # Dedupe, rank and trim search output before it enters any prompt
+        successful = [i for i, result in enumerate(results) if result != TOOL_FAILED]
+        if SEARCH_COMPACTION_ENABLED and successful:
+            compacted, stats = compact_results(
+                [(calls[i]["args"].get("query", ""), results[i]) for i in successful],
+                state["startup_idea"]
+            )
+            for i, (_, text) in zip(successful, compacted):
+                results[i] = text
+            update["search_stats"] = add_stats(state.get("search_stats"), stats)
+            metrics.incr("search_bytes_saved", stats["bytes_saved"])
+            metrics.incr("search_tokens_saved", stats["tokens_saved"])
+
+        tool_messages = [
+            ToolMessage(content=result, name=call["name"], tool_call_id=call["id"])
+            for call, result in zip(calls, results)
+        ]
+
+        update["messages"] = [message, *tool_messages]
+        merged = merge_tool_results(calls, results)
+        if merged is not None:
+            update[section] = merged
+        return update
@@ -0,0 +1,155 @@
+# tools/search_compaction.py - Dedupe, rank and trim search results before they reach prompts
+
+import math
+import re
+from collections import Counter
+
+from tools.search_prefetch import STOPWORDS
+from config import SEARCH_TOP_K, SEARCH_CHAR_BUDGET, SEARCH_DEDUP_THRESHOLD, CHARS_PER_TOKEN
+
+
+def split_snippets(text):
+    """Split raw search output into sentence-level snippets."""
+    pieces = re.split(r"(?<=[.!?])\s+|\s*\.\.\.\s*|\n+", text)
+    snippets = []
+    for piece in pieces:
+        piece = piece.strip()
+        if len(piece) < 20:
+            continue
+        snippets.append(piece if piece[-1] in ".!?" else piece + ".")
+    return snippets
+
+
+def _terms(text):
+    return [t for t in re.findall(r"[a-z0-9]+", text.lower()) if t not in STOPWORDS]
+
+
+def _shingles(terms, size=3):
+    if len(terms) < size:
+        return {tuple(terms)}
+    return {tuple(terms[i:i + size]) for i in range(len(terms) - size + 1)}
+
+
+def dedupe(snippets, threshold=SEARCH_DEDUP_THRESHOLD, duplicate_of=None):
+    """
+    Drop snippets whose word-shingle Jaccard similarity with an earlier kept
+    snippet is at or above the threshold. If duplicate_of is a dict, it maps
+    the result index of each dropped snippet to the result index of the first
+    kept snippet it duplicated.
+    """
+    kept, kept_shingles = [], []
+    for snippet in snippets:
+        shingles = _shingles(_terms(snippet[1]))
+        duplicate = False
+        for position, other in enumerate(kept_shingles):
+            union = shingles | other
+            if union and len(shingles & other) / len(union) >= threshold:
+                duplicate = True
+                if duplicate_of is not None:
+                    duplicate_of.setdefault(snippet[0], kept[position][0])
+                break
+        if not duplicate:
+            kept.append(snippet)
+            kept_shingles.append(shingles)
+    return kept
+
+
+def bm25_scores(documents, query, k1=1.5, b=0.75):
+    """Okapi BM25 score of each document (list of strings) against a query string."""
+    doc_terms = [_terms(doc) for doc in documents]
+    if not doc_terms:
+        return []
+    avg_len = sum(len(terms) for terms in doc_terms) / len(doc_terms) or 1.0
+    doc_freq = Counter(term for terms in doc_terms for term in set(terms))
+    n_docs = len(doc_terms)
+    query_terms = set(_terms(query))
+
+    scores = []
+    for terms in doc_terms:
+        counts = Counter(terms)
+        score = 0.0
+        for term in query_terms:
+            tf = counts.get(term, 0)
+            if not tf:
+                continue
+            idf = math.log(1 + (n_docs - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            score += idf * tf * (k1 + 1) / (tf + k1 * (1 - b + b * len(terms) / avg_len))
+        scores.append(score)
+    return scores
+
+
+def compact_results(results, startup_idea, top_k=SEARCH_TOP_K, char_budget=SEARCH_CHAR_BUDGET):
+    """
+    Compact the results of one tools round.
+
+    results: list of (query, raw_text) pairs.
+    Snippets from all results are deduplicated together, ranked with BM25
+    against the startup idea plus their own query, and the best top_k that
+    fit in char_budget are kept in their original order. Every result keeps
+    at least its top-ranked snippet; a result whose snippets all duplicate an
+    earlier result's becomes a short "(duplicate of <query>)" marker.
+    Returns (list of (query, compacted_text), stats dict).
+    """
+    snippets = []
+    for index, (query, text) in enumerate(results):
+        for snippet in split_snippets(text):
+            snippets.append((index, snippet))
+
+    split_indexes = {s[0] for s in snippets}
+    duplicate_of = {}
+    snippets = dedupe(snippets, duplicate_of=duplicate_of)
+    kept_indexes = {s[0] for s in snippets}
+    scores = bm25_scores([s[1] for s in snippets], startup_idea)
+    query_scores = [
+        bm25_scores([s[1] for s in snippets], results[index][0]) if snippets else []
+        for index in range(len(results))
+    ]
+
+    ranked = sorted(
+        range(len(snippets)),
+        key=lambda i: scores[i] + 0.5 * query_scores[snippets[i][0]][i],
+        reverse=True
+    )
+
+    selected, used_chars = set(), 0
+    for i in ranked:
+        if len(selected) >= top_k:
+            break
+        length = len(snippets[i][1]) + 1
+        if used_chars + length > char_budget:
+            continue
+        selected.add(i)
+        used_chars += length
+
+    compacted = []
+    for index, (query, text) in enumerate(results):
+        kept = [snippets[i][1] for i in sorted(selected) if snippets[i][0] == index]
+        if index not in split_indexes:
+            # Nothing could be split out of it: keep a trimmed copy of the raw text
+            kept = [text[:char_budget]]
+        elif index not in kept_indexes:
+            # Everything in it repeats an earlier result: point there instead of repeating the text
+            kept = [f"(duplicate of {results[duplicate_of[index]][0]})"]
+        elif not kept:
+            # Every snippet lost to the budget: keep its top-ranked one so the result never turns empty
+            best = next(i for i in ranked if snippets[i][0] == index)
+            kept = [snippets[best][1][:char_budget]]
+        compacted.append((query, " ".join(kept)))
+
+    bytes_in = sum(len(text.encode("utf-8")) for _, text in results)
+    bytes_out = sum(len(text.encode("utf-8")) for _, text in compacted)
+    stats = {
+        "bytes_in": bytes_in,
+        "bytes_out": bytes_out,
+        "bytes_saved": bytes_in - bytes_out,
+        "tokens_saved": (bytes_in - bytes_out) // CHARS_PER_TOKEN
+    }
+    return compacted, stats
+
+
+def add_stats(total, stats):
+    """Accumulate compaction stats into a run total (returns a new dict)."""
+    total = dict(total or {})
+    for key, value in stats.items():
+        total[key] = total.get(key, 0) + value
+    return total
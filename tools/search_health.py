@@ -0,0 +1,121 @@
+# tools/search_health.py - Shared search-health tracker and circuit breaker
+
+import threading
+import time
+from collections import deque
+
+from metrics import metrics
+from config import (
+    SEARCH_HEALTH_WINDOW,
+    SEARCH_HEALTH_MAX_AGE,
+    SEARCH_HEALTH_MIN_SAMPLES,
+    SEARCH_HEALTH_FAILURE_THRESHOLD,
+    SEARCH_HEALTH_COOLDOWN,
+    SEARCH_HEALTH_PROBE_TIMEOUT
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class SearchHealth:
+    """
+    Circuit breaker over recent web search outcomes.
+
+    closed:    tools mode allowed; opens when the failure rate of recent searches
+               crosses the threshold.
+    open:      tools mode skipped; after the cooldown the breaker goes half-open.
+    half_open: a single request is let through as a probe. A successful search
+               closes the breaker, a failed one opens it again. A probe that never
+               searched (the model made no tool call) is replaced after a timeout.
+    """
+
+    def __init__(self, window=SEARCH_HEALTH_WINDOW, max_age=SEARCH_HEALTH_MAX_AGE,
+                 min_samples=SEARCH_HEALTH_MIN_SAMPLES, threshold=SEARCH_HEALTH_FAILURE_THRESHOLD,
+                 cooldown=SEARCH_HEALTH_COOLDOWN, probe_timeout=SEARCH_HEALTH_PROBE_TIMEOUT):
+        self.max_age = max_age
+        self.min_samples = min_samples
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.probe_timeout = probe_timeout
+        self._outcomes = deque(maxlen=window)  # (timestamp, ok)
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = None
+        self._probe_started_at = None
+
+    def _failure_rate(self, now):
+        recent = [ok for ts, ok in self._outcomes if now - ts <= self.max_age]
+        if len(recent) < self.min_samples:
+            return None
+        return recent.count(False) / len(recent)
+
+    def _open(self, now):
+        self._state = OPEN
+        self._opened_at = now
+        self._probe_started_at = None
+        metrics.incr("search_breaker_opened")
+
+    def record(self, ok):
+        """Record the outcome of one real (uncached) search."""
+        now = time.monotonic()
+        with self._lock:
+            self._outcomes.append((now, ok))
+            if self._state == HALF_OPEN:
+                if ok:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    self._probe_started_at = None
+                    metrics.incr("search_breaker_closed")
+                else:
+                    self._open(now)
+            elif self._state == CLOSED:
+                rate = self._failure_rate(now)
+                if rate is not None and rate >= self.threshold:
+                    self._open(now)
+
+    def allow_tools(self):
+        """True if a node may use tools mode now (may claim the half-open probe)."""
+        now = time.monotonic()
+        with self._lock:
+            if self._state == OPEN and now - self._opened_at >= self.cooldown:
+                self._state = HALF_OPEN
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN:
+                if self._probe_started_at is None or now - self._probe_started_at >= self.probe_timeout:
+                    self._probe_started_at = now
+                    metrics.incr("search_breaker_probes")
+                    return True
+            return False
+
+    def is_closed(self):
+        with self._lock:
+            return self._state == CLOSED
+
+    def stats(self):
+        now = time.monotonic()
+        with self._lock:
+            rate = self._failure_rate(now)
+            return {
+                "state": self._state,
+                "failure_rate": round(rate, 3) if rate is not None else None,
+                "samples": len(self._outcomes),
+                "open_for_seconds": round(now - self._opened_at, 1) if self._state != CLOSED and self._opened_at else None
+            }
+
+
+# Process-wide tracker fed by tools/web_search_tool.run_search
+search_health = SearchHealth()
+
+
+def effective_mode(preferred_mode, node=None):
+    """
+    Mode a node should actually run in: tools mode falls back to chat_model
+    while search is degraded, saving the tool-calling round and the failed search.
+    """
+    if preferred_mode == "tools" and not search_health.allow_tools():
+        metrics.incr("search_breaker_skips", node=node or "unknown")
+        return "chat_model"
+    return preferred_mode
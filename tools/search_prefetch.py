@@ -0,0 +1,194 @@
+# tools/search_prefetch.py - Speculative web search prefetch at request arrival
+
+import contextvars
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from metrics import metrics
+from config import SEARCH_PREFETCH_WORKERS, SEARCH_PREFETCH_MATCH_THRESHOLD, SEARCH_PREFETCH_MIN_TOPIC_TOKENS, SEARCH_PREFETCH_WAIT
+
+STOPWORDS = {
+    "a", "an", "the", "and", "or", "for", "to", "of", "in", "on", "with", "by", "that", "this",
+    "is", "are", "be", "will", "we", "our", "it", "its", "as", "at", "from", "which", "who",
+    "platform", "app", "startup", "idea", "using", "based", "help", "helps", "their", "users",
+    "can", "into", "via", "your", "you", "they", "them", "new", "more"
+}
+
+# Prefetch batch of the request being served (set by prefetch(), cleared by finish())
+_current_batch = contextvars.ContextVar("current_prefetch_batch", default=None)
+
+# Searches the market, competition and risk nodes almost always make
+QUERY_TEMPLATES = [
+    "{topic} market size",
+    "{topic} competitors",
+    "{topic} industry trends",
+    "{topic} startup risks challenges"
+]
+
+
+def query_tokens(query):
+    """Lowercase word tokens of a query."""
+    return set(re.findall(r"[a-z0-9]+", query.lower()))
+
+
+def normalize_query(query):
+    """Canonical cache key for a query (order and punctuation insensitive)."""
+    return " ".join(sorted(query_tokens(query)))
+
+
+def idea_topic(startup_idea, max_keywords=6):
+    """Keywords of an idea that every predicted query shares ("" if none)."""
+    keywords = []
+    for word in re.findall(r"[A-Za-z0-9][A-Za-z0-9\-]*", startup_idea):
+        lowered = word.lower()
+        if lowered in STOPWORDS or len(lowered) < 3 or lowered in keywords:
+            continue
+        keywords.append(lowered)
+        if len(keywords) >= max_keywords:
+            break
+    return " ".join(keywords)
+
+
+def derive_queries(startup_idea, max_keywords=6):
+    """
+    Predict the searches the analysis nodes will make for an idea.
+    """
+    topic = idea_topic(startup_idea, max_keywords)
+    if not topic:
+        return []
+    return [template.format(topic=topic) for template in QUERY_TEMPLATES]
+
+
+class _PrefetchEntry:
+    def __init__(self, batch_id, query, topic, future):
+        self.batch_id = batch_id
+        self.query = query
+        self.topic_tokens = query_tokens(topic)
+        # What the query asks about the topic ("market size", "competitors", ...)
+        self.intent_tokens = query_tokens(query) - self.topic_tokens
+        self.future = future
+        self.used = False
+
+
+class SearchPrefetcher:
+    """
+    Starts predicted searches in the background when a request arrives so
+    the tool calls the model makes later are served from warm results.
+
+    Model queries rarely match a prediction word for word, so lookups match
+    on token overlap against the current request's prefetches that are in
+    flight or finished. Every prediction shares the idea's keywords, so the
+    Jaccard score is taken on what is left of the query once those are
+    removed (its intent, e.g. "pricing" vs. "competitors"), and the query
+    must also mention the topic. Queued prefetches are skipped, since waiting
+    for a free prefetch worker can be slower than searching directly.
+    """
+
+    def __init__(self, search_fn, on_result=None):
+        self.search_fn = search_fn
+        self.on_result = on_result
+        self._executor = ThreadPoolExecutor(max_workers=SEARCH_PREFETCH_WORKERS, thread_name_prefix="search-prefetch")
+        self._entries = {}
+        self._scope_tokens = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, query):
+        result = self.search_fn(query)
+        if self.on_result is not None:
+            self.on_result(query, result)
+        return result
+
+    def prefetch(self, startup_idea):
+        """
+        Launch background searches derived from the idea and make them the
+        current request's batch. Returns a batch id to pass to finish() when
+        the run completes.
+        """
+        batch_id = uuid.uuid4().hex
+        topic = idea_topic(startup_idea)
+        queries = derive_queries(startup_idea)
+        with self._lock:
+            for query in queries:
+                future = self._executor.submit(contextvars.copy_context().run, self._fetch, query)
+                self._entries.setdefault(batch_id, []).append(_PrefetchEntry(batch_id, query, topic, future))
+            self._scope_tokens[batch_id] = _current_batch.set(batch_id)
+        metrics.incr("search_prefetch_issued", len(queries))
+        return batch_id
+
+    def _best_match(self, query, batch_id):
+        tokens = query_tokens(query)
+        best, best_score = None, 0.0
+        with self._lock:
+            for entry in self._entries.get(batch_id, []):
+                # Not started yet: its worker is busy with other requests' prefetches
+                if not (entry.future.running() or entry.future.done()):
+                    continue
+                if len(tokens & entry.topic_tokens) < min(SEARCH_PREFETCH_MIN_TOPIC_TOKENS, len(entry.topic_tokens)):
+                    continue
+                intent = tokens - entry.topic_tokens
+                union = intent | entry.intent_tokens
+                score = len(intent & entry.intent_tokens) / len(union) if union else 0.0
+                if score > best_score:
+                    best, best_score = entry, score
+        if best_score >= SEARCH_PREFETCH_MATCH_THRESHOLD:
+            return best
+        return None
+
+    def lookup(self, query, batch_id=None):
+        """
+        Return the prefetched result of a batch (the current request's by default)
+        matching a query, waiting for it if it is in flight. Returns None when
+        nothing usable was prefetched.
+        """
+        batch_id = batch_id or _current_batch.get()
+        if batch_id is None:
+            return None
+        entry = self._best_match(query, batch_id)
+        if entry is None:
+            return None
+        try:
+            result = entry.future.result(timeout=SEARCH_PREFETCH_WAIT)
+        except Exception:
+            return None
+        if result == "tool_failed":
+            return None
+        if not entry.used:
+            entry.used = True
+            metrics.incr("search_prefetch_hits")
+        return result
+
+    def finish(self, batch_id):
+        """
+        Close a run's batch and report how many prefetches were used or wasted.
+        """
+        with self._lock:
+            entries = self._entries.pop(batch_id, [])
+            scope_token = self._scope_tokens.pop(batch_id, None)
+        if scope_token is not None:
+            try:
+                _current_batch.reset(scope_token)
+            except ValueError:
+                # finish() from another context than prefetch(); that context ends with its request
+                pass
+        used = sum(1 for entry in entries if entry.used)
+        wasted = len(entries) - used
+        metrics.incr("search_prefetch_wasted", wasted)
+        return {
+            "issued": len(entries),
+            "used": used,
+            "wasted": wasted,
+            "hit_rate": round(used / len(entries), 4) if entries else 0.0
+        }
+
+    def stats(self):
+        """Process-wide prefetch counters."""
+        issued = metrics.counter("search_prefetch_issued")
+        hits = metrics.counter("search_prefetch_hits")
+        return {
+            "issued": issued,
+            "hits": hits,
+            "wasted": metrics.counter("search_prefetch_wasted"),
+            "hit_rate": round(hits / issued, 4) if issued else 0.0
+        }
@@ -1,6 +1,83 @@
 from langchain_community.tools import DuckDuckGoSearchRun,tool
 import time
 import random
+import threading
+from cache import TTLCache
+from cassette import active_cassette, recorded_search
+from tools.search_prefetch import SearchPrefetcher, normalize_query
+from tools.search_health import search_health
+from state.run_context import record_run_search
+from config import SEARCH_CACHE_MAXSIZE, SEARCH_CACHE_TTL, SEARCH_PREFETCH_ENABLED, BACKEND_MODE
+
+# Recent search results keyed by normalized query
+search_cache = TTLCache(maxsize=SEARCH_CACHE_MAXSIZE, ttl=SEARCH_CACHE_TTL, name="search_cache")
+
+
+_search_client = None
+_search_client_lock = threading.Lock()
+
+
+def get_search_client():
+    """
+    Shared DuckDuckGo search runnable, created on first use (or during warm-up).
+    """
+    global _search_client
+    if _search_client is None:
+        with _search_client_lock:
+            if _search_client is None:
+                _search_client = DuckDuckGoSearchRun()
+    return _search_client
+
+
+def run_search(query: str) -> str:
+    """
+    Uncached DuckDuckGo search. Returns "tool_failed" on error.
+    """
+    if BACKEND_MODE == "stub":
+        from stub_backend import stub_search
+        return stub_search(query)
+    try:
+        search_tool = get_search_client()
+        # Add random delay to avoid rate limiting
+        time.sleep(random.uniform(1, 3))
+        result = search_tool.run(query)
+        search_health.record(True)
+        if not result or result.strip() == "":
+            return "No search results found. Please try a different search query."
+        return result
+    except Exception as e:
+        search_health.record(False)
+        return "tool_failed"
+
+
+def _cache_result(query: str, result: str):
+    """Cache successful results only."""
+    if result != "tool_failed":
+        search_cache.set(normalize_query(query), result)
+
+
+# Warms search_cache from startup_idea when a validation request arrives
+prefetcher = SearchPrefetcher(run_search, on_result=_cache_result)
+
+
+def prefetch_for_idea(startup_idea: str):
+    """
+    Start speculative searches for an idea. Returns a batch id (or None when disabled).
+    """
+    # Cassette runs stay deterministic, and degraded search is not worth speculating on
+    if not SEARCH_PREFETCH_ENABLED or active_cassette() is not None or not search_health.is_closed():
+        return None
+    return prefetcher.prefetch(startup_idea)
+
+
+def finish_prefetch(batch_id):
+    """
+    Close a prefetch batch and return its used/wasted report.
+    """
+    if batch_id is None:
+        return None
+    return prefetcher.finish(batch_id)
+
 
 @tool
 def web_search(query: str) -> str:
@@ -13,13 +90,23 @@ def web_search(query: str) -> str:
     Returns:
         str: The search results.
     """
-    try:
-        search_tool = DuckDuckGoSearchRun()
-        # Add random delay to avoid rate limiting
-        time.sleep(random.uniform(1, 3))
-        result = search_tool.run(query)
-        if not result or result.strip() == "":
-            return "No search results found. Please try a different search query."
+    # Counted per tool call (cached or not) in the run's usage
+    record_run_search()
+    
+    # Record/replay runs bypass prefetch and cache so they are deterministic
+    if active_cassette() is not None:
+        return recorded_search(query, run_search)
+    
+    # Prefetched (possibly still in flight) results for the current request first.
+    # They are cached under the prefetch's own query only: a near match is not
+    # an answer to this exact query for later requests.
+    result = prefetcher.lookup(query)
+    if result is not None:
         return result
-    except Exception as e:
-        return "tool_failed"
\ No newline at end of file
+    
+    found, result = search_cache.get(normalize_query(query))
+    if found:
+        return result
+    result = run_search(query)
+    _cache_result(query, result)
+    return result
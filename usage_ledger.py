@@ -0,0 +1,326 @@
+# usage_ledger.py - Write-behind per-user usage ledger (runs, tokens, LLM and search calls)
+#
+# Finished runs are appended to an in-memory buffer; a background thread writes
+# them to MySQL in batches (one multi-row INSERT per table) when the buffer
+# reaches USAGE_FLUSH_BATCH_SIZE or every USAGE_FLUSH_INTERVAL seconds. Failed
+# batches go back to the buffer and the remainder is flushed at exit, so events
+# are delivered at least once. usage_daily keeps per-user daily totals keyed by
+# (user_id, day) for quota checks and /api/usage.
+#
+# The buffer lives in the process that runs the graph. Only in the single-service
+# deployment (asgi.py) is that also the Flask process, so only there do reads add
+# unflushed events; with a separate backend they lag by up to USAGE_FLUSH_INTERVAL.
+
+import atexit
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+import inprocess
+from database import get_db_connection, close_db_connection
+from metrics import metrics
+from config import (
+    USAGE_LEDGER_ENABLED,
+    USAGE_FLUSH_BATCH_SIZE,
+    USAGE_FLUSH_INTERVAL,
+    USAGE_BUFFER_MAX,
+    USAGE_DAILY_RUN_QUOTA,
+    USAGE_DAILY_TOKEN_QUOTA,
+    USAGE_REPORT_DAYS
+)
+
+COUNTERS = ("runs", "input_tokens", "output_tokens", "llm_calls", "search_calls")
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS usage_events (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        user_id INT NOT NULL,
+        kind VARCHAR(32) NOT NULL,
+        input_tokens INT NOT NULL DEFAULT 0,
+        output_tokens INT NOT NULL DEFAULT 0,
+        llm_calls INT NOT NULL DEFAULT 0,
+        search_calls INT NOT NULL DEFAULT 0,
+        wall_ms INT NOT NULL DEFAULT 0,
+        created_at DATETIME(3) NOT NULL,
+        INDEX idx_usage_events_user_created (user_id, created_at)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS usage_daily (
+        user_id INT NOT NULL,
+        day DATE NOT NULL,
+        runs INT NOT NULL DEFAULT 0,
+        input_tokens BIGINT NOT NULL DEFAULT 0,
+        output_tokens BIGINT NOT NULL DEFAULT 0,
+        llm_calls INT NOT NULL DEFAULT 0,
+        search_calls INT NOT NULL DEFAULT 0,
+        PRIMARY KEY (user_id, day)
+    )
+    """
+)
+
+INSERT_EVENTS = """
+    INSERT INTO usage_events
+        (user_id, kind, input_tokens, output_tokens, llm_calls, search_calls, wall_ms, created_at)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+# executemany() sends both statements as a single multi-row INSERT
+UPSERT_DAILY = """
+    INSERT INTO usage_daily
+        (user_id, day, runs, input_tokens, output_tokens, llm_calls, search_calls)
+    VALUES (%s, %s, %s, %s, %s, %s, %s)
+    ON DUPLICATE KEY UPDATE
+        runs = runs + VALUES(runs),
+        input_tokens = input_tokens + VALUES(input_tokens),
+        output_tokens = output_tokens + VALUES(output_tokens),
+        llm_calls = llm_calls + VALUES(llm_calls),
+        search_calls = search_calls + VALUES(search_calls)
+"""
+
+
+def utc_now():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def daily_rows(events):
+    """Events summed per (user_id, day), as usage_daily rows."""
+    totals = defaultdict(lambda: dict.fromkeys(COUNTERS, 0))
+    for event in events:
+        day = totals[(event["user_id"], event["created_at"].date())]
+        day["runs"] += 1
+        for counter in COUNTERS[1:]:
+            day[counter] += event[counter]
+    return [(user_id, day, *(row[c] for c in COUNTERS)) for (user_id, day), row in totals.items()]
+
+
+class UsageLedger:
+    """
+    Buffers usage events and writes them to MySQL off the request path.
+    record() only appends under a lock; the flush thread starts on first use.
+    """
+
+    def __init__(self, batch_size=USAGE_FLUSH_BATCH_SIZE, interval=USAGE_FLUSH_INTERVAL, buffer_max=USAGE_BUFFER_MAX):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.buffer_max = buffer_max
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()   # one writer at a time (thread vs. exit flush)
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._schema_ready = False
+
+    def record(self, user_id, kind, input_tokens=0, output_tokens=0, llm_calls=0, search_calls=0, wall_ms=0):
+        """Queue one finished run for a user."""
+        event = {
+            "user_id": int(user_id),
+            "kind": kind,
+            "input_tokens": int(input_tokens),
+            "output_tokens": int(output_tokens),
+            "llm_calls": int(llm_calls),
+            "search_calls": int(search_calls),
+            "wall_ms": int(wall_ms),
+            "created_at": utc_now()
+        }
+        with self._lock:
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.batch_size
+        metrics.incr("usage_events_recorded", kind=kind)
+        self._ensure_thread()
+        if full:
+            self._wake.set()
+
+    def record_run(self, run):
+        """Queue a finished RunContext (state/run_context.py) for its user."""
+        self.record(
+            run.user_id,
+            run.kind,
+            input_tokens=run.input_tokens,
+            output_tokens=run.output_tokens,
+            llm_calls=run.llm_calls,
+            search_calls=run.search_calls,
+            wall_ms=round((run.wall_seconds or 0) * 1000)
+        )
+
+    def pending(self, user_id):
+        """
+        Totals of a user's events still in this process's buffer (not yet visible
+        in MySQL). Zero when the graph runs in another process (see unflushed()).
+        """
+        with self._lock:
+            events = [event for event in self._buffer if event["user_id"] == user_id]
+        rows = daily_rows(events)
+        return {counter: sum(row[2 + i] for row in rows) for i, counter in enumerate(COUNTERS)}
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None and not self._stop.is_set():
+                    self._thread = threading.Thread(target=self._run, name="usage-ledger", daemon=True)
+                    self._thread.start()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            self.flush()
+
+    def _requeue(self, events):
+        """Put a failed batch back in front of newer events, dropping the oldest beyond buffer_max."""
+        with self._lock:
+            self._buffer = events + self._buffer
+            dropped = len(self._buffer) - self.buffer_max
+            if dropped > 0:
+                del self._buffer[:dropped]
+        if dropped > 0:
+            metrics.incr("usage_events_dropped", dropped)
+            print(f"⚠️ Usage ledger buffer full: dropped {dropped} oldest events")
+
+    def _ensure_schema(self, cursor):
+        if not self._schema_ready:
+            for statement in SCHEMA:
+                cursor.execute(statement)
+            self._schema_ready = True
+
+    def flush(self):
+        """
+        Write all buffered events in one transaction. Returns the number written;
+        on failure the events are requeued for the next flush.
+        """
+        with self._flush_lock:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+            if not events:
+                return 0
+
+            started = time.perf_counter()
+            connection = get_db_connection()
+            if not connection:
+                metrics.incr("usage_flush_failures")
+                self._requeue(events)
+                return 0
+
+            try:
+                cursor = connection.cursor()
+                self._ensure_schema(cursor)
+                cursor.executemany(INSERT_EVENTS, [
+                    (e["user_id"], e["kind"], e["input_tokens"], e["output_tokens"],
+                     e["llm_calls"], e["search_calls"], e["wall_ms"], e["created_at"])
+                    for e in events
+                ])
+                cursor.executemany(UPSERT_DAILY, daily_rows(events))
+                connection.commit()
+                cursor.close()
+                close_db_connection(connection)
+            except Exception as e:
+                print(f"❌ Usage ledger flush error: {e}")
+                metrics.incr("usage_flush_failures")
+                connection.rollback()
+                close_db_connection(connection)
+                self._requeue(events)
+                return 0
+
+            metrics.incr("usage_events_flushed", len(events))
+            metrics.observe("usage_flush_seconds", time.perf_counter() - started)
+            return len(events)
+
+    def shutdown(self, timeout=10):
+        """Stop the flush thread and write what is left (registered with atexit)."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+
+# Process-wide ledger fed by state/run_context.run_accounting
+usage_ledger = UsageLedger()
+atexit.register(usage_ledger.shutdown)
+
+
+def unflushed(user_id):
+    """
+    pending() of the process-wide ledger when runs are recorded in this process
+    (single-service mode), otherwise zeros: a separate backend's buffer is not visible.
+    """
+    if not inprocess.is_enabled():
+        return dict.fromkeys(COUNTERS, 0)
+    return usage_ledger.pending(user_id)
+
+
+def daily_totals(user_id, since):
+    """
+    usage_daily rows of a user from since (a date) on, read through the
+    (user_id, day) primary key. Returns a list of dicts, or None if MySQL is unavailable.
+    """
+    connection = get_db_connection()
+    if not connection:
+        return None
+    try:
+        cursor = connection.cursor(dictionary=True)
+        cursor.execute(
+            f"SELECT day, {', '.join(COUNTERS)} FROM usage_daily WHERE user_id = %s AND day >= %s ORDER BY day",
+            (user_id, since)
+        )
+        rows = cursor.fetchall()
+        cursor.close()
+        close_db_connection(connection)
+        return rows
+    except Exception as e:
+        # Table not created yet (nothing flushed) or a read error
+        print(f"❌ Usage lookup error: {e}")
+        close_db_connection(connection)
+        return None
+
+
+def user_usage(user_id, days=USAGE_REPORT_DAYS):
+    """
+    Today's and the last `days` days' totals for a user, the daily breakdown and
+    quota status. Today includes unflushed events only in single-service mode.
+    """
+    today = utc_now().date()
+    rows = daily_totals(user_id, today - timedelta(days=days - 1)) or []
+    pending = unflushed(user_id)
+
+    window = {counter: int(sum(row[counter] for row in rows)) + pending[counter] for counter in COUNTERS}
+    today_row = next((row for row in rows if row["day"] == today), {})
+    today_totals = {counter: int(today_row.get(counter, 0)) + pending[counter] for counter in COUNTERS}
+
+    return {
+        "today": today_totals,
+        f"last_{days}_days": window,
+        "daily": [{**{c: int(row[c]) for c in COUNTERS}, "day": row["day"].isoformat()} for row in rows],
+        "quota": quota_status(today_totals)
+    }
+
+
+def quota_status(today_totals):
+    """Daily quota usage; a limit of None means unlimited."""
+    tokens = today_totals["input_tokens"] + today_totals["output_tokens"]
+    limits = {"runs": USAGE_DAILY_RUN_QUOTA or None, "tokens": USAGE_DAILY_TOKEN_QUOTA or None}
+    used = {"runs": today_totals["runs"], "tokens": tokens}
+    return {
+        **{name: {"used": used[name], "limit": limit} for name, limit in limits.items()},
+        "exceeded": any(limit is not None and used[name] >= limit for name, limit in limits.items())
+    }
+
+
+def quota_exceeded(user_id):
+    """
+    True when the user reached a daily quota. Skips the lookup when no quota is
+    configured and lets the run through when MySQL is unavailable. With a separate
+    backend, runs not flushed yet are not counted (up to USAGE_FLUSH_INTERVAL of lag).
+    """
+    if not USAGE_LEDGER_ENABLED or not (USAGE_DAILY_RUN_QUOTA or USAGE_DAILY_TOKEN_QUOTA):
+        return False
+    today = utc_now().date()
+    rows = daily_totals(user_id, today)
+    if rows is None:
+        return False
+    pending = unflushed(user_id)
+    today_totals = {counter: int(sum(row[counter] for row in rows)) + pending[counter] for counter in COUNTERS}
+    return quota_status(today_totals)["exceeded"]